@@ -0,0 +1,42 @@
+"""
+Benchmark the DCM and quaternion attitude chains.
+
+Run from the repository root with ``python -m benchmarks.attitude``.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from .scenario import best, build
+from rtsim import kernel
+from rtsim.kernel import OUTPUTS
+import numpy as np
+
+
+def main() -> None:
+    """Time the attitude chain alone and the whole testbed, and compare the outputs."""
+    testbed, time, misalignments, rotations = build(noise=1.0)
+    frames = [F for a, axis in enumerate(testbed.axes) for F in (rotations[a], misalignments[a], axis.zeta)]
+    Cmb = testbed.mount.frame.C @ testbed.body.frame.C
+    for frame in frames:
+        _ = frame.C, frame.q
+
+    for attitude in ("dcm", "quaternion"):
+        seconds = best(lambda attitude=attitude: kernel.attitude_chain(frames, Cmb, time.shape, attitude))
+        print(f"chain    {attitude:<10} {seconds:8.3f} s")
+
+    results = {}
+    for method in ("reference", "fused", "quaternion"):
+        seconds = best(lambda method=method: testbed.process(time, misalignments, rotations, method=method))
+        results[method] = {name: getattr(testbed, name) for name in OUTPUTS}
+        print(f"process  {method:<10} {seconds:8.3f} s")
+
+    error = max(np.abs(results["quaternion"][name] - results["fused"][name]).max() for name in OUTPUTS)
+    print(f"max |quaternion - fused| {error:.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark the orientation and skew symetric matrix conversions.
+
+Run from the repository root with ``python -m benchmarks.conversions``.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from .scenario import STEPS, best
+from functools import partial
+from rtsim.frame import Frame, orientation_to_dcm, skew_symetric
+from rtsim.pva import ConstantPVA
+import numpy as np
+
+REPEATS = 5
+
+
+def main() -> None:
+    """Time the conversions of a time series and of a constant, and of a constant frame DCM."""
+    rng = np.random.default_rng(0)
+    series = rng.normal(size=(STEPS, 3, 1))
+    constant = rng.normal(size=(3, 1))
+    zeros = np.zeros((3, 1))
+    out = np.empty((STEPS, 3, 3))
+    series_best = partial(best, repeats=REPEATS, number=3)
+    constant_best = partial(best, repeats=REPEATS, number=10000)
+
+    print(f"orientation_to_dcm  T={STEPS}  {series_best(lambda: orientation_to_dcm(series)) * 1e3:9.2f} ms")
+    print(f"  with out=                    {series_best(lambda: orientation_to_dcm(series, out)) * 1e3:9.2f} ms")
+    print(f"skew_symetric       T={STEPS}  {series_best(lambda: skew_symetric(series)) * 1e3:9.2f} ms")
+    print(f"  with out=                    {series_best(lambda: skew_symetric(series, out)) * 1e3:9.2f} ms")
+    print(f"orientation_to_dcm  3x1       {constant_best(lambda: orientation_to_dcm(constant)) * 1e6:9.2f} us")
+    print(f"skew_symetric       3x1       {constant_best(lambda: skew_symetric(constant)) * 1e6:9.2f} us")
+
+    def constant_frame():
+        return Frame(ConstantPVA(p=zeros, v=zeros, a=zeros), ConstantPVA(p=constant, v=zeros, a=zeros)).C
+
+    print(f"Frame(...).C        3x1       {constant_best(constant_frame) * 1e6:9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
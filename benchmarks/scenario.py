@@ -0,0 +1,109 @@
+"""
+RTSim benchmark scenario.
+
+Three axis rate table of the IEEE PLANS example notebook, sampled at 1 kHz for ten minutes.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from collections.abc import Callable
+from math import inf, tau
+from rtsim import Axis, Body, ConstantPVA, Frame, Mount, Testbed, TimePVA, World
+import numpy as np
+import time as clock
+
+STEPS = 600001
+
+REPEATS = 3
+
+
+def constant(p=(0.0, 0.0, 0.0)) -> ConstantPVA:
+    """Build a constant PVA at a position or orientation."""
+    return ConstantPVA(p=np.array(p, dtype=float).reshape(3, 1), v=np.zeros((3, 1)), a=np.zeros((3, 1)))
+
+
+def best(function: Callable[[], object], *, repeats: int = REPEATS, number: int = 1, limit: float = inf) -> float:
+    """
+    Time a function, keeping the best of several runs.
+
+    :param function: Function called without arguments.
+    :type function: Callable[[], object]
+
+    :param repeats: Maximum number of runs, defaults to ``REPEATS``
+    :type repeats: int, optional
+
+    :param number: Number of calls per run, defaults to 1
+    :type number: int, optional
+
+    :param limit: Duration of a run after which no more runs are made, s, defaults to no limit
+    :type limit: float, optional
+
+    :return: Best wall time per call, s
+    :rtype: float
+    """
+    times = []
+    for _ in range(repeats):
+        start = clock.perf_counter()
+        for _ in range(number):
+            function()
+        times.append(clock.perf_counter() - start)
+        if times[-1] > limit:
+            break
+    return min(times) / number
+
+
+def build(steps: int = STEPS, *, noise: float = 0.0, seed: int = 0):
+    """
+    Build the scenario testbed and its inputs.
+
+    :param steps: Number of 1 ms time steps, defaults to ``STEPS``
+    :type steps: int, optional
+
+    :param noise: Standard deviation of the misalignments and of the noise on the rotations, defaults to 0.0
+    :type noise: float, optional
+
+    :param seed: Seed of the noise, defaults to 0
+    :type seed: int, optional
+
+    :return: Testbed, time, misalignments and rotations.
+    :rtype: tuple[Testbed, np.ndarray, list[Frame], list[Frame]]
+    """
+    rng = np.random.default_rng(seed)
+    world = World("Terra", 6378137.0, 298.257223563, 7.2921150e-5)
+    axes = [
+        Axis("Inner", Frame(constant((-0.1524, 0.0, 0.0)), constant((0.0, tau / 4, 0.0)))),
+        Axis("Middle", Frame(constant(), constant((0.0, tau / 4, 0.0)))),
+        Axis("Outer", Frame(constant(), constant())),
+    ]
+    mount = Mount("Mount", Frame(constant((0.3284, 0.0, 0.0)), constant((0.0, -tau / 4, 0.0))))
+    body = Body("IMU", Frame(constant((0.0164, 0.0, 0.0)), constant((tau / 4, 0.0, 0.0))))
+    llhg = (35.051339, -106.545044, 1630.0, 9.7920631997)
+    testbed = Testbed("TART", llhg=llhg, components=(world, axes, mount, body))
+
+    time = np.arange(steps) * 1e-3
+
+    def sample(scale):
+        return rng.normal(scale=scale * noise, size=(steps, 3, 1))
+
+    misalignments = [
+        Frame(
+            TimePVA(p=sample(1e-3), v=sample(1e-3), a=sample(1e-3)),
+            TimePVA(p=sample(1e-3), v=sample(1e-3), a=sample(1e-3)),
+        )
+        for _ in axes
+    ]
+
+    rotations = []
+    for k in range(len(axes)):
+        rate = k + 1.0
+        theta, omega, omega_dot = sample(0.1), sample(0.1), sample(0.1)
+        theta[:, 2, 0] += np.sin(rate * time)
+        omega[:, 2, 0] += rate * np.cos(rate * time)
+        omega_dot[:, 2, 0] -= rate**2 * np.sin(rate * time)
+        rotations.append(Frame(constant(), TimePVA(p=theta, v=omega, a=omega_dot)))
+
+    return testbed, time, misalignments, rotations
@@ -0,0 +1,331 @@
+"""
+Benchmark suite of the kinematics hot paths across scales.
+
+Times, and measures the peak traced memory of, the orientation and skew symetric matrix
+conversions, ``World.process``, ``Axis.process`` and ``Testbed.process``, sweeping the number of
+time steps, the number of axes and constant or time-varying frames, and the three axis scenario of
+the example notebook. The peak memory is the memory allocated during a call on top of its
+inputs, as traced by ``tracemalloc``, which NumPy reports its arrays to. The axis and world caches
+are disabled, so every call evaluates from scratch. Results are written as JSON so runs of
+different commits can be compared.
+
+Run from the repository root with ``python -m benchmarks.suite``, see ``--help`` for the options.
+A sweep to ``10**7`` steps is long, use ``--quick`` for a smoke run. Compare two runs with
+``python -m benchmarks.suite --compare before.json after.json``.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from .scenario import STEPS, best, build, constant
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from math import tau
+from pathlib import Path
+from rtsim import Axis, Body, Frame, Mount, Testbed, TimePVA, World
+from rtsim.frame import orientation_to_dcm, skew_symetric
+from rtsim.kernel import METHODS
+import json
+import numpy as np
+import os
+import platform
+import subprocess
+import tracemalloc
+
+SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+
+AXES = (1, 2, 3, 4, 5)
+
+FRAMES = ("constant", "varying")
+
+BUDGET = 0.5
+
+LLHG = (35.051339, -106.545044, 1630.0, 9.7920631997)
+
+
+def peak(function: Callable[[], object]) -> int:
+    """Return the peak memory traced during one call above the memory traced before it, in bytes."""
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        function()
+        _, top = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return top - base
+
+
+def pva(steps: int, rng: np.random.Generator, scale: float) -> TimePVA:
+    """Build a PVA of ``steps`` random time steps, or of zeros if ``scale`` is zero."""
+    p, v, a = (rng.normal(scale=scale, size=(steps, 3, 1)) if scale else np.zeros((steps, 3, 1)) for _ in range(3))
+    return TimePVA(p=p, v=v, a=a)
+
+
+def rotation(steps: int, rng: np.random.Generator, rate: float, *, varying: bool) -> Frame:
+    """Build the rotating frame of an axis, at rest or oscillating about z at ``rate`` with noise."""
+    angular = pva(steps, rng, 1e-1 if varying else 0.0)
+    if varying:
+        time = np.arange(steps) * 1e-3
+        angular.p[:, 2, 0] += np.sin(rate * time)
+        angular.v[:, 2, 0] += rate * np.cos(rate * time)
+        angular.a[:, 2, 0] -= rate**2 * np.sin(rate * time)
+    return Frame(constant(), angular)
+
+
+def build_axes(axes: int, steps: int, *, varying: bool, seed: int = 0):
+    """
+    Build a testbed of ``axes`` nested axes and its inputs.
+
+    Constant inputs have zero misalignments and axes at rest. Time-varying inputs have random
+    misalignments and each axis oscillates at a different rate with noise on all three components.
+
+    :param axes: Number of axes.
+    :type axes: int
+
+    :param steps: Number of 1 ms time steps.
+    :type steps: int
+
+    :param varying: Whether the inputs vary with time.
+    :type varying: bool
+
+    :param seed: Seed of the noise, defaults to 0
+    :type seed: int, optional
+
+    :return: Testbed, time, misalignments and rotations.
+    :rtype: tuple[Testbed, np.ndarray, list[Frame], list[Frame]]
+    """
+    rng = np.random.default_rng(seed)
+    world = World("Terra", 6378137.0, 298.257223563, 7.2921150e-5)
+    components = [
+        Axis(f"Axis {k}", Frame(constant((-0.1 * (k % 2), 0.0, 0.0)), constant((0.0, tau / 4 * (k % 2), 0.0))))
+        for k in range(axes)
+    ]
+    mount = Mount("Mount", Frame(constant((0.3284, 0.0, 0.0)), constant((0.0, -tau / 4, 0.0))))
+    body = Body("IMU", Frame(constant((0.0164, 0.0, 0.0)), constant((tau / 4, 0.0, 0.0))))
+    bed = Testbed("Bench", llhg=LLHG, components=(world, components, mount, body))
+    bed.cache_size = 0
+    world.cache_size = 0
+
+    scale = 1e-3 if varying else 0.0
+    misalignments = [Frame(pva(steps, rng, scale), pva(steps, rng, scale)) for _ in range(axes)]
+    rotations = [rotation(steps, rng, k + 1.0, varying=varying) for k in range(axes)]
+    return bed, np.arange(steps) * 1e-3, misalignments, rotations
+
+
+def cases(sizes: tuple[int, ...], axes: tuple[int, ...], methods: tuple[str, ...]) -> Iterator[tuple[dict, Callable]]:
+    """
+    Yield the parameters and a setup of each case, in order of increasing size within each sweep.
+
+    A setup builds the inputs of a case and returns the call to benchmark, so the inputs of only one
+    case are held at a time.
+    """
+    yield from _conversions(sizes)
+    yield from _world(sizes)
+    yield from _axis(sizes, methods)
+    yield from _testbed(sizes, axes, methods)
+    yield from _scenario(methods)
+
+
+def _conversions(sizes: tuple[int, ...]) -> Iterator[tuple[dict, Callable]]:
+    """Yield the orientation and skew symetric matrix conversion cases."""
+    for name, function in (("orientation_to_dcm", orientation_to_dcm), ("skew_symetric", skew_symetric)):
+        for steps in sizes:
+
+            def setup(steps=steps, function=function):
+                v = np.random.default_rng(0).normal(size=(steps, 3, 1))
+                return lambda: function(v)
+
+            yield {"case": name, "steps": steps}, setup
+
+
+def _world(sizes: tuple[int, ...]) -> Iterator[tuple[dict, Callable]]:
+    """Yield the world frame cases, with the frame cache disabled."""
+    for steps in sizes:
+
+        def setup(steps=steps):
+            world = World("Terra", 6378137.0, 298.257223563, 7.2921150e-5)
+            world.cache_size = 0
+            time = np.arange(steps) * 1e-3
+
+            def function():
+                world.process(time)
+                return world.frame.C
+
+            return function
+
+        yield {"case": "World.process", "steps": steps}, setup
+
+
+def _axis(sizes: tuple[int, ...], methods: tuple[str, ...]) -> Iterator[tuple[dict, Callable]]:
+    """Yield the single axis cases, with constant or time-varying frames and lower axis PVA."""
+    for frames in FRAMES:
+        for method in methods:
+            for steps in sizes:
+
+                def setup(steps=steps, frames=frames, method=method):
+                    bed, _, misalignments, rotations = build_axes(1, steps, varying=frames == "varying")
+                    if frames == "varying":
+                        rng = np.random.default_rng(1)
+                        alpha, omega = pva(steps, rng, 1.0), pva(steps, rng, 1e-3)
+                    else:
+                        alpha, omega = constant(), constant()
+                    axis = bed.axes[0]
+                    return lambda: axis.process(misalignments[0], rotations[0], alpha, omega, method=method)
+
+                yield {"case": "Axis.process", "steps": steps, "frames": frames, "method": method}, setup
+
+
+def _testbed(
+    sizes: tuple[int, ...], axes: tuple[int, ...], methods: tuple[str, ...]
+) -> Iterator[tuple[dict, Callable]]:
+    """Yield the testbed cases, with the axis and world caches disabled."""
+    for count in axes:
+        for frames in FRAMES:
+            for method in methods:
+                for steps in sizes:
+
+                    def setup(steps=steps, count=count, frames=frames, method=method):
+                        bed, time, misalignments, rotations = build_axes(count, steps, varying=frames == "varying")
+                        return lambda: bed.process(time, misalignments, rotations, method=method)
+
+                    params = {"case": "Testbed.process", "steps": steps, "axes": count, "frames": frames}
+                    yield params | {"method": method}, setup
+
+
+def _scenario(methods: tuple[str, ...]) -> Iterator[tuple[dict, Callable]]:
+    """Yield the three axis scenario cases, with the axis and world caches disabled."""
+    for method in methods:
+
+        def setup(method=method):
+            bed, time, misalignments, rotations = build(noise=1.0)
+            bed.cache_size = 0
+            bed.world.cache_size = 0
+            return lambda: bed.process(time, misalignments, rotations, method=method)
+
+        yield {"case": "scenario", "steps": STEPS, "axes": 3, "method": method}, setup
+
+
+def key(params: dict) -> tuple:
+    """Return the key identifying a case across runs."""
+    return tuple(sorted(params.items()))
+
+
+def available() -> int:
+    """Return the physical memory available to the benchmark, in bytes."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return 8 * 2**30
+
+
+def commit() -> str | None:
+    """Return the commit of the working tree, if it is a git repository."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(sizes: tuple[int, ...], axes: tuple[int, ...], methods: tuple[str, ...], budget: int) -> list[dict]:
+    """
+    Run the cases, skipping those whose predicted peak memory exceeds the budget.
+
+    The peak memory of a case is predicted from the same case at the previous, smaller size, assuming
+    it grows linearly with the number of time steps.
+    """
+    results = []
+    previous = {}
+    for params, setup in cases(sizes, axes, methods):
+        group = key({name: value for name, value in params.items() if name != "steps"})
+        steps = params["steps"]
+        if group in previous:
+            size, nbytes = previous[group]
+            predicted = nbytes * steps / size
+            if predicted > budget:
+                print(f"{describe(params):<72} skipped, predicted peak {predicted / 2**20:,.0f} MiB")
+                results.append(params | {"skipped": True, "predicted": int(predicted)})
+                previous[group] = (steps, predicted)
+                continue
+
+        function = setup()
+        nbytes = peak(function)
+        seconds = best(function, limit=1.0)
+        del function
+        previous[group] = (steps, nbytes)
+        results.append(params | {"seconds": seconds, "peak": nbytes})
+        print(f"{describe(params):<72} {seconds * 1e3:10.2f} ms {nbytes / 2**20:10.1f} MiB")
+    return results
+
+
+def describe(params: dict) -> str:
+    """Describe a case in one line."""
+    return " ".join(f"{value}" if name == "case" else f"{name}={value}" for name, value in params.items())
+
+
+def compare(before: Path, after: Path) -> None:
+    """Print the time and peak memory ratios of the cases of two runs."""
+    old = {key(_params(r)): r for r in json.loads(before.read_text())["results"] if "seconds" in r}
+    new = json.loads(after.read_text())["results"]
+    print(f"{'':<72} {'time':>8} {'memory':>8}")
+    for result in new:
+        reference = old.get(key(_params(result)))
+        if reference is None or "seconds" not in result:
+            continue
+        time = result["seconds"] / reference["seconds"]
+        memory = result["peak"] / reference["peak"] if reference["peak"] else 1.0
+        print(f"{describe(_params(result)):<72} {time:7.2f}x {memory:7.2f}x")
+
+
+def _params(result: dict) -> dict:
+    """Return the parameters of a result."""
+    return {name: value for name, value in result.items() if name not in {"seconds", "peak", "skipped", "predicted"}}
+
+
+def main() -> None:
+    """Run the suite, or compare two runs."""
+    parser = ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="numbers of time steps")
+    parser.add_argument("--axes", type=int, nargs="+", default=AXES, help="numbers of testbed axes")
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS, help="evaluation methods")
+    parser.add_argument("--quick", action="store_true", help="sweep 10**3 to 10**5 steps and 1, 3 and 5 axes")
+    parser.add_argument("--budget", type=float, default=BUDGET, help="fraction of available memory per case")
+    parser.add_argument("--output", type=Path, help="JSON file of the results")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("BEFORE", "AFTER"), help="compare two runs")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    sizes, axes = tuple(args.sizes), tuple(args.axes)
+    if args.quick:
+        sizes, axes = tuple(s for s in sizes if s <= 10**5), tuple(a for a in axes if a % 2)
+
+    started = datetime.now(UTC).isoformat(timespec="seconds")
+    results = run(sizes, axes, tuple(args.methods), int(args.budget * available()))
+    if args.output:
+        meta = {
+            "commit": commit(),
+            "date": started,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+        }
+        args.output.write_text(json.dumps(meta | {"results": results}, indent=1) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,8 @@ from .axis import Axis
 from .body import Body
 from .frame import Frame
 from .mount import Mount
-from .pva import ConstantPVA, TimePVA
+from .plan import Plan
+from .pva import BatchPVA, ConstantPVA, PackedPVA, TimePVA
 from .testbed import Testbed
 from .world import World
 
@@ -8,10 +8,11 @@ NTESS, the U.S. Government retains certain rights in this software.
 
 # SPDX-License-Identifier: BSD-3-Clause
 
+from . import kernel, profiling, validate
 from .base import Base
 from .exceptions import FrameTypeError
 from .frame import Frame
-from .pva import ConstantPVA, TimePVA
+from .pva import ConstantPVA, PackedPVA, TimePVA
 import numpy as np
 
 
@@ -39,11 +40,20 @@ class Axis(Base):
         self.zeta = zeta
 
     def process(
-        self, mu: Frame, rho: Frame, alpha: ConstantPVA | TimePVA, omega: ConstantPVA | TimePVA
+        self,
+        mu: Frame,
+        rho: Frame,
+        alpha: ConstantPVA | TimePVA,
+        omega: ConstantPVA | TimePVA,
+        *,
+        method: str = "reference",
     ) -> tuple[TimePVA, TimePVA]:
         r"""
         Process the axis to provide linear and angular PVA outputs of axis.
 
+        The axis is evaluated from its arguments only and stores no state, so concurrent calls, such as
+        those of sharded runs, are independent.
+
         :param mu: Axis misalignment :math:`(\mu)` coordinate frame.
         :type mu: Frame[Full]
 
@@ -56,8 +66,13 @@ class Axis(Base):
         :param omega: Angular PVA from lower level axis.
         :type omega: ConstantPVA | TimePVA
 
+        :param method: Evaluation method, "reference", "fused" or "quaternion", defaults to "reference".
+            An axis composes no attitude chain, so "quaternion" evaluates as "fused".
+        :type method: str, optional
+
         :raises FrameTypeError: If 'mu' is not a Full type coordinate frame.
         :raises FrameTypeError: If 'rho' is not a Rotating type coordinate frame.
+        :raises OptionError: If 'method' is not a known evaluation method.
 
         :return: Linear and angular PVA from this axis.
         :rtype: tuple[TimePVA, TimePVA]
@@ -66,37 +81,61 @@ class Axis(Base):
             var_name = "mu"
             raise FrameTypeError(var_name, "Full")
 
-        self.mu = mu
-
         if rho.frame_type != "Rotating":
             var_name = "rho"
             raise FrameTypeError(var_name, "Rotating")
 
-        self.rho = rho
+        validate.option(method, kernel.METHODS)
 
-        C_dot_rho = self.rho.Omega @ self.rho.C
-        C_ddot_rho = self.rho.Omega_dot @ self.rho.C + self.rho.Omega @ self.rho.Omega @ self.rho.C
+        with profiling.stage("Axis.process", axis=self.moniker, method=method):
+            if method != "reference":
+                return self._process_fused(mu, rho, alpha, omega)
+            return self._process_reference(mu, rho, alpha, omega)
 
-        alpha_a = self.zeta.C @ (
-            self.mu.linear.a + C_ddot_rho @ alpha.p + 2 * C_dot_rho @ alpha.v + self.rho.C @ alpha.a
+    def _process_reference(
+        self, mu: Frame, rho: Frame, alpha: ConstantPVA | TimePVA, omega: ConstantPVA | TimePVA
+    ) -> tuple[TimePVA, TimePVA]:
+        """Process the axis with the reference equations, into one buffer per output PVA."""
+        C_dot_rho = rho.Omega @ rho.C
+        C_ddot_rho = rho.Omega_dot @ rho.C + rho.Omega @ rho.Omega @ rho.C
+
+        x = mu.linear.a + C_ddot_rho @ alpha.p + 2 * C_dot_rho @ alpha.v + rho.C @ alpha.a
+        alpha_out = PackedPVA.empty(x.shape[0])
+        np.matmul(self.zeta.C, x, out=alpha_out.a)
+        del x
+
+        np.matmul(self.zeta.C, mu.linear.v + C_dot_rho @ alpha.p + rho.C @ alpha.v, out=alpha_out.v)
+
+        np.matmul(self.zeta.C, mu.linear.p + rho.C @ alpha.p, out=alpha_out.p)
+        alpha_out.p += self.zeta.linear.p
+
+        x = (
+            mu.angular.a
+            + mu.Omega @ mu.C @ rho.angular.v
+            + mu.C @ rho.angular.a
+            + mu.Omega @ mu.C @ rho.C @ omega.v
+            + mu.C @ rho.Omega @ rho.C @ omega.v
+            + mu.C @ rho.C @ omega.a
         )
+        omega_out = PackedPVA.zeros(x.shape[0])
+        np.matmul(self.zeta.C, x, out=omega_out.a)
+        del x
 
-        alpha_v = self.zeta.C @ (self.mu.linear.v + C_dot_rho @ alpha.p + self.rho.C @ alpha.v)
+        np.matmul(self.zeta.C, mu.angular.v + mu.C @ rho.angular.v + mu.C @ rho.C @ omega.v, out=omega_out.v)
 
-        alpha_p = self.zeta.linear.p + self.zeta.C @ (self.mu.linear.p + self.rho.C @ alpha.p)
+        return alpha_out.view(), omega_out.view()
 
-        omega_a = self.zeta.C @ (
-            self.mu.angular.a
-            + self.mu.Omega @ self.mu.C @ self.rho.angular.v
-            + self.mu.C @ self.rho.angular.a
-            + self.mu.Omega @ self.mu.C @ self.rho.C @ omega.v
-            + self.mu.C @ self.rho.Omega @ self.rho.C @ omega.v
-            + self.mu.C @ self.rho.C @ omega.a
-        )
+    def _process_fused(
+        self, mu: Frame, rho: Frame, alpha: ConstantPVA | TimePVA, omega: ConstantPVA | TimePVA
+    ) -> tuple[TimePVA, TimePVA]:
+        """Process the axis with the fused kernel."""
+        steps = rho.angular.v.shape[0]
+        state = [kernel.value(x) for x in (alpha.p, alpha.v, alpha.a, omega.v, omega.a)]
 
-        omega_v = self.zeta.C @ (self.mu.angular.v + self.mu.C @ self.rho.angular.v + self.mu.C @ self.rho.C @ omega.v)
+        kernel.axis_step(kernel.fixed(self.zeta), mu, rho, state, kernel.Workspace((steps, 3)))
 
+        p, v, a, ov, oa = (kernel.column(x, (steps, 3)) for x in state)
         return (
-            TimePVA(p=alpha_p, v=alpha_v, a=alpha_a),
-            TimePVA(p=np.zeros((omega_v.shape[0], 3, 1)), v=omega_v, a=omega_a),
+            TimePVA(p=p, v=v, a=a),
+            TimePVA(p=np.zeros((steps, 3, 1)), v=ov, a=oa),
         )
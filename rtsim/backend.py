@@ -0,0 +1,306 @@
+"""
+RTSim compute backends.
+
+A backend provides the per-sample kernels of the kinematics: the direction cosine matrix of an
+orientation, the composition of an attitude chain and the update of the linear and angular PVA
+through an axis. A kernel left as ``None`` is evaluated with NumPy, as vectorized passes over the
+time steps, which is the ``"numpy"`` backend, used by default. When Numba is installed, the
+``"numba"`` backend compiles the loops of this module, which evaluate every sample in one pass
+through memory. It is opt-in, selected with :func:`use` or :func:`using`.
+
+The loops are plain Python, so they can be checked against the NumPy kernels without Numba, on a
+few time steps, with a backend of their uncompiled versions.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import validate
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from math import cos, sin
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _kernel(function: Callable) -> Callable:
+    """Compile a loop with Numba when it is installed, releasing the GIL so time shards run in parallel."""
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+class Backend:
+    """Named set of per-sample kernels, ``None`` for a kernel evaluated with NumPy."""
+
+    __slots__ = ("axis_update", "compose", "dcm", "name")
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        dcm: Callable | None = None,
+        compose: Callable | None = None,
+        axis_update: Callable | None = None,
+    ) -> None:
+        """
+        Initialize a backend.
+
+        :param name: Name of the backend.
+        :type name: str
+
+        :param dcm: Kernel with the signature of :func:`dcm_loop`, defaults to NumPy
+        :type dcm: Callable, optional
+
+        :param compose: Kernel with the signature of :func:`compose_loop`, defaults to NumPy
+        :type compose: Callable, optional
+
+        :param axis_update: Kernel with the signature of :func:`axis_loop`, defaults to NumPy
+        :type axis_update: Callable, optional
+        """
+        validate.string(name)
+        self.name = name
+        self.dcm = dcm
+        self.compose = compose
+        self.axis_update = axis_update
+
+    def __repr__(self):
+        """Return a string representation of the backend."""
+        return f"Backend({self.name})"
+
+
+@_kernel
+def _rotate(C: np.ndarray, x0: float, x1: float, x2: float) -> tuple[float, float, float]:
+    """Product of a 3x3 matrix and a vector."""
+    return (
+        C[0, 0] * x0 + C[0, 1] * x1 + C[0, 2] * x2,
+        C[1, 0] * x0 + C[1, 1] * x1 + C[1, 2] * x2,
+        C[2, 0] * x0 + C[2, 1] * x1 + C[2, 2] * x2,
+    )
+
+
+@_kernel
+def _cross(a0: float, a1: float, a2: float, b0: float, b1: float, b2: float) -> tuple[float, float, float]:  # noqa: PLR0913, PLR0917
+    """Cross product of two vectors."""
+    return a1 * b2 - a2 * b1, a2 * b0 - a0 * b2, a0 * b1 - a1 * b0
+
+
+@_kernel
+def dcm_loop(v: np.ndarray, out: np.ndarray) -> None:
+    r"""
+    Direction cosine matrix of each orientation, as :func:`rtsim.frame.orientation_to_dcm`.
+
+    :param v: :math:`\mathrm{Tx3}` orientation vectors, :math:`\mathrm{rad}`
+    :type v: np.ndarray
+
+    :param out: :math:`\mathrm{Tx3x3}` output buffer.
+    :type out: np.ndarray
+    """
+    for t in range(v.shape[0]):
+        sin_alpha, sin_beta, sin_gamma = sin(v[t, 0]), sin(v[t, 1]), sin(v[t, 2])
+        cos_alpha, cos_beta, cos_gamma = cos(v[t, 0]), cos(v[t, 1]), cos(v[t, 2])
+        sin_alpha_sin_beta = sin_alpha * sin_beta
+        cos_alpha_sin_beta = cos_alpha * sin_beta
+        out[t, 0, 0] = cos_beta * cos_gamma
+        out[t, 0, 1] = sin_alpha_sin_beta * cos_gamma - cos_alpha * sin_gamma
+        out[t, 0, 2] = cos_alpha_sin_beta * cos_gamma + sin_alpha * sin_gamma
+        out[t, 1, 0] = cos_beta * sin_gamma
+        out[t, 1, 1] = sin_alpha_sin_beta * sin_gamma + cos_alpha * cos_gamma
+        out[t, 1, 2] = cos_alpha_sin_beta * sin_gamma - sin_alpha * cos_gamma
+        out[t, 2, 0] = -sin_beta
+        out[t, 2, 1] = sin_alpha * cos_beta
+        out[t, 2, 2] = cos_alpha * cos_beta
+
+
+@_kernel
+def compose_loop(F: np.ndarray, C: np.ndarray, out: np.ndarray) -> None:
+    r"""
+    Matrix product :math:`F C` of each time step, as :func:`rtsim.kernel.compose`.
+
+    Both operands of a time step are read before its product is written, so ``out`` may be ``F`` or ``C``.
+
+    :param F: :math:`\mathrm{Tx3x3}` left matrices, which may be broadcast.
+    :type F: np.ndarray
+
+    :param C: :math:`\mathrm{Tx3x3}` right matrices, which may be broadcast.
+    :type C: np.ndarray
+
+    :param out: :math:`\mathrm{Tx3x3}` output buffer.
+    :type out: np.ndarray
+    """
+    for t in range(out.shape[0]):
+        c = C[t, 0, 0], C[t, 0, 1], C[t, 0, 2], C[t, 1, 0], C[t, 1, 1], C[t, 1, 2], C[t, 2, 0], C[t, 2, 1], C[t, 2, 2]
+        f = F[t, 0, 0], F[t, 0, 1], F[t, 0, 2], F[t, 1, 0], F[t, 1, 1], F[t, 1, 2], F[t, 2, 0], F[t, 2, 1], F[t, 2, 2]
+        for i in range(3):
+            for j in range(3):
+                out[t, i, j] = f[3 * i] * c[j] + f[3 * i + 1] * c[3 + j] + f[3 * i + 2] * c[6 + j]
+
+
+@_kernel
+def _store(out: np.ndarray, t: int, Z: np.ndarray, x0: float, x1: float, x2: float) -> None:  # noqa: PLR0913, PLR0917
+    """Rotate a vector by a 3x3 matrix into a time step of an output."""
+    z0, z1, z2 = _rotate(Z, x0, x1, x2)
+    out[t, 0] = z0
+    out[t, 1] = z1
+    out[t, 2] = z2
+
+
+@_kernel
+def axis_loop(  # noqa: PLR0913, PLR0917
+    Z: np.ndarray,
+    zp: np.ndarray,
+    M: np.ndarray,
+    R: np.ndarray,
+    rho: tuple[np.ndarray, np.ndarray],
+    mu: tuple[np.ndarray, ...],
+    state: tuple[np.ndarray, ...],
+    out: tuple[np.ndarray, ...],
+) -> None:
+    r"""
+    Propagate linear and angular PVA through one axis, as :func:`rtsim.kernel.axis_step`.
+
+    Every input of a time step is read before its outputs are written, so ``out`` may hold the same
+    buffers as ``state``. Inputs may be broadcast over the time steps.
+
+    :param Z: :math:`\mathrm{3x3}` rotation of the zero frame of the axis.
+    :type Z: np.ndarray
+
+    :param zp: :math:`\mathrm{3}` offset of the zero frame of the axis.
+    :type zp: np.ndarray
+
+    :param M: :math:`\mathrm{Tx3x3}` rotation of the misalignment frame.
+    :type M: np.ndarray
+
+    :param R: :math:`\mathrm{Tx3x3}` rotation of the rotating frame.
+    :type R: np.ndarray
+
+    :param rho: :math:`\mathrm{Tx3}` angular velocity and acceleration of the rotating frame.
+    :type rho: tuple[np.ndarray, np.ndarray]
+
+    :param mu: :math:`\mathrm{Tx3}` linear position, velocity and acceleration and angular velocity
+        and acceleration of the misalignment frame.
+    :type mu: tuple[np.ndarray, ...]
+
+    :param state: :math:`\mathrm{Tx3}` linear position, velocity and acceleration and angular velocity
+        and acceleration of the lower level axis.
+    :type state: tuple[np.ndarray, ...]
+
+    :param out: :math:`\mathrm{Tx3}` output buffers, in the order of ``state``.
+    :type out: tuple[np.ndarray, ...]
+    """
+    w, wd = rho
+    mp, mv, ma, mav, maa = mu
+    p, v, a, ov, oa = state
+    for t in range(out[0].shape[0]):
+        Rt, Mt = R[t], M[t]
+        w0, w1, w2 = w[t, 0], w[t, 1], w[t, 2]
+        d0, d1, d2 = wd[t, 0], wd[t, 1], wd[t, 2]
+        v0, v1, v2 = mav[t, 0], mav[t, 1], mav[t, 2]
+
+        p0, p1, p2 = _rotate(Rt, p[t, 0], p[t, 1], p[t, 2])
+        r0, r1, r2 = _rotate(Rt, v[t, 0], v[t, 1], v[t, 2])
+        a0, a1, a2 = _rotate(Rt, a[t, 0], a[t, 1], a[t, 2])
+        o0, o1, o2 = _rotate(Rt, ov[t, 0], ov[t, 1], ov[t, 2])
+        e0, e1, e2 = _rotate(Rt, oa[t, 0], oa[t, 1], oa[t, 2])
+
+        q0, q1, q2 = _cross(w0, w1, w2, p0, p1, p2)
+        x0, x1, x2 = _cross(w0, w1, w2, 2.0 * r0 + q0, 2.0 * r1 + q1, 2.0 * r2 + q2)
+        y0, y1, y2 = _cross(d0, d1, d2, p0, p1, p2)
+        la0, la1, la2 = x0 + y0 + a0 + ma[t, 0], x1 + y1 + a1 + ma[t, 1], x2 + y2 + a2 + ma[t, 2]
+        lv0, lv1, lv2 = q0 + r0 + mv[t, 0], q1 + r1 + mv[t, 1], q2 + r2 + mv[t, 2]
+        lp0, lp1, lp2 = p0 + mp[t, 0], p1 + mp[t, 1], p2 + mp[t, 2]
+
+        s0, s1, s2 = _rotate(Mt, w0 + o0, w1 + o1, w2 + o2)
+        x0, x1, x2 = _cross(w0, w1, w2, o0, o1, o2)
+        x0, x1, x2 = _rotate(Mt, x0 + d0 + e0, x1 + d1 + e1, x2 + d2 + e2)
+        y0, y1, y2 = _cross(v0, v1, v2, s0, s1, s2)
+        aa0, aa1, aa2 = x0 + y0 + maa[t, 0], x1 + y1 + maa[t, 1], x2 + y2 + maa[t, 2]
+
+        _store(out[0], t, Z, lp0, lp1, lp2)
+        _store(out[1], t, Z, lv0, lv1, lv2)
+        _store(out[2], t, Z, la0, la1, la2)
+        _store(out[3], t, Z, v0 + s0, v1 + s1, v2 + s2)
+        _store(out[4], t, Z, aa0, aa1, aa2)
+        out[0][t, 0] += zp[0]
+        out[0][t, 1] += zp[1]
+        out[0][t, 2] += zp[2]
+
+
+_backends = {"numpy": Backend("numpy")}
+
+if numba is not None:
+    _backends["numba"] = Backend("numba", dcm=dcm_loop, compose=compose_loop, axis_update=axis_loop)
+
+_active = _backends["numpy"]
+
+
+def register(backend: Backend) -> None:
+    """
+    Make a backend available to :func:`use`, replacing any of the same name.
+
+    :param backend: Backend.
+    :type backend: Backend
+    """
+    _backends[backend.name] = backend
+
+
+def available() -> tuple[str, ...]:
+    """
+    Return the names of the available backends.
+
+    :return: Names of the backends, ``"numpy"`` first.
+    :rtype: tuple[str, ...]
+    """
+    return tuple(_backends)
+
+
+def active() -> Backend:
+    """
+    Return the backend used by the kernels.
+
+    :return: Active backend, ``"numpy"`` unless changed with :func:`use`.
+    :rtype: Backend
+    """
+    return _active
+
+
+def use(name: str) -> None:
+    """
+    Use a backend for every following evaluation, in every thread.
+
+    :param name: Name of an available backend.
+    :type name: str
+
+    :raises OptionError: If 'name' is not an available backend.
+    """
+    global _active  # noqa: PLW0603
+    validate.option(name, available())
+    _active = _backends[name]
+
+
+@contextmanager
+def using(name: str) -> Iterator[Backend]:
+    """
+    Use a backend within a ``with`` block, restoring the previous backend on exit.
+
+    :param name: Name of an available backend.
+    :type name: str
+
+    :raises OptionError: If 'name' is not an available backend.
+
+    :return: Context manager giving the backend.
+    :rtype: Iterator[Backend]
+    """
+    previous = _active.name
+    use(name)
+    try:
+        yield _active
+    finally:
+        use(previous)
@@ -0,0 +1,264 @@
+"""
+RTSim caches of intermediate results.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import validate
+from .frame import Frame
+from .pva import ConstantPVA, PackedPVA, TimePVA
+from collections import OrderedDict
+import numpy as np
+
+
+def frame_key(frame: Frame) -> tuple:
+    """
+    Identity of a coordinate frame and of the PVA it holds.
+
+    Frames and PVA are treated as values: replacing a frame, or the linear or angular PVA of a frame,
+    changes its key, while modifying their arrays in place does not.
+
+    :param frame: Coordinate frame.
+    :type frame: Frame
+
+    :return: Objects identifying the frame.
+    :rtype: tuple
+    """
+    return frame, frame.linear, frame.angular
+
+
+def time_key(time: np.ndarray) -> tuple:
+    """
+    Identity of a time vector and a descriptor of its grid.
+
+    The vector is identified by the array object, as frames are by :func:`frame_key`, and described by
+    its length, first step, step size and last step, so the key costs the same for any length. Passing
+    the same array again matches it, while a new array, even with equal values, does not. Modifying an
+    array in place is only detected when it changes the descriptor, such as shifting or rescaling it.
+
+    :param time: Relative time of each step.
+    :type time: np.ndarray
+
+    :return: Hashable key.
+    :rtype: tuple
+    """
+    flat = np.reshape(time, -1)
+    step = float(flat[1] - flat[0]) if flat.size > 1 else 0.0
+    start, stop = (float(flat[0]), float(flat[-1])) if flat.size else (0.0, 0.0)
+    return _Identity(time), time.shape, time.dtype.str, start, step, stop
+
+
+class _Identity:
+    """Hashable reference to an object compared by identity, keeping it alive while it is a key."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj) -> None:
+        """Initialize a reference to 'obj'."""
+        self.obj = obj
+
+    def __hash__(self) -> int:
+        """Hash of the identity of the object."""
+        return id(self.obj)
+
+    def __eq__(self, other) -> bool:
+        """Whether 'other' references the same object."""
+        return isinstance(other, _Identity) and other.obj is self.obj
+
+
+class FrameCache:
+    """
+    Bounded least recently used cache of coordinate frames.
+
+    Frames are evicted least recently used first so that the arrays of the cached frames fit in
+    ``size`` bytes, and a frame larger than ``size`` is not cached. Cached frames are shared by every
+    lookup, so their arrays should be read-only.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Initialize an empty cache.
+
+        :param size: Memory cap of the arrays of the cached frames, in bytes.
+        :type size: int
+        """
+        validate.integer(size, minvalue=0)
+        self.size = size
+        self.frames = OrderedDict()
+        self.sizes = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays of the cached frames, in bytes."""
+        return sum(self.sizes.values())
+
+    def get(self, key) -> Frame | None:
+        """
+        Look up a frame, counting a hit or a miss.
+
+        :param key: Hashable key of the frame.
+        :type key: Hashable
+
+        :return: Cached frame, or ``None``.
+        :rtype: Frame | None
+        """
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.frames.move_to_end(key)
+        return frame
+
+    def put(self, key, frame: Frame) -> None:
+        """
+        Cache a frame, evicting the least recently used frames until it fits.
+
+        :param key: Hashable key of the frame.
+        :type key: Hashable
+
+        :param frame: Coordinate frame.
+        :type frame: Frame
+        """
+        self.frames.pop(key, None)
+        self.sizes.pop(key, None)
+        size = _nbytes((frame.linear, frame.angular, frame.C))
+        if size > self.size:
+            return
+        self.frames[key] = frame
+        self.sizes[key] = size
+        self._evict()
+
+    def resize(self, size: int) -> None:
+        """
+        Change the memory cap, evicting the least recently used frames that no longer fit.
+
+        :param size: Memory cap of the arrays of the cached frames, in bytes.
+        :type size: int
+        """
+        validate.integer(size, minvalue=0)
+        self.size = size
+        self._evict()
+
+    def clear(self) -> None:
+        """Drop every frame and reset the counters."""
+        self.frames.clear()
+        self.sizes.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self) -> None:
+        """Drop the least recently used frames until the cache fits in its memory cap."""
+        while self.nbytes > self.size:
+            key, _ = self.frames.popitem(last=False)
+            del self.sizes[key]
+
+
+class PrefixCache:
+    """
+    Per-axis intermediate state of the last evaluation of a testbed.
+
+    Entry ``a`` holds the state after axis ``a`` together with the key of every input it depends on,
+    that is the keys of axes ``0`` to ``a``. When a testbed is evaluated again, the leading axes whose
+    keys are unchanged are resumed from the cache and only the downstream axes are evaluated. Keys are
+    compared by identity, and the cache holds a reference to them so identities cannot be reused.
+
+    Only the leading entries that fit in ``size`` bytes are kept.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Initialize an empty cache.
+
+        :param size: Memory cap of the cached arrays, in bytes.
+        :type size: int
+        """
+        validate.integer(size, minvalue=0)
+        self.size = size
+        self.keys = []
+        self.entries = []
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the cached arrays, in bytes."""
+        return sum(_nbytes(entry) for entry in self.entries)
+
+    def resume(self, keys: list[tuple]) -> tuple[int, tuple | None]:
+        """
+        Find the longest cached prefix of the axes.
+
+        :param keys: Key of each axis, in order.
+        :type keys: list[tuple]
+
+        :return: Number of leading axes to resume and the state after the last of them, if any.
+        :rtype: tuple[int, tuple | None]
+        """
+        count = 0
+        for cached, key in zip(self.keys, keys, strict=False):
+            if len(cached) != len(key) or any(x is not y for x, y in zip(cached, key, strict=True)):
+                break
+            count += 1
+
+        del self.keys[count:], self.entries[count:]
+        return count, self.entries[count - 1] if count else None
+
+    def store(self, index: int, key: tuple, entry: tuple) -> None:
+        """
+        Cache the state after an axis, if it fits.
+
+        :param index: Index of the axis, the entries of the previous axes must already be cached.
+        :type index: int
+
+        :param key: Key of the axis.
+        :type key: tuple
+
+        :param entry: State after the axis.
+        :type entry: tuple
+        """
+        if index != len(self.entries) or self.nbytes + _nbytes(entry) > self.size:
+            return
+        self.keys.append(key)
+        self.entries.append(entry)
+
+    def resize(self, size: int) -> None:
+        """
+        Change the memory cap, dropping the trailing entries that no longer fit.
+
+        :param size: Memory cap of the cached arrays, in bytes.
+        :type size: int
+        """
+        validate.integer(size, minvalue=0)
+        self.size = size
+
+        total = 0
+        for count, entry in enumerate(self.entries):
+            total += _nbytes(entry)
+            if total > size:
+                del self.keys[count:], self.entries[count:]
+                break
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.keys.clear()
+        self.entries.clear()
+
+
+def _nbytes(entry) -> int:
+    """Memory held by the arrays of a cache entry, counting each array once."""
+    arrays = {}
+    stack = [entry]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, np.ndarray):
+            arrays[id(x)] = x.nbytes
+        elif isinstance(x, tuple | list):
+            stack.extend(x)
+        elif isinstance(x, ConstantPVA | TimePVA | PackedPVA):
+            stack.extend((x.p, x.v, x.a))
+    return sum(arrays.values())
@@ -0,0 +1,271 @@
+"""
+RTSim memory diagnostics.
+
+:func:`diagnose` runs :meth:`Testbed.process` under a :class:`~rtsim.profiling.Profiler` recording
+memory, and reports the bytes allocated by each stage and the high-water mark of the run.
+:func:`check_inputs` flags input arrays that make NumPy copy or convert them on every use, and
+:func:`estimate` predicts the memory a run needs before its inputs are built.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import kernel, validate
+from .axis import Axis
+from .body import Body
+from .frame import Frame
+from .mount import Mount
+from .profiling import Profiler
+from .pva import ConstantPVA, TimePVA
+from .world import World
+from functools import lru_cache
+from math import tau
+from typing import TYPE_CHECKING
+import numpy as np
+import tracemalloc
+
+if TYPE_CHECKING:
+    from .testbed import Testbed
+
+CALIBRATION_STEPS = (1024, 4096)
+
+INPUTS_PER_AXIS = 9
+
+
+class Report:
+    """Memory used by a run of :meth:`Testbed.process` and the inputs it was given."""
+
+    def __init__(
+        self, findings: list[str], stages: dict[str, dict[str, float]], peak: int, inputs: int, estimate: int
+    ) -> None:
+        """
+        Initialize a report.
+
+        :param findings: Inputs that force copies or conversions, see :func:`check_inputs`.
+        :type findings: list[str]
+
+        :param stages: Calls, seconds and peak bytes allocated by each stage, see :meth:`Profiler.summary`.
+        :type stages: dict[str, dict[str, float]]
+
+        :param peak: High-water mark of the memory allocated by the run, in bytes.
+        :type peak: int
+
+        :param inputs: Memory held by the time varying inputs, in bytes.
+        :type inputs: int
+
+        :param estimate: Memory estimated by :func:`estimate` for the inputs and the run, in bytes.
+        :type estimate: int
+        """
+        self.findings = findings
+        self.stages = stages
+        self.peak = peak
+        self.inputs = inputs
+        self.estimate = estimate
+
+    def __str__(self):
+        """Return the report as a table of stages followed by the findings."""
+        lines = [f"{'stage':<20} {'calls':>6} {'seconds':>10} {'peak MiB':>10}"]
+        lines.extend(
+            f"{name:<20} {total['calls']:>6} {total['seconds']:>10.4f} {total['peak'] / 2**20:>10.1f}"
+            for name, total in self.stages.items()
+        )
+        lines.append(
+            f"high-water mark {self.peak / 2**20:.1f} MiB plus {self.inputs / 2**20:.1f} MiB of inputs, "
+            f"estimate {self.estimate / 2**20:.1f} MiB"
+        )
+        lines.extend(f"warning: {finding}" for finding in self.findings)
+        return "\n".join(lines)
+
+
+def check_inputs(time: np.ndarray, misalignments: list[Frame], rotations: list[Frame]) -> list[str]:
+    """
+    Flag time varying inputs that NumPy copies or converts on every use.
+
+    An input is flagged if it is not C-contiguous, such as a column of a larger array, is not in
+    native byte order, or is not double precision. Constant ``3x1`` inputs are not checked, as
+    copying them costs nothing.
+
+    :param time: Relative time of each step.
+    :type time: np.ndarray
+
+    :param misalignments: Misalignment coordinate frame of each testbed axis.
+    :type misalignments: list[Frame[Full]]
+
+    :param rotations: Rotating coordinate frame of each testbed axis.
+    :type rotations: list[Frame[Rotating]]
+
+    :return: One message per flagged input, naming it, such as ``rotations[1].angular.v``.
+    :rtype: list[str]
+    """
+    findings = []
+    for name, x in _arrays(time, misalignments, rotations):
+        if not x.flags.c_contiguous:
+            findings.append(f"{name} is not C-contiguous, strides {x.strides}, and is copied where a buffer is needed")
+        if not x.dtype.isnative:
+            findings.append(f"{name} is not in native byte order, and is converted by every operation")
+        if x.dtype.newbyteorder("=") != np.float64:
+            findings.append(f"{name} is {x.dtype}, not float64, and is converted by every operation")
+    return findings
+
+
+def estimate(
+    steps: int,
+    axes: int,
+    *,
+    method: str = "reference",
+    outputs: tuple[str, ...] | None = None,
+    precision: str = "float64",
+) -> int:
+    """
+    Estimate the memory needed to process time varying inputs, before they are built.
+
+    The estimate is the size of double precision time varying inputs plus the peak memory allocated
+    by :meth:`Testbed.process` without sharding. The peak is extrapolated linearly from runs of a
+    testbed with ``axes`` axes at ``CALIBRATION_STEPS`` time steps, which are cached. The world and
+    testbed caches are opt-in, and are counted up to their default memory caps, the ``CACHE_SIZE`` of
+    each module, which are 0. Constant inputs need less.
+
+    :param steps: Number of time steps.
+    :type steps: int
+
+    :param axes: Number of testbed axes.
+    :type axes: int
+
+    :param method: Evaluation method, "reference", "fused" or "quaternion", defaults to "reference"
+    :type method: str, optional
+
+    :param outputs: Names of the outputs to evaluate, defaults to all of ``OUTPUTS``
+    :type outputs: tuple[str, ...], optional
+
+    :param precision: Precision policy of the fused and quaternion methods, defaults to "float64"
+    :type precision: str, optional
+
+    :raises OptionError: If 'method', an output name or 'precision' is not known.
+
+    :return: Estimated memory, in bytes.
+    :rtype: int
+    """
+    from .testbed import CACHE_SIZE  # noqa: PLC0415
+    from .world import CACHE_SIZE as WORLD_CACHE_SIZE  # noqa: PLC0415
+
+    validate.integer(steps, minvalue=1)
+    validate.integer(axes, minvalue=1)
+    validate.option(method, kernel.METHODS)
+    validate.option(precision, kernel.PRECISIONS)
+    outputs = kernel.OUTPUTS if outputs is None else tuple(outputs)
+    for name in outputs:
+        validate.option(name, kernel.OUTPUTS)
+
+    base, slope = _calibrate(axes, method, outputs, precision, cache=False)
+    inputs = steps * (8 + axes * INPUTS_PER_AXIS * 3 * 8)
+    run = base + slope * steps
+    if CACHE_SIZE + WORLD_CACHE_SIZE:
+        _, cached = _calibrate(axes, method, outputs, precision, cache=True)
+        run += min(max(cached - slope, 0.0) * steps, CACHE_SIZE + WORLD_CACHE_SIZE)
+    return int(inputs + run)
+
+
+def diagnose(
+    testbed: "Testbed", time: np.ndarray, misalignments: list[Frame], rotations: list[Frame], **kwargs
+) -> Report:
+    """
+    Process testbed inputs recording the memory allocated by each stage.
+
+    :param testbed: Testbed.
+    :type testbed: Testbed
+
+    :param time: Relative time of each step.
+    :type time: np.ndarray
+
+    :param misalignments: Misalignment coordinate frame of each testbed axis.
+    :type misalignments: list[Frame[Full]]
+
+    :param rotations: Rotating coordinate frame of each testbed axis.
+    :type rotations: list[Frame[Rotating]]
+
+    :param kwargs: Other arguments of :meth:`Testbed.process`.
+
+    :return: Report of the run.
+    :rtype: Report
+    """
+    findings = check_inputs(time, misalignments, rotations)
+    method = kwargs.get("method", "reference")
+    precision = kwargs.get("precision", "float64")
+    predicted = estimate(
+        time.size, len(testbed.axes), method=method, outputs=kwargs.get("outputs"), precision=precision
+    )
+
+    with Profiler(memory=True) as profiler:
+        testbed.process(time, misalignments, rotations, **kwargs)
+
+    root = profiler.events[-1]
+    inputs = sum(x.nbytes for _, x in _arrays(time, misalignments, rotations))
+    return Report(findings, profiler.summary(), root.peak, inputs, predicted)
+
+
+def _arrays(time: np.ndarray, misalignments: list[Frame], rotations: list[Frame]) -> list[tuple[str, np.ndarray]]:
+    """Name and array of each time varying input."""
+    arrays = [("time", time)]
+    for group, frames in (("misalignments", misalignments), ("rotations", rotations)):
+        for a, frame in enumerate(frames):
+            for part in ("linear", "angular"):
+                pva = getattr(frame, part)
+                arrays.extend((f"{group}[{a}].{part}.{x}", getattr(pva, x)) for x in ("p", "v", "a"))
+    return [(name, x) for name, x in arrays if x.ndim != validate.CONSTANT_NDIM]
+
+
+@lru_cache(maxsize=64)
+def _calibrate(axes: int, method: str, outputs: tuple[str, ...], precision: str, *, cache: bool) -> tuple[float, float]:
+    """Return the intercept and slope, in bytes and bytes per step, of the peak memory of a run."""
+    peaks = []
+    for steps in CALIBRATION_STEPS:
+        testbed, time, misalignments, rotations = _scenario(axes, steps)
+        testbed.world.cache_size = 2**30 if cache else 0
+        if not cache:
+            testbed.cache_size = 0
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            testbed.process(time, misalignments, rotations, method=method, outputs=outputs, precision=precision)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+    (n1, n2), (p1, p2) = CALIBRATION_STEPS, peaks
+    slope = (p2 - p1) / (n2 - n1)
+    return p1 - slope * n1, slope
+
+
+def _scenario(axes: int, steps: int) -> tuple["Testbed", np.ndarray, list[Frame], list[Frame]]:
+    """Build a testbed of 'axes' axes and random time varying inputs."""
+    from .testbed import Testbed  # noqa: PLC0415
+
+    rng = np.random.default_rng(0)
+    zero = np.zeros((3, 1))
+
+    def constant(p=(0.0, 0.0, 0.0)):
+        return ConstantPVA(p=np.array(p, dtype=float).reshape(3, 1), v=zero, a=zero)
+
+    def varying():
+        p, v, a = (rng.normal(scale=1e-3, size=(steps, 3, 1)) for _ in range(3))
+        return TimePVA(p=p, v=v, a=a)
+
+    world = World("Terra", 6378137.0, 298.257223563, 7.2921150e-5)
+    components = [
+        Axis(f"Axis {k}", Frame(constant((0.1, 0.0, 0.0)), constant((0.0, tau / 4, 0.0)))) for k in range(axes)
+    ]
+    mount = Mount("Mount", Frame(constant((0.3, 0.0, 0.0)), constant((0.0, -tau / 4, 0.0))))
+    body = Body("Body", Frame(constant((0.01, 0.0, 0.0)), constant((tau / 4, 0.0, 0.0))))
+    testbed = Testbed("Calibration", llhg=(35.0, -106.5, 1630.0, 9.79), components=(world, components, mount, body))
+
+    misalignments = [Frame(varying(), varying()) for _ in range(axes)]
+    rotations = [Frame(constant(), varying()) for _ in range(axes)]
+    return testbed, np.arange(steps) * 1e-3, misalignments, rotations
@@ -0,0 +1,192 @@
+"""
+RTSim recorded rate table encoder logs.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import validate
+from .frame import Frame
+from .table import rotations
+from collections.abc import Callable, Iterator
+from functools import partial
+from pathlib import Path
+import numpy as np
+import polars as pl
+
+Batches = Callable[[list[str], int], Iterator[dict[str, np.ndarray]]]
+
+
+class EncoderLog:
+    """
+    Recorded angle, rate and acceleration of each rate table axis, read one chunk of time steps at a time.
+
+    ``.npy`` and raw binary logs are memory-mapped and CSV logs are streamed in batches, so only the
+    pages or rows of the current chunk are read. Each chunk is copied once, scaled, into the
+    rotating frames of the axes, and the full-length inputs are never built. Use :meth:`npy`,
+    :meth:`binary` or :meth:`csv` to open a log.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        batches: Batches,
+        columns: list[tuple[str, str, str]],
+        *,
+        time: str = "time",
+        axis: int = 2,
+        scale: float = 1.0,
+        time_scale: float = 1.0,
+    ) -> None:
+        """
+        Initialize an encoder log, use :meth:`npy`, :meth:`binary` or :meth:`csv` instead.
+
+        :param batches: Callable yielding the given columns of consecutive batches of at most the given
+            number of rows.
+        :type batches: Callable[[list[str], int], Iterator[dict[str, np.ndarray]]]
+
+        :param columns: Angle, rate and acceleration column names of each axis.
+        :type columns: list[tuple[str, str, str]]
+
+        :param time: Name of the time column, defaults to "time"
+        :type time: str, optional
+
+        :param axis: Index of the rotation axis of the angles, defaults to 2
+        :type axis: int, optional
+
+        :param scale: Factor converting the angles, rates and accelerations to rad, rad/s and rad/s/s,
+            defaults to 1.0
+        :type scale: float, optional
+
+        :param time_scale: Factor converting the time to s, defaults to 1.0
+        :type time_scale: float, optional
+
+        :raises OptionError: If 'axis' is not 0, 1 or 2.
+        """
+        validate.option(axis, (0, 1, 2))
+        validate.number(scale)
+        validate.number(time_scale)
+        self._batches = batches
+        self.columns = [tuple(names) for names in columns]
+        self.time = time
+        self.axis = axis
+        self.scale = scale
+        self.time_scale = time_scale
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the columns read from the log."""
+        return [self.time, *(name for names in self.columns for name in names)]
+
+    @classmethod
+    def npy(
+        cls, path: str | Path, columns: list[tuple[str, str, str]], *, names: list[str] | None = None, **kwargs
+    ) -> "EncoderLog":
+        """
+        Open a ``.npy`` log, memory-mapped.
+
+        :param path: ``.npy`` file of a structured array, or of a 2-D array with one column per field.
+        :type path: str | Path
+
+        :param columns: Angle, rate and acceleration column names of each axis.
+        :type columns: list[tuple[str, str, str]]
+
+        :param names: Name of each column of a 2-D array, defaults to the fields of a structured array
+        :type names: list[str], optional
+
+        :param kwargs: Other arguments of :class:`EncoderLog`.
+
+        :return: Encoder log.
+        :rtype: EncoderLog
+        """
+        return cls(partial(_array_batches, np.load(path, mmap_mode="r"), names), columns, **kwargs)
+
+    @classmethod
+    def binary(
+        cls, path: str | Path, dtype: np.dtype, columns: list[tuple[str, str, str]], *, offset: int = 0, **kwargs
+    ) -> "EncoderLog":
+        """
+        Open a raw binary log of fixed size records, memory-mapped.
+
+        :param path: Binary file.
+        :type path: str | Path
+
+        :param dtype: Structured data type of a record, such as ``[("time", "<u8"), ("theta", "<f4"), ...]``.
+        :type dtype: np.dtype
+
+        :param columns: Angle, rate and acceleration field names of each axis.
+        :type columns: list[tuple[str, str, str]]
+
+        :param offset: Size of a header to skip, in bytes, defaults to 0
+        :type offset: int, optional
+
+        :param kwargs: Other arguments of :class:`EncoderLog`.
+
+        :return: Encoder log.
+        :rtype: EncoderLog
+        """
+        validate.integer(offset, minvalue=0)
+        data = np.memmap(path, dtype=np.dtype(dtype), mode="r", offset=offset)
+        return cls(partial(_array_batches, data, None), columns, **kwargs)
+
+    @classmethod
+    def csv(
+        cls, path: str | Path, columns: list[tuple[str, str, str]], *, separator: str = ",", **kwargs
+    ) -> "EncoderLog":
+        """
+        Open a CSV log with a header row, streamed in batches.
+
+        :param path: CSV file.
+        :type path: str | Path
+
+        :param columns: Angle, rate and acceleration column names of each axis.
+        :type columns: list[tuple[str, str, str]]
+
+        :param separator: Column separator, defaults to ","
+        :type separator: str, optional
+
+        :param kwargs: Other arguments of :class:`EncoderLog`.
+
+        :return: Encoder log.
+        :rtype: EncoderLog
+        """
+        return cls(partial(_csv_batches, pl.scan_csv(path, separator=separator)), columns, **kwargs)
+
+    def chunks(self, chunk_size: int) -> Iterator[tuple[slice, np.ndarray, list[Frame]]]:
+        """
+        Read the log one chunk of time steps at a time.
+
+        :param chunk_size: Largest number of time steps per chunk.
+        :type chunk_size: int
+
+        :return: Iterator of the time steps, time and rotating frame of each axis of each chunk.
+        :rtype: Iterator[tuple[slice, np.ndarray, list[Frame[Rotating]]]]
+        """
+        validate.integer(chunk_size, minvalue=1)
+
+        start = 0
+        for block in self._batches(self.names, chunk_size):
+            time = np.multiply(block[self.time], self.time_scale, dtype=float)
+            chunk = slice(start, start + time.size)
+            start = chunk.stop
+            yield chunk, time, rotations(block, self.columns, axis=self.axis, scale=self.scale)
+
+
+def _array_batches(
+    data: np.ndarray, fields: list[str] | None, names: list[str], chunk_size: int
+) -> Iterator[dict[str, np.ndarray]]:
+    """Yield views of columns of consecutive rows of a structured array, or of a 2-D array with named columns."""
+    for start in range(0, len(data), chunk_size):
+        rows = data[start : start + chunk_size]
+        if fields is None:
+            yield {name: rows[name] for name in names}
+        else:
+            yield {name: rows[:, fields.index(name)] for name in names}
+
+
+def _csv_batches(scan: pl.LazyFrame, names: list[str], chunk_size: int) -> Iterator[dict[str, np.ndarray]]:
+    """Yield columns of consecutive batches of rows of a CSV scan, reading only those columns."""
+    for frame in scan.select(names).collect_batches(chunk_size=chunk_size):
+        yield {name: frame.get_column(name).to_numpy() for name in frame.columns}
@@ -43,6 +43,14 @@ class FrameTypeError(TypeError):
         super().__init__(f"Expected '{value}' to be a {frame_type} coordinate frame.")
 
 
+class IntegerTypeError(TypeError):
+    """Integer type error."""
+
+    def __init__(self, value: Any) -> None:
+        """Initialize integer type error."""
+        super().__init__(f"Expected {value!r} to be an int")
+
+
 class MatrixTypeError(TypeError):
     """Matrix type error."""
 
@@ -70,9 +78,10 @@ class MinValueError(Exception):
 class NumDimError(Exception):
     """Number of dimensions error."""
 
-    def __init__(self, value: Any) -> None:
+    def __init__(self, value: Any, ndim: int | None = None) -> None:
         """Initialize number of dimensions error."""
-        super().__init__(f"Expected {value!r} to have 2 or 3 dimensions.")
+        expected = "2 or 3" if ndim is None else str(ndim)
+        super().__init__(f"Expected {value!r} to have {expected} dimensions.")
 
 
 class NumberTypeError(TypeError):
@@ -83,12 +92,20 @@ class NumberTypeError(TypeError):
         super().__init__(f"Expected {value!r} to be an int or float")
 
 
+class OptionError(ValueError):
+    """Option value error."""
+
+    def __init__(self, value: Any, options: tuple) -> None:
+        """Initialize option value error."""
+        super().__init__(f"Expected {value!r} to be one of {options}.")
+
+
 class PVATypeError(TypeError):
     """PVA type error."""
 
     def __init__(self, value: str) -> None:
         """Initialize position, velocity, acceleration type error."""
-        super().__init__(f"Expected '{value}' to be ConstantPVA or TimePVA.")
+        super().__init__(f"Expected '{value}' to be ConstantPVA, TimePVA or PackedPVA.")
 
 
 class RowCountError(Exception):
@@ -118,6 +135,7 @@ class StringLengthError(Exception):
 class TimeCountError(Exception):
     """Time step count error."""
 
-    def __init__(self, value: Any) -> None:
+    def __init__(self, value: Any, steps: int | None = None) -> None:
         """Initialize time step count error."""
-        super().__init__(f"Expected {value!r} to have at least one time step.")
+        expected = "at least one time step" if steps is None else f"{steps} time steps"
+        super().__init__(f"Expected {value!r} to have {expected}.")
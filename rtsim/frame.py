@@ -8,32 +8,42 @@ NTESS, the U.S. Government retains certain rights in this software.
 
 # SPDX-License-Identifier: BSD-3-Clause
 
+from . import backend, validate
 from .exceptions import PVATypeError
-from .pva import ConstantPVA, TimePVA
+from .pva import ConstantPVA, PackedPVA, TimePVA
+from .quaternion import dcm_to_quaternion, orientation_to_quaternion
 import numpy as np
 
+DCM_CACHE_SIZE = 1024
+
+_DCM_CACHE: dict[bytes, np.ndarray] = {}
+
 
 class Frame:
     """RTSim coordinate Frame class."""
 
-    def __init__(self, linear: ConstantPVA | TimePVA, angular: ConstantPVA | TimePVA) -> None:
+    def __init__(self, linear: ConstantPVA | TimePVA | PackedPVA, angular: ConstantPVA | TimePVA | PackedPVA) -> None:
         """
         Initialize a frame.
 
+        A :class:`BatchPVA` or :class:`PackedPVA` is a time varying PVA, so frames built from them are
+        typed as for :class:`TimePVA`.
+
         :param linear: Linear PVA of the frame.
-        :type linear: ConstantPVA | TimePVA
+        :type linear: ConstantPVA | TimePVA | PackedPVA
 
         :param angular: Angular PVA of the frame.
-        :type angular: ConstantPVA | TimePVA
+        :type angular: ConstantPVA | TimePVA | PackedPVA
 
-        :raises PVATypeError: If either 'linear' or 'angular' are not ConstantPVA nor TimePVA.
+        :raises PVATypeError: If either 'linear' or 'angular' are not ConstantPVA, TimePVA nor PackedPVA.
         """
+        varying = TimePVA | PackedPVA
         type_test = np.array(
             [
                 [isinstance(linear, ConstantPVA), isinstance(angular, ConstantPVA)],
-                [isinstance(linear, ConstantPVA), isinstance(angular, TimePVA)],
-                [isinstance(linear, TimePVA), isinstance(angular, ConstantPVA)],
-                [isinstance(linear, TimePVA), isinstance(angular, TimePVA)],
+                [isinstance(linear, ConstantPVA), isinstance(angular, varying)],
+                [isinstance(linear, varying), isinstance(angular, ConstantPVA)],
+                [isinstance(linear, varying), isinstance(angular, varying)],
             ]
         )
 
@@ -46,9 +56,78 @@ class Frame:
         self.linear = linear
         self.angular = angular
 
-        self.C = orientation_to_dcm(self.angular.p)
-        self.Omega = skew_symetric(self.angular.v)
-        self.Omega_dot = skew_symetric(self.angular.a)
+        self._C = None
+        self._C_assigned = False
+        self._q = None
+        self._Omega = None
+        self._Omega_dot = None
+
+    @property
+    def C(self):
+        """Direction cosine matrix, computed on first use and shared between equal constant frames."""
+        if self._C is None:
+            if isinstance(self.angular, ConstantPVA):
+                self._C = constant_dcm(self.angular.p)
+            else:
+                self._C = orientation_to_dcm(self.angular.p)
+        return self._C
+
+    @C.setter
+    def C(self, value):
+        self._C = value
+        self._C_assigned = value is not None
+        self._q = None
+
+    @property
+    def q(self):
+        """Attitude quaternion, computed on first use from the orientation or an assigned DCM."""
+        if self._q is None:
+            self._q = dcm_to_quaternion(self._C) if self._C_assigned else orientation_to_quaternion(self.angular.p)
+        return self._q
+
+    @q.setter
+    def q(self, value):
+        self._q = value
+
+    @property
+    def Omega(self):
+        """Skew symetric angular velocity matrix, computed on first use."""
+        if self._Omega is None:
+            self._Omega = skew_symetric(self.angular.v)
+        return self._Omega
+
+    @Omega.setter
+    def Omega(self, value):
+        self._Omega = value
+
+    @property
+    def Omega_dot(self):
+        """Skew symetric angular acceleration matrix, computed on first use."""
+        if self._Omega_dot is None:
+            self._Omega_dot = skew_symetric(self.angular.a)
+        return self._Omega_dot
+
+    @Omega_dot.setter
+    def Omega_dot(self, value):
+        self._Omega_dot = value
+
+    def slice(self, index: slice) -> "Frame":
+        """
+        Select a range of time steps of the frame.
+
+        Fixed frames are returned unchanged. Time varying PVA are sliced without copying, and the
+        direction cosine and skew symetric matrices of the new frame are only computed for the
+        selected time steps.
+
+        :param index: Time steps to select.
+        :type index: slice
+
+        :return: Coordinate frame over the selected time steps.
+        :rtype: Frame
+        """
+        if self.frame_type == "Fixed":
+            return self
+        return Frame(self.linear.slice(index), self.angular.slice(index))
 
     def __str__(self):
         """Return a string representation of the coordinate frame."""
@@ -59,60 +138,133 @@ class Frame:
         return f"{self.frame_type} Coordinate Frame"
 
 
-def orientation_to_dcm(v: np.ndarray) -> np.ndarray:
+def orientation_to_dcm(v: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     r"""
     Convert an orientation vector to a direction cosine matrix (DCM).
 
-    :param v: :math:`\mathrm{3x1}` or :math:`\mathrm{Tx3x1}` orientation vector, :math:`\mathrm{rad}`
+    The angles are read through a view of the input and the sine and cosine of all three are
+    evaluated together. Each element of the DCM is computed into a contiguous plane, and the
+    planes are interleaved into the result in a single copy. A ``Tx3x1`` double precision input
+    is converted by the DCM kernel of the active backend instead, if it has one.
+
+    :param v: :math:`\mathrm{3x1}`, :math:`\mathrm{Tx3x1}` or :math:`\mathrm{BxTx3x1}` orientation vector,
+        :math:`\mathrm{rad}`
     :type v: np.ndarray
 
-    :return: :math:`\mathrm{3x3}` or :math:`\mathrm{Tx3x3}` direction cosine matrix
+    :param out: Buffer for the DCM, defaults to a new array
+    :type out: np.ndarray, optional
+
+    :return: :math:`\mathrm{3x3}`, :math:`\mathrm{Tx3x3}` or :math:`\mathrm{BxTx3x3}` direction cosine matrix
     :rtype: np.ndarray
     """
-    v = v.flatten()
-    alpha = v[np.arange(0, v.size, 3)]
-    beta = v[np.arange(1, v.size, 3)]
-    gamma = v[np.arange(2, v.size, 3)]
-
-    sin_alpha, cos_alpha = np.sin(alpha), np.cos(alpha)
-    sin_beta, cos_beta = np.sin(beta), np.cos(beta)
-    sin_gamma, cos_gamma = np.sin(gamma), np.cos(gamma)
-
-    C = np.full((alpha.size, 3, 3), np.nan)
-    C[:, 0, 0] = cos_beta * cos_gamma
-    C[:, 0, 1] = sin_alpha * sin_beta * cos_gamma - cos_alpha * sin_gamma
-    C[:, 0, 2] = sin_alpha * sin_gamma + cos_alpha * sin_beta * cos_gamma
-    C[:, 1, 0] = cos_beta * sin_gamma
-    C[:, 1, 1] = sin_alpha * sin_beta * sin_gamma + cos_alpha * cos_gamma
-    C[:, 1, 2] = -sin_alpha * cos_gamma + cos_alpha * sin_beta * sin_gamma
-    C[:, 2, 0] = -sin_beta
-    C[:, 2, 1] = sin_alpha * cos_beta
-    C[:, 2, 2] = cos_alpha * cos_beta
-
-    return C[0, :, :] if C.shape[0] == 1 else C
-
-
-def skew_symetric(v: np.ndarray) -> np.ndarray:
+    if v.ndim == validate.CONSTANT_NDIM:
+        return _constant_orientation_to_dcm(v, out)
+
+    dcm = backend.active().dcm
+    if dcm is not None and v.ndim == validate.TIME_NDIM and v.dtype == np.float64:
+        C = np.empty((v.shape[0], 3, 3)) if out is None else out
+        dcm(v[..., 0], C)
+        return C
+
+    angles = np.moveaxis(v[..., 0], -1, 0)
+    sin_alpha, sin_beta, sin_gamma = np.sin(angles)
+    cos_alpha, cos_beta, cos_gamma = np.cos(angles)
+    sin_alpha_sin_beta = sin_alpha * sin_beta
+    cos_alpha_sin_beta = cos_alpha * sin_beta
+    scratch = np.empty_like(sin_alpha)
+
+    P = np.empty((3, 3, *v.shape[:-2]))
+    np.multiply(cos_beta, cos_gamma, out=P[0, 0, ...])
+    np.multiply(sin_alpha_sin_beta, cos_gamma, out=P[0, 1, ...])
+    P[0, 1, ...] -= np.multiply(cos_alpha, sin_gamma, out=scratch)
+    np.multiply(cos_alpha_sin_beta, cos_gamma, out=P[0, 2, ...])
+    P[0, 2, ...] += np.multiply(sin_alpha, sin_gamma, out=scratch)
+    np.multiply(cos_beta, sin_gamma, out=P[1, 0, ...])
+    np.multiply(sin_alpha_sin_beta, sin_gamma, out=P[1, 1, ...])
+    P[1, 1, ...] += np.multiply(cos_alpha, cos_gamma, out=scratch)
+    np.multiply(cos_alpha_sin_beta, sin_gamma, out=P[1, 2, ...])
+    P[1, 2, ...] -= np.multiply(sin_alpha, cos_gamma, out=scratch)
+    np.negative(sin_beta, out=P[2, 0, ...])
+    np.multiply(sin_alpha, cos_beta, out=P[2, 1, ...])
+    np.multiply(cos_alpha, cos_beta, out=P[2, 2, ...])
+
+    C = np.empty((*v.shape[:-2], 3, 3)) if out is None else out
+    np.copyto(C, np.moveaxis(P, (0, 1), (-2, -1)))
+
+    return C
+
+
+def skew_symetric(v: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     r"""
     Convert a vector to a skew symetric matrix.
 
-    :param v: :math:`\mathrm{3x1}` or :math:`\mathrm{Tx3x1}` vector
+    :param v: :math:`\mathrm{3x1}`, :math:`\mathrm{Tx3x1}` or :math:`\mathrm{BxTx3x1}` vector
+    :type v: np.ndarray
+
+    :param out: Buffer for the matrix, defaults to a new array
+    :type out: np.ndarray, optional
+
+    :return: :math:`\mathrm{3x3}`, :math:`\mathrm{Tx3x3}` or :math:`\mathrm{BxTx3x3}` skew symetric matrix
+    :rtype: np.ndarray
+    """
+    x, y, z = v[..., 0, 0], v[..., 1, 0], v[..., 2, 0]
+
+    S = np.empty((*v.shape[:-2], 3, 3)) if out is None else out
+    S[..., 0, 0] = S[..., 1, 1] = S[..., 2, 2] = 0.0
+    np.negative(z, out=S[..., 0, 1])
+    S[..., 0, 2] = y
+    S[..., 1, 0] = z
+    np.negative(x, out=S[..., 1, 2])
+    np.negative(y, out=S[..., 2, 0])
+    S[..., 2, 1] = x
+
+    return S
+
+
+def constant_dcm(v: np.ndarray) -> np.ndarray:
+    r"""
+    Convert a constant orientation vector to a shared, read-only direction cosine matrix.
+
+    Results are cached by the value of the orientation, so constant frames rebuilt on every run
+    reuse their DCM. At most ``DCM_CACHE_SIZE`` matrices are kept, oldest first out.
+
+    :param v: :math:`\mathrm{3x1}` orientation vector, :math:`\mathrm{rad}`
     :type v: np.ndarray
 
-    :return: :math:`\mathrm{3x3}` or :math:`\mathrm{Tx3x3}` skew symetric matrix
+    :return: Read-only :math:`\mathrm{3x3}` direction cosine matrix
     :rtype: np.ndarray
     """
-    v = v.flatten()
-    x = v[np.arange(0, v.size, 3)]
-    y = v[np.arange(1, v.size, 3)]
-    z = v[np.arange(2, v.size, 3)]
-
-    S = np.zeros((x.size, 3, 3))
-    S[:, 0, 1] = -z
-    S[:, 0, 2] = y
-    S[:, 1, 0] = z
-    S[:, 1, 2] = -x
-    S[:, 2, 0] = -y
-    S[:, 2, 1] = x
-
-    return S[0, :, :] if S.shape[0] == 1 else S
+    key = np.ascontiguousarray(v, dtype=float).tobytes()
+    C = _DCM_CACHE.get(key)
+    if C is None:
+        C = orientation_to_dcm(v)
+        C.flags.writeable = False
+        if len(_DCM_CACHE) >= DCM_CACHE_SIZE:
+            _DCM_CACHE.pop(next(iter(_DCM_CACHE)), None)
+        _DCM_CACHE[key] = C
+    return C
+
+
+def _constant_orientation_to_dcm(v: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+    """Convert a single orientation with scalar arithmetic, avoiding per-element array overhead."""
+    angles = v[:, 0]
+    sin_alpha, sin_beta, sin_gamma = np.sin(angles).tolist()
+    cos_alpha, cos_beta, cos_gamma = np.cos(angles).tolist()
+    sin_alpha_sin_beta = sin_alpha * sin_beta
+    cos_alpha_sin_beta = cos_alpha * sin_beta
+
+    C = np.empty((3, 3)) if out is None else out
+    C[...] = (
+        (
+            cos_beta * cos_gamma,
+            sin_alpha_sin_beta * cos_gamma - cos_alpha * sin_gamma,
+            cos_alpha_sin_beta * cos_gamma + sin_alpha * sin_gamma,
+        ),
+        (
+            cos_beta * sin_gamma,
+            sin_alpha_sin_beta * sin_gamma + cos_alpha * cos_gamma,
+            cos_alpha_sin_beta * sin_gamma - sin_alpha * cos_gamma,
+        ),
+        (-sin_beta, sin_alpha * cos_beta, cos_alpha * cos_beta),
+    )
+    return C
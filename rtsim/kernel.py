@@ -0,0 +1,829 @@
+"""
+RTSim fused kinematics kernel.
+
+The functions in this module evaluate the same equations as :meth:`rtsim.Axis.process` and
+:meth:`rtsim.Testbed.process`, but operate on ``...x3`` vector views, replace products with
+skew symetric matrices by cross products, and write every intermediate into reused
+buffers instead of allocating a new ``Tx3x3`` or ``Tx3x1`` temporary per operation.
+Zero vectors, identity rotations and constant terms are tracked so that only the time
+varying terms are evaluated per time step.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import backend, profiling, quaternion, validate
+from .frame import Frame
+from .world import EarthRotation
+from collections.abc import Iterable
+import numpy as np
+
+METHODS = ("reference", "fused", "quaternion")
+
+OUTPUTS = ("aaiib", "aviib", "laiib", "sfiib", "aabib", "avbib", "labib", "sfbib")
+
+INERTIAL = dict(zip(OUTPUTS[4:], OUTPUTS[:4], strict=True))
+
+STATE = ("p", "v", "a", "ov", "oa")
+
+PRECISIONS = ("float64", "float32", "mixed")
+
+BLOCK = 16384
+
+
+def vec(x: np.ndarray) -> np.ndarray:
+    r"""
+    View a :math:`\mathrm{3x1}` or :math:`\mathrm{Tx3x1}` vector as a :math:`\mathrm{3}` or :math:`\mathrm{Tx3}` vector.
+
+    :param x: Column vector(s).
+    :type x: np.ndarray
+
+    :return: View of the input without the trailing column axis.
+    :rtype: np.ndarray
+    """
+    return x[..., 0]
+
+
+def cross(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> np.ndarray:
+    r"""
+    Cross product :math:`a \times b` written into a preallocated buffer.
+
+    Equivalent to ``skew_symetric(a) @ b`` without building the skew symetric matrix.
+    ``out`` must not share memory with ``a`` or ``b``.
+
+    :param a: Left operand, :math:`\mathrm{3}` or :math:`\mathrm{Tx3}`.
+    :type a: np.ndarray
+
+    :param b: Right operand, :math:`\mathrm{3}` or :math:`\mathrm{Tx3}`.
+    :type b: np.ndarray
+
+    :param out: Output buffer.
+    :type out: np.ndarray
+
+    :return: ``out``
+    :rtype: np.ndarray
+    """
+    for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        np.multiply(a[..., j], b[..., k], out=out[..., i])
+        out[..., i] -= a[..., k] * b[..., j]
+    return out
+
+
+def rotate(C: np.ndarray, x: np.ndarray, out: np.ndarray) -> np.ndarray:
+    r"""
+    Matrix-vector product :math:`C x` written into a preallocated buffer.
+
+    :param C: :math:`\mathrm{3x3}` or :math:`\mathrm{Tx3x3}` matrix.
+    :type C: np.ndarray
+
+    :param x: :math:`\mathrm{3}` or :math:`\mathrm{Tx3}` vector.
+    :type x: np.ndarray
+
+    :param out: :math:`\mathrm{Tx3}` output buffer.
+    :type out: np.ndarray
+
+    :return: ``out``
+    :rtype: np.ndarray
+    """
+    if x.shape != out.shape:
+        x = np.broadcast_to(x, out.shape)
+    if C.ndim == validate.CONSTANT_NDIM:
+        return np.matmul(x, C.T, out=out)
+    if C.shape[:-1] == out.shape:
+        return np.einsum("...ij,...j->...i", C, x, out=out, casting="same_kind")
+    batch = out.shape[: out.ndim - C.ndim + 1]
+    if C.shape[:-1] == out.shape[len(batch) :]:
+        for index in np.ndindex(batch):
+            np.einsum("...ij,...j->...i", C, x[index], out=out[index], casting="same_kind")
+        return out
+    np.matmul(C, x[..., None], out=out[..., None])
+    return out
+
+
+def compose(F: np.ndarray, C: np.ndarray, out: np.ndarray) -> np.ndarray:
+    r"""
+    Matrix product :math:`F C` written into a preallocated buffer.
+
+    The product is evaluated in blocks of ``BLOCK`` time steps, so ``out`` may be ``C``
+    without numpy copying the whole of ``C`` to resolve the overlap. Blocks of ``F`` are cast
+    to the data type of ``out``, so the product is evaluated in that precision. Double precision
+    ``Tx3x3`` products are evaluated by the compose kernel of the active backend, if it has one.
+
+    :param F: :math:`\mathrm{3x3}` or :math:`\mathrm{Tx3x3}` left matrix.
+    :type F: np.ndarray
+
+    :param C: :math:`\mathrm{3x3}` or :math:`\mathrm{Tx3x3}` right matrix.
+    :type C: np.ndarray
+
+    :param out: :math:`\mathrm{Tx3x3}` output buffer.
+    :type out: np.ndarray
+
+    :return: ``out``
+    :rtype: np.ndarray
+    """
+    F = F if F.shape == out.shape else np.broadcast_to(F, out.shape)
+    C = C if C.shape == out.shape else np.broadcast_to(C, out.shape)
+    loop = backend.active().compose
+    if loop is not None and out.ndim == validate.TIME_NDIM and F.dtype == C.dtype == out.dtype == np.float64:
+        loop(F, C, out)
+        return out
+    for start in range(0, out.shape[-3], BLOCK):
+        block = slice(start, start + BLOCK)
+        np.matmul(F[..., block, :, :].astype(out.dtype, copy=False), C[..., block, :, :], out=out[..., block, :, :])
+    return out
+
+
+class Workspace:
+    """
+    Buffers of one ``...x3`` shape for the kernel, allocated when first needed and reused.
+
+    Scratch buffers hold intermediate results. State buffers hold the linear position, velocity and
+    acceleration and angular velocity and acceleration propagated by :func:`axis_step`.
+    """
+
+    def __init__(self, shape: tuple[int, ...], needs: tuple[str, ...] = STATE, dtype: type = np.float64) -> None:
+        """
+        Initialize an empty workspace.
+
+        :param shape: Shape of every buffer, such as ``(T, 3)`` or ``(B, T, 3)``.
+        :type shape: tuple[int, ...]
+
+        :param needs: State variables to propagate (see ``STATE``), the others are left as ``None``.
+            The linear position, velocity and acceleration are propagated together, and the angular
+            acceleration requires the angular velocity. Defaults to all of them.
+        :type needs: tuple[str, ...], optional
+
+        :param dtype: Data type of every buffer, defaults to ``np.float64``
+        :type dtype: type, optional
+        """
+        self.shape = shape
+        self.needs = needs
+        self.dtype = np.dtype(dtype)
+        self.scratch = []
+        self.state = [None] * len(STATE)
+
+    def spare(self, *live: np.ndarray | None) -> np.ndarray:
+        """
+        Return a scratch buffer that holds none of the live values.
+
+        :param live: Values that must not be overwritten.
+        :type live: np.ndarray | None
+
+        :return: Scratch buffer.
+        :rtype: np.ndarray
+        """
+        for buffer in self.scratch:
+            for value in live:
+                if buffer is value:
+                    break
+            else:
+                return buffer
+        self.scratch.append(np.empty(self.shape, self.dtype))
+        return self.scratch[-1]
+
+    def owned(self, index: int) -> np.ndarray:
+        """
+        Return the buffer of a state variable.
+
+        :param index: Index of the state variable.
+        :type index: int
+
+        :return: State buffer.
+        :rtype: np.ndarray
+        """
+        if self.state[index] is None:
+            self.state[index] = np.empty(self.shape, self.dtype)
+        return self.state[index]
+
+
+def value(x: np.ndarray) -> np.ndarray | None:
+    r"""
+    View a column vector as a vector of the kernel, ``None`` if it is zero.
+
+    :param x: :math:`\mathrm{3x1}` or :math:`\mathrm{Tx3x1}` column vector(s).
+    :type x: np.ndarray
+
+    :return: :math:`\mathrm{3}` or :math:`\mathrm{Tx3}` view of the input, or ``None``.
+    :rtype: np.ndarray | None
+    """
+    return vec(x) if x.any() else None
+
+
+def rotation(frame: Frame) -> np.ndarray | None:
+    """
+    Return the direction cosine matrix of a frame as a rotation of the kernel.
+
+    :param frame: Coordinate frame.
+    :type frame: Frame
+
+    :return: Direction cosine matrix, or ``None`` for a zero orientation.
+    :rtype: np.ndarray | None
+    """
+    return frame.C if frame.angular.p.any() else None
+
+
+def fixed(frame: Frame) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """
+    Return the rotation and offset of a fixed frame for :func:`axis_step`.
+
+    :param frame: Fixed coordinate frame.
+    :type frame: Frame[Fixed]
+
+    :return: Direction cosine matrix and position, each ``None`` if zero.
+    :rtype: tuple[np.ndarray | None, np.ndarray | None]
+    """
+    return rotation(frame), value(frame.linear.p)
+
+
+def column(x: np.ndarray | None, shape: tuple[int, ...]) -> np.ndarray:
+    r"""
+    Convert a vector of the kernel to :math:`\mathrm{Tx3x1}` column vectors.
+
+    :param x: ``None`` for zero, a constant :math:`\mathrm{3}` vector or a state buffer.
+    :type x: np.ndarray | None
+
+    :param shape: Shape of the vectors, such as ``(T, 3)``.
+    :type shape: tuple[int, ...]
+
+    :return: Column vectors, a view of ``x`` if it is a state buffer.
+    :rtype: np.ndarray
+    """
+    if x is None:
+        return np.zeros((*shape, 1))
+    if _constant(x):
+        return np.broadcast_to(x, shape)[..., None].copy()
+    return x[..., None]
+
+
+def axis_step(
+    zeta: tuple[np.ndarray | None, np.ndarray | None],
+    mu: Frame,
+    rho: Frame,
+    state: list[np.ndarray | None],
+    workspace: Workspace,
+) -> None:
+    r"""
+    Propagate linear and angular PVA through one axis.
+
+    Implements the equations of :meth:`rtsim.Axis.process` with cross products,
+    reusing :math:`C_\rho \alpha_p` and :math:`C_\mu (\omega_\rho + C_\rho \omega_v)`.
+
+    Zero vectors are represented by ``None`` and their terms are skipped, rotations by a zero
+    orientation are skipped, and terms of constant :math:`\mathrm{3}` vectors are folded without
+    broadcasting them over the time steps. Only time varying results are written to buffers.
+
+    A double precision ``Tx3`` workspace is updated by the axis kernel of the active backend instead,
+    if it has one, which evaluates every state variable in one pass over the time steps.
+
+    :param zeta: Rotation and offset of the zero :math:`(\zeta)` frame of the axis (see :func:`fixed`).
+    :type zeta: tuple[np.ndarray | None, np.ndarray | None]
+
+    :param mu: Misalignment :math:`(\mu)` frame of the axis.
+    :type mu: Frame[Full]
+
+    :param rho: Rotating :math:`(\rho)` frame of the axis.
+    :type rho: Frame[Rotating]
+
+    :param state: Linear position, velocity and acceleration and angular velocity and acceleration,
+        each ``None``, a constant :math:`\mathrm{3}` vector or a :math:`\mathrm{Tx3}` array, holding the
+        lower level axis on entry and this axis on return.
+    :type state: list[np.ndarray | None]
+
+    :param workspace: Buffers for the time varying results.
+    :type workspace: Workspace
+    """
+    ws = workspace
+    loop = backend.active().axis_update
+    if loop is not None and len(ws.shape) == validate.TIME_NDIM - 1 and ws.dtype == np.float64:
+        _loop_step(loop, zeta, mu, rho, state, ws)
+        return
+
+    Z = zeta[0]
+    M, R = _cast(ws, rotation(mu)), _cast(ws, rotation(rho))
+    w, wd = _cast(ws, value(rho.angular.v)), _cast(ws, value(rho.angular.a))
+    p, v, a, ov, oa = state
+
+    if {"p", "v", "a"}.intersection(ws.needs):
+        p, v, a = _linear_step(ws, zeta, (M, R, w, wd), mu, (p, v, a))
+    else:
+        p = v = a = None
+
+    if {"ov", "oa"}.intersection(ws.needs):
+        ov, oa = _angular_step(ws, Z, (M, R, w, wd), mu, (ov, oa))
+    else:
+        ov = oa = None
+
+    state[:] = [p, v, a, ov, oa]
+
+
+def attitude_chain(
+    frames: list[Frame], C: np.ndarray, steps: tuple[int, ...], attitude: str, dtype: type = np.float64
+) -> np.ndarray:
+    r"""
+    Left multiply a direction cosine matrix by the attitude of each frame in turn.
+
+    The ``"dcm"`` attitude composes the direction cosine matrices of the frames in place. The
+    ``"quaternion"`` attitude composes their quaternions instead, which needs 16 rather than 27
+    multiplications per step and frame and a quarter less memory for the chain, renormalizes the
+    result and converts it to a direction cosine matrix once. Frames with a zero orientation are
+    skipped, and constant frames are folded together until the first time varying frame.
+
+    :param frames: Coordinate frames, applied first to last.
+    :type frames: list[Frame]
+
+    :param C: :math:`\mathrm{3x3}` or :math:`\mathrm{...x3x3}` direction cosine matrix to start from.
+    :type C: np.ndarray
+
+    :param steps: Leading shape of the chain, such as ``(T,)`` or ``(B, T)``.
+    :type steps: tuple[int, ...]
+
+    :param attitude: Attitude representation, "dcm" or "quaternion".
+    :type attitude: str
+
+    :param dtype: Data type of a time varying chain, defaults to ``np.float64``
+    :type dtype: type, optional
+
+    :return: :math:`\mathrm{3x3}` direction cosine matrix if every frame is constant, otherwise
+        :math:`\mathrm{...x3x3}`.
+    :rtype: np.ndarray
+    """
+    frames = [frame for frame in frames if rotation(frame) is not None]
+    while frames and frames[0].C.ndim == validate.CONSTANT_NDIM and C.ndim == validate.CONSTANT_NDIM:
+        C = frames.pop(0).C @ C
+    if not frames:
+        return C
+
+    if attitude == "dcm":
+        chain = np.empty((*steps, 3, 3), dtype)
+        chain[...] = C
+        for frame in frames:
+            compose(frame.C, chain, chain)
+        return chain
+
+    chain = np.empty((*steps, 4), dtype)
+    chain[...] = quaternion.dcm_to_quaternion(C)
+    for frame in frames:
+        q = np.broadcast_to(frame.q, chain.shape)
+        for start in range(0, chain.shape[-2], BLOCK):
+            block = slice(start, start + BLOCK)
+            chain[..., block, :] = quaternion.multiply(q[..., block, :].astype(dtype), chain[..., block, :])
+    return quaternion.quaternion_to_dcm(quaternion.normalize(chain))
+
+
+def testbed_outputs(  # noqa: PLR0913, PLR0917
+    plan,
+    world: Frame | EarthRotation,
+    misalignments: list[Frame],
+    rotations: list[Frame],
+    outputs: tuple[str, ...] = OUTPUTS,  # noqa: PT028
+    precision: str = "float64",  # noqa: PT028
+) -> dict[str, np.ndarray]:
+    r"""
+    Evaluate the inertial and body outputs of a testbed in one pass.
+
+    Inputs with leading batch axes, such as a ``BxTx3x1`` misalignment or a ``Bx1x3`` platform,
+    are broadcast against the shared time varying inputs and give ``BxTx3x1`` outputs.
+
+    Only the intermediates the requested outputs depend on are evaluated: the body attitude chain for
+    body outputs, the linear state for the linear acceleration and specific force, and the angular
+    acceleration state for the angular accelerations. Inertial outputs that are only needed for a body
+    output are released as soon as it is evaluated.
+
+    The ``"float32"`` precision evaluates everything in single precision. The ``"mixed"`` precision
+    evaluates the axes and the body attitude chain in single precision, and the earth rate, world
+    rotation and position terms in double precision. Both return ``float32`` outputs.
+
+    :param plan: Evaluation plan of the testbed geometry.
+    :type plan: Plan
+
+    :param world: World coordinate frame over the input time steps, or its closed form rotation,
+        which replaces the world rotations by plane rotations and the earth rate cross products by
+        swapping components.
+    :type world: Frame[Rotating] | EarthRotation
+
+    :param misalignments: Misalignment coordinate frame of each axis.
+    :type misalignments: list[Frame[Full]]
+
+    :param rotations: Rotating coordinate frame of each axis.
+    :type rotations: list[Frame[Rotating]]
+
+    :param outputs: Names of the outputs to evaluate, defaults to ``OUTPUTS``
+    :type outputs: tuple[str, ...], optional
+
+    :param precision: Precision policy, "float64", "float32" or "mixed", defaults to "float64"
+    :type precision: str, optional
+
+    :return: ``Tx3x1`` arrays keyed by output name.
+    :rtype: dict[str, np.ndarray]
+    """
+    body = [name for name in OUTPUTS[4:] if name in outputs]
+    inertial = [name for name in OUTPUTS[:4] if name in outputs or name in {INERTIAL[b] for b in body}]
+    if not inertial:
+        return {}
+
+    evaluation = Evaluation(plan, world, misalignments, rotations, precision)
+    out = evaluation.inertial(evaluation.state(state_needs(inertial)), inertial)
+    if body:
+        out |= evaluation.body(evaluation.chain(), out, body, release=set(inertial).difference(outputs))
+
+    return {name: out[name] for name in OUTPUTS if name in outputs}
+
+
+def state_needs(names: Iterable[str]) -> tuple[str, ...]:
+    """
+    Return the state variables that inertial outputs depend on.
+
+    :param names: Names of inertial outputs.
+    :type names: Iterable[str]
+
+    :return: State variables (see ``STATE``): the linear state for the linear acceleration and
+        specific force, and the angular state for the angular velocity and acceleration.
+    :rtype: tuple[str, ...]
+    """
+    names = set(names)
+    needs = ("p", "v", "a") if {"laiib", "sfiib"}.intersection(names) else ()
+    needs += ("ov",) if {"aviib", "aaiib"}.intersection(names) else ()
+    needs += ("oa",) if "aaiib" in names else ()
+    return needs
+
+
+class Evaluation:
+    """
+    Stages of :func:`testbed_outputs` for one set of inputs, run separately so their results can be reused.
+
+    :meth:`state` propagates the state through the axes, :meth:`inertial` evaluates inertial outputs
+    from the state of the last axis, :meth:`chain` composes the body attitude chain and :meth:`body`
+    resolves inertial outputs in the body frame. The stages share scratch buffers.
+    """
+
+    def __init__(
+        self,
+        plan,
+        world: Frame | EarthRotation,
+        misalignments: list[Frame],
+        rotations: list[Frame],
+        precision: str = "float64",
+    ) -> None:
+        """
+        Initialize the stages, see :func:`testbed_outputs` for the parameters.
+
+        :param plan: Evaluation plan of the testbed geometry.
+        :type plan: Plan
+
+        :param world: World coordinate frame over the input time steps, or its closed form rotation.
+        :type world: Frame[Rotating] | EarthRotation
+
+        :param misalignments: Misalignment coordinate frame of each axis.
+        :type misalignments: list[Frame[Full]]
+
+        :param rotations: Rotating coordinate frame of each axis.
+        :type rotations: list[Frame[Rotating]]
+
+        :param precision: Precision policy, "float64", "float32" or "mixed", defaults to "float64"
+        :type precision: str, optional
+        """
+        r_mb, Cmb = plan.platform
+        shape = np.broadcast_shapes(
+            (*world.cos.shape, 3) if isinstance(world, EarthRotation) else vec(world.angular.v).shape,
+            () if r_mb is None else r_mb.shape,
+            Cmb.shape[:-1],
+            *(vec(frame.linear.p).shape for frame in misalignments),
+            *(vec(frame.angular.p).shape for frame in [*misalignments, *rotations]),
+        )
+
+        self.plan = plan
+        self.world = world
+        self.misalignments = misalignments
+        self.rotations = rotations
+        self.dtype = np.float64 if precision == "float64" else np.float32
+        self.ws = Workspace(shape, (), self.dtype)
+        self.wide = Workspace(shape) if precision == "mixed" else self.ws
+
+    def state(self, needs: tuple[str, ...]) -> list[np.ndarray | None]:
+        """
+        Propagate state variables through every axis into new state buffers, owned by the result.
+
+        :param needs: State variables to propagate (see ``STATE``), other names are ignored.
+        :type needs: tuple[str, ...]
+
+        :return: State after the last axis (see :func:`axis_step`).
+        :rtype: list[np.ndarray | None]
+        """
+        self.ws.needs = tuple(name for name in STATE if name in needs)
+        state = [self.plan.platform[0], None, None, None, None]
+        if self.ws.needs:
+            for a, zeta in enumerate(self.plan.fixed):
+                with profiling.stage("axis_step", axis=a):
+                    axis_step(zeta, self.misalignments[a], self.rotations[a], state, self.ws)
+        self.ws.state = [None] * len(STATE)
+        return state
+
+    def inertial(self, state: list[np.ndarray | None], names: Iterable[str]) -> dict[str, np.ndarray]:
+        """
+        Evaluate inertial outputs from the state of the last axis.
+
+        :param state: State after the last axis, propagating :func:`state_needs` of 'names'.
+        :type state: list[np.ndarray | None]
+
+        :param names: Names of the inertial outputs.
+        :type names: Iterable[str]
+
+        :return: ``Tx3x1`` outputs keyed by name.
+        :rtype: dict[str, np.ndarray]
+        """
+        with profiling.stage("inertial"):
+            return _inertial_outputs(self.wide, self.plan, self.world, state, set(names), self.dtype)
+
+    def chain(self, state: list[np.ndarray | None] | None = None) -> np.ndarray:
+        """
+        Compose the body attitude chain of the axes, mount and body.
+
+        :param state: Unused, the chain is composed from the frames alone, defaults to None
+        :type state: list[np.ndarray | None], optional
+
+        :return: Attitude chain (see :func:`attitude_chain`).
+        :rtype: np.ndarray
+        """
+        frames = [F for a, zeta in enumerate(self.plan.zetas) for F in (self.rotations[a], self.misalignments[a], zeta)]
+        with profiling.stage("Cib", attitude=self.plan.attitude):
+            return attitude_chain(frames, self.plan.platform[1], self.ws.shape[:-1], self.plan.attitude, self.dtype)
+
+    def body(
+        self, chain: np.ndarray, inertial: dict[str, np.ndarray], names: Iterable[str], *, release: Iterable[str] = ()
+    ) -> dict[str, np.ndarray]:
+        """
+        Resolve inertial outputs in the body frame.
+
+        :param chain: Attitude chain from :meth:`chain`.
+        :type chain: np.ndarray
+
+        :param inertial: Inertial outputs, including the one of each body output.
+        :type inertial: dict[str, np.ndarray]
+
+        :param names: Names of the body outputs.
+        :type names: Iterable[str]
+
+        :param release: Inertial outputs to remove from 'inertial' as soon as they are resolved, defaults to none
+        :type release: Iterable[str], optional
+
+        :return: ``Tx3x1`` outputs keyed by name.
+        :rtype: dict[str, np.ndarray]
+        """
+        ws, release = self.wide, set(release)
+        out = {}
+        with profiling.stage("body"):
+            earth = _Earth(ws, self.world)
+            Cnt, Cct = (None if C is None else np.swapaxes(_cast(ws, C), -1, -2) for C in (self.plan.nav[0], chain))
+
+            for name in names:
+                source = inertial.pop(INERTIAL[name]) if INERTIAL[name] in release else inertial[INERTIAL[name]]
+                x = earth.rotate((), vec(source), inverse=True)
+                out[name] = _emit(ws.shape, _rotate(ws, (), Cct, _rotate(ws, (), Cnt, x)), self.dtype)
+        return out
+
+
+def _inertial_outputs(ws, plan, world, state, names, dtype):  # noqa: PLR0913, PLR0917
+    """Evaluate the inertial outputs in 'names' as 'dtype' arrays from the propagated state of the last axis."""
+    ap, av, aa, ov, oa = state
+    earth = _Earth(ws, world)
+    Cn, pn = (_cast(ws, x) for x in plan.nav)
+    out = {}
+
+    def resolve(live, x):
+        return earth.rotate(live, _rotate(ws, live, Cn, x))
+
+    if {"aviib", "aaiib"}.intersection(names):
+        x = resolve((), ov)
+        if "aviib" in names:
+            out["aviib"] = _emit(ws.shape, _add(ws, (x,), earth.rate, x), dtype)
+        if "aaiib" in names:
+            x = earth.cross((), x)
+            out["aaiib"] = _emit(ws.shape, _add(ws, (), x, resolve((x,), oa)), dtype)
+
+    if {"laiib", "sfiib"}.intersection(names):
+        x = earth.rotate((), _add(ws, (), _rotate(ws, (), Cn, ap), pn))
+        x = earth.cross((), x)
+        x = _add(ws, (), x, _scale(ws, (x,), resolve((x,), av), 2.0))
+        x = earth.cross((), x)
+        la = _emit(ws.shape, _add(ws, (), x, resolve((x,), aa)), dtype)
+
+        if "sfiib" in names:
+            gravity = earth.rotate((), _cast(ws, plan.gravity))[..., None]
+            out["sfiib"] = np.add(la, gravity, out=la if "laiib" not in names else np.empty_like(la))
+        if "laiib" in names:
+            out["laiib"] = la
+
+    return out
+
+
+class _Earth:
+    """Rotation and rate of the world, applied with matrices for a frame or in closed form for an ``EarthRotation``."""
+
+    def __init__(self, ws: Workspace, world: Frame | EarthRotation) -> None:
+        """Cast the world rotation to the data type of the workspace."""
+        self.ws = ws
+        if isinstance(world, EarthRotation):
+            self.omega = world.omega
+            self.rate = np.array([0.0, 0.0, world.omega], ws.dtype) if world.omega else None
+            self.cos, self.sin = _cast(ws, world.cos), _cast(ws, world.sin)
+            self.C = None
+        else:
+            self.omega = None
+            self.rate = _cast(ws, vec(world.angular.v))
+            self.C = _cast(ws, rotation(world))
+
+    def rotate(self, live: tuple, x: np.ndarray | None, *, inverse: bool = False) -> np.ndarray | None:
+        """Rotate a vector by the world rotation, or by its inverse, keeping the live values."""
+        if self.omega is None:
+            C = np.swapaxes(self.C, -1, -2) if inverse and self.C is not None else self.C
+            return _rotate(self.ws, live, C, x)
+        if x is None or not self.omega:
+            return x
+
+        sin = -self.sin if inverse else self.sin
+        out = self.ws.spare(*live, x)
+        np.multiply(self.cos, x[..., 0], out=out[..., 0])
+        out[..., 0] += sin * x[..., 1]
+        np.multiply(self.cos, x[..., 1], out=out[..., 1])
+        out[..., 1] -= sin * x[..., 0]
+        out[..., 2] = x[..., 2]
+        return out
+
+    def cross(self, live: tuple, x: np.ndarray | None) -> np.ndarray | None:
+        """Cross product of the world rate with a vector, keeping the live values."""
+        if self.omega is None:
+            return _cross(self.ws, live, self.rate, x)
+        if x is None or not self.omega:
+            return None
+        if _constant(x):
+            return np.array([-self.omega * x[1], self.omega * x[0], 0.0], x.dtype)
+
+        out = self.ws.spare(*live, x)
+        np.multiply(x[..., 1], -self.omega, out=out[..., 0])
+        np.multiply(x[..., 0], self.omega, out=out[..., 1])
+        out[..., 2] = 0.0
+        return out
+
+
+def _loop_step(loop, zeta, mu, rho, state, ws):  # noqa: PLR0913, PLR0917
+    """Propagate every state variable through an axis with the axis kernel of a backend."""
+    Z, zp = zeta
+    steps = ws.shape[0]
+
+    def vector(x):
+        return np.broadcast_to(np.zeros(3) if x is None else x, ws.shape)
+
+    def matrix(C):
+        return np.broadcast_to(np.eye(3) if C is None else C, (steps, 3, 3))
+
+    out = tuple(ws.owned(index) for index in range(len(STATE)))
+    loop(
+        np.eye(3) if Z is None else Z,
+        np.zeros(3) if zp is None else zp,
+        matrix(rotation(mu)),
+        matrix(rotation(rho)),
+        (vector(value(rho.angular.v)), vector(value(rho.angular.a))),
+        tuple(vector(value(x)) for x in (mu.linear.p, mu.linear.v, mu.linear.a, mu.angular.v, mu.angular.a)),
+        tuple(vector(x) for x in state),
+        out,
+    )
+    state[:] = out
+
+
+def _linear_step(ws, zeta, rho, mu, state):
+    """Propagate the linear position, velocity and acceleration through an axis."""
+    Z, zp = zeta
+    _, R, w, wd = rho
+    p, v, a = state
+
+    Rp = _rotate(ws, (), R, p)
+    Rv = _rotate(ws, (Rp,), R, v)
+    wRp = _cross(ws, (Rp, Rv), w, Rp)
+    keep = (Rp, Rv, wRp)
+
+    x = _add(ws, keep, _scale(ws, keep, Rv, 2.0), wRp)
+    x = _cross(ws, keep, w, x)
+    x = _add(ws, keep, x, _cross(ws, (*keep, x), wd, Rp))
+    x = _add(ws, keep, x, _rotate(ws, (*keep, x), R, a))
+    x = _add(ws, keep, x, _cast(ws, value(mu.linear.a)))
+    a = _assign(ws, 2, Z, x, keep)
+
+    x = _add(ws, (Rp,), _add(ws, (Rp,), wRp, Rv), _cast(ws, value(mu.linear.v)))
+    v = _assign(ws, 1, Z, x, (Rp,))
+
+    x = _add(ws, (), Rp, _cast(ws, value(mu.linear.p)))
+    p = _offset(_assign(ws, 0, Z, x, ()), zp)
+
+    return p, v, a
+
+
+def _angular_step(ws, Z, rho, mu, state):
+    """Propagate the angular velocity, and the angular acceleration if needed, through an axis."""
+    M, R, w, wd = rho
+    ov, oa = state
+
+    Rov = _rotate(ws, (), R, ov)
+    t = _rotate(ws, (Rov,), M, _add(ws, (Rov,), w, Rov))
+    mav = _cast(ws, value(mu.angular.v))
+
+    if "oa" in ws.needs:
+        x = _add(ws, (t,), _cross(ws, (t,), w, Rov), wd)
+        x = _add(ws, (t,), x, _rotate(ws, (t, x), R, oa))
+        x = _rotate(ws, (t,), M, x)
+        x = _add(ws, (t,), x, _cross(ws, (t, x), mav, t))
+        x = _add(ws, (t,), x, _cast(ws, value(mu.angular.a)))
+        oa = _assign(ws, 4, Z, x, (t,))
+    else:
+        oa = None
+
+    ov = _assign(ws, 3, Z, _add(ws, (), mav, t), ())
+
+    return ov, oa
+
+
+def _constant(x: np.ndarray) -> bool:
+    """Test whether a vector of the kernel is constant over the time steps."""
+    return x.ndim == 1
+
+
+def _cast(ws: Workspace, x: np.ndarray | None) -> np.ndarray | None:
+    """Convert an input of the kernel to the data type of the workspace."""
+    if x is None or x.dtype == ws.dtype:
+        return x
+    return x.astype(ws.dtype)
+
+
+def _add(ws: Workspace, live: tuple, a: np.ndarray | None, b: np.ndarray | None) -> np.ndarray | None:
+    """Add two vectors, keeping the live values."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if _constant(a) and _constant(b):
+        return a + b
+    return np.add(a, b, out=ws.spare(*live))
+
+
+def _scale(ws: Workspace, live: tuple, a: np.ndarray | None, k: float) -> np.ndarray | None:
+    """Scale a vector, keeping the live values."""
+    if a is None:
+        return None
+    if _constant(a):
+        return a * k
+    return np.multiply(a, k, out=ws.spare(*live))
+
+
+def _cross(ws: Workspace, live: tuple, a: np.ndarray | None, b: np.ndarray | None) -> np.ndarray | None:
+    """Cross product of two vectors, keeping the live values."""
+    if a is None or b is None:
+        return None
+    if _constant(a) and _constant(b):
+        return np.cross(a, b)
+    return cross(a, b, ws.spare(*live, a, b))
+
+
+def _rotate(ws: Workspace, live: tuple, C: np.ndarray | None, x: np.ndarray | None) -> np.ndarray | None:
+    """Rotate a vector, ``None`` being the identity rotation, keeping the live values."""
+    if x is None or C is None:
+        return x
+    if C.ndim == validate.CONSTANT_NDIM and _constant(x):
+        return C @ x
+    return rotate(C, x, ws.spare(*live, x))
+
+
+def _assign(ws: Workspace, index: int, C: np.ndarray | None, x: np.ndarray | None, live: tuple) -> np.ndarray | None:
+    """Rotate a vector into the buffer of a state variable, whose previous value is no longer needed."""
+    if x is not None and C is not None and not (C.ndim == validate.CONSTANT_NDIM and _constant(x)):
+        buffer = ws.owned(index)
+        x = rotate(C, x, ws.spare(*live, x) if x is buffer else buffer)
+    else:
+        x = _rotate(ws, live, C, x)
+
+    if x is None or _constant(x):
+        return x
+    buffer = ws.owned(index)
+    if x is not buffer:
+        np.copyto(buffer, x)
+    return buffer
+
+
+def _offset(x: np.ndarray | None, b: np.ndarray | None) -> np.ndarray | None:
+    """Add a constant to a state variable, in place."""
+    if b is None:
+        return x
+    if x is None:
+        return b
+    if _constant(x):
+        return x + b
+    return np.add(x, b, out=x)
+
+
+def _emit(shape: tuple[int, ...], x: np.ndarray | None, dtype: type = np.float64) -> np.ndarray:
+    """Copy a vector of the kernel into a new output of column vectors."""
+    out = np.zeros((*shape, 1), dtype)
+    if x is not None:
+        np.copyto(vec(out), x)
+    return out
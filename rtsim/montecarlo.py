@@ -0,0 +1,262 @@
+"""
+RTSim Monte Carlo runner.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import validate
+from .cache import FrameCache, PrefixCache
+from .frame import Frame
+from .kernel import OUTPUTS
+from .pva import ConstantPVA, TimePVA
+from .testbed import Testbed
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Self
+import copy
+import numpy as np
+import os
+
+Sampler = Callable[[np.random.Generator, np.ndarray], list[Frame]]
+
+_WORKER = {}
+
+
+class MonteCarloResult:
+    """Reduced statistics, and optionally the full result cube, of a Monte Carlo run."""
+
+    def __init__(self, count: int, mean: dict[str, np.ndarray], std: dict[str, np.ndarray], cube=None) -> None:
+        """
+        Initialize a Monte Carlo result.
+
+        :param count: Number of realizations.
+        :type count: int
+
+        :param mean: ``Tx3x1`` mean of each output over the realizations.
+        :type mean: dict[str, np.ndarray]
+
+        :param std: ``Tx3x1`` sample standard deviation of each output over the realizations.
+        :type std: dict[str, np.ndarray]
+
+        :param cube: Read-only ``BxTx3x1`` memory maps of each output, if written.
+        :type cube: dict[str, np.ndarray] | None
+        """
+        self.count = count
+        self.mean = mean
+        self.std = std
+        self.cube = cube
+
+
+class MonteCarlo:
+    """
+    Monte Carlo runner spreading misalignment realizations over a process pool.
+
+    The time vector and the time varying arrays of the rotation frames are placed in shared
+    memory once and attached by every worker, rather than pickled with every task. Realization
+    ``i`` draws its misalignments from a generator seeded with ``SeedSequence(seed, spawn_key=(i,))``,
+    so results do not depend on the number of workers or the task size. The statistics of each task
+    are folded into running ones as the tasks are collected, in order, so only the running statistics,
+    not those of every task, are held until the run ends.
+    """
+
+    def __init__(self, testbed: Testbed, time: np.ndarray, rotations: list[Frame], sampler: Sampler) -> None:
+        """
+        Initialize a Monte Carlo runner.
+
+        :param testbed: Testbed to evaluate.
+        :type testbed: Testbed
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param rotations: Rotating coordinate frame of each testbed axis, shared by all realizations.
+        :type rotations: list[Frame[Rotating]]
+
+        :param sampler: Picklable callable drawing one misalignment set from a generator and the time vector.
+        :type sampler: Callable[[np.random.Generator, np.ndarray], list[Frame[Full]]]
+        """
+        validate.component(testbed, Testbed)
+        self.testbed = testbed
+        self.time = time
+        self.rotations = rotations
+        self.sampler = sampler
+
+    def run(
+        self,
+        count: int,
+        *,
+        seed: int = 0,
+        workers: int | None = None,
+        batch_size: int = 16,
+        path: str | Path | None = None,
+    ) -> MonteCarloResult:
+        """
+        Evaluate realizations on a process pool.
+
+        :param count: Number of realizations.
+        :type count: int
+
+        :param seed: Root seed of the realizations, defaults to 0
+        :type seed: int, optional
+
+        :param workers: Number of worker processes, defaults to the number of CPUs
+        :type workers: int, optional
+
+        :param batch_size: Realizations per task, evaluated together with :meth:`Testbed.process_batch`,
+            defaults to 16
+        :type batch_size: int, optional
+
+        :param path: Directory for a memory-mapped ``BxTx3x1`` result cube per output, defaults to no cube
+        :type path: str | Path, optional
+
+        :return: Reduced statistics and the optional result cube.
+        :rtype: MonteCarloResult
+        """
+        validate.integer(count, minvalue=1)
+        validate.integer(seed, minvalue=0)
+        validate.integer(batch_size, minvalue=1)
+        workers = os.cpu_count() if workers is None else workers
+        validate.integer(workers, minvalue=1)
+
+        if path is not None:
+            path = Path(path)
+            path.mkdir(parents=True, exist_ok=True)
+            for name in OUTPUTS:
+                np.lib.format.open_memmap(path / f"{name}.npy", mode="w+", shape=(count, self.time.size, 3, 1))
+
+        tasks = [(start, min(start + batch_size, count), seed) for start in range(0, count, batch_size)]
+
+        with _SharedInputs(self.time, self.rotations) as shared:
+            initargs = (_geometry(self.testbed), shared.specs, self.sampler, path)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+                reduced = (0, {}, {})
+                for partial in pool.map(_run_task, tasks):
+                    reduced = _combine(reduced, partial)
+
+        total, mean, m2 = reduced
+        std = {name: np.sqrt(m2[name] / max(total - 1, 1)) for name in OUTPUTS}
+        cube = None if path is None else {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in OUTPUTS}
+
+        return MonteCarloResult(total, mean, std, cube)
+
+
+class _SharedInputs:
+    """Time vector and time varying rotation frame arrays copied into shared memory blocks."""
+
+    def __init__(self, time: np.ndarray, rotations: list[Frame]) -> None:
+        """Copy the inputs into shared memory."""
+        self.blocks = []
+        self.specs = {
+            "time": self._share(time),
+            "rotations": [(self._share_pva(frame.linear), self._share_pva(frame.angular)) for frame in rotations],
+        }
+
+    def _share(self, array: np.ndarray) -> tuple[str, tuple, str]:
+        """Copy an array into a new shared memory block."""
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        self.blocks.append(block)
+        return block.name, array.shape, array.dtype.str
+
+    def _share_pva(self, pva: ConstantPVA | TimePVA) -> ConstantPVA | tuple:
+        """Share the arrays of a time varying PVA, constant PVA are pickled as they are small."""
+        if isinstance(pva, ConstantPVA):
+            return pva
+        return tuple(self._share(x) for x in (pva.p, pva.v, pva.a))
+
+    def __enter__(self) -> Self:
+        """Enter a context that releases the shared memory on exit."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Release the shared memory blocks."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+def _attach(spec: tuple[str, tuple, str]) -> np.ndarray:
+    """View a shared memory block as a read-only array, keeping the block open in this worker."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    _WORKER.setdefault("blocks", []).append(block)
+    array = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    array.flags.writeable = False
+    return array
+
+
+def _attach_pva(spec: ConstantPVA | tuple) -> ConstantPVA | TimePVA:
+    """Rebuild a PVA shared by ``_SharedInputs``."""
+    if isinstance(spec, ConstantPVA):
+        return spec
+    p, v, a = (_attach(s) for s in spec)
+    return TimePVA(p=p, v=v, a=a)
+
+
+def _init_worker(testbed: Testbed, specs: dict, sampler: Sampler, path: Path | None) -> None:
+    """Attach the shared inputs and result cube in a worker process."""
+    _WORKER.update(
+        testbed=testbed,
+        time=_attach(specs["time"]),
+        rotations=[Frame(_attach_pva(linear), _attach_pva(angular)) for linear, angular in specs["rotations"]],
+        sampler=sampler,
+        cube=None if path is None else {name: np.load(path / f"{name}.npy", mmap_mode="r+") for name in OUTPUTS},
+    )
+
+
+def _run_task(task: tuple[int, int, int]) -> tuple[int, dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Evaluate realizations ``start`` to ``stop`` and reduce them to a count, mean and sum of squares."""
+    start, stop, seed = task
+    time, sampler, cube = _WORKER["time"], _WORKER["sampler"], _WORKER["cube"]
+
+    misalignments = [
+        sampler(np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(i,))), time) for i in range(start, stop)
+    ]
+    outputs = _WORKER["testbed"].process_batch(time, misalignments, _WORKER["rotations"])
+
+    mean, m2 = {}, {}
+    for name, value in outputs.items():
+        mean[name] = value.mean(axis=0)
+        m2[name] = ((value - mean[name]) ** 2).sum(axis=0)
+        if cube is not None:
+            cube[name][start:stop] = value
+            cube[name].flush()
+
+    return stop - start, mean, m2
+
+
+def _combine(reduced: tuple, partial: tuple) -> tuple[int, dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Fold a task's count, mean and sum of squared deviations into the running ones (Chan et al.)."""
+    total, mean, m2 = reduced
+    if not total:
+        return partial
+    n, task_mean, task_m2 = partial
+    for name in OUTPUTS:
+        delta = task_mean[name] - mean[name]
+        mean[name] += delta * n / (total + n)
+        m2[name] += task_m2[name] + delta**2 * total * n / (total + n)
+    return total + n, mean, m2
+
+
+def _geometry(testbed: Testbed) -> Testbed:
+    """Copy a testbed without the results of previous runs, so it pickles small."""
+    geometry = copy.copy(testbed)
+    geometry.world = copy.copy(testbed.world)
+    geometry.axes = [copy.copy(axis) for axis in testbed.axes]
+    geometry._prefix = PrefixCache(testbed.cache_size)
+    geometry.world.cache = FrameCache(testbed.world.cache_size)
+
+    for name in ("time", "_pending", *OUTPUTS):
+        vars(geometry).pop(name, None)
+    vars(geometry.world).pop("frame", None)
+    for axis in geometry.axes:
+        vars(axis).pop("mu", None)
+        vars(axis).pop("rho", None)
+
+    return geometry
@@ -0,0 +1,341 @@
+"""
+RTSim rate table motion profiles.
+
+A profile is a list of declarative commands for one axis of a rate table, such as position holds,
+trapezoidal rate moves, sinusoidal oscillations and pulse trains. Every command is evaluated in
+closed form, so a profile can be evaluated over the whole time vector at once, or over any chunk
+of it, and its angle, rate and acceleration are consistent derivatives of one another.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import validate
+from .frame import Frame
+from .pva import ConstantPVA, PackedPVA
+from abc import ABC, abstractmethod
+from math import inf, pi
+import numpy as np
+
+AXES = (0, 1, 2)
+
+
+class Command(ABC):
+    """
+    Base class of the motion commands of a profile.
+
+    A command acts on the time steps of its window, from ``start`` to ``stop`` excluded. Before the
+    window it contributes nothing, and from ``stop`` on it contributes the constant angle ``final``.
+    Subclasses implement :meth:`evaluate`, and cannot be instantiated without it.
+    """
+
+    start = -inf
+    stop = -inf
+    final = 0.0
+
+    @abstractmethod
+    def evaluate(self, tau: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the command inside its window.
+
+        :param tau: Time since the start of the window, s
+        :type tau: np.ndarray
+
+        :return: Angle, rate and acceleration, rad, rad/s and rad/s/s
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+
+
+class Hold(Command):
+    """Hold the axis at a constant angle."""
+
+    def __init__(self, angle: float) -> None:
+        """
+        Initialize a position hold.
+
+        :param angle: Angle of the axis, rad
+        :type angle: float
+        """
+        validate.number(angle)
+        self.final = angle
+
+    def evaluate(self, tau: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the hold inside its window, which is empty, as the hold only contributes ``final``.
+
+        :param tau: Time since the start of the window, s
+        :type tau: np.ndarray
+
+        :return: Zero angle, rate and acceleration, rad, rad/s and rad/s/s
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        zero = np.zeros_like(tau)
+        return zero, zero, zero
+
+
+class RateMove(Command):
+    """
+    Trapezoidal rate move.
+
+    The rate ramps up from zero to ``rate`` at constant acceleration, holds, then ramps back down to
+    zero so that the move lasts ``duration``. The axis then holds at the angle it reached.
+    """
+
+    def __init__(self, rate: float, start: float, duration: float, ramp: float) -> None:
+        """
+        Initialize a trapezoidal rate move.
+
+        :param rate: Rate of the move once ramped up, rad/s
+        :type rate: float
+
+        :param start: Time the move starts, s
+        :type start: float
+
+        :param duration: Duration of the move, ramps included, s
+        :type duration: float
+
+        :param ramp: Duration of each ramp, 0 for a step in rate, s
+        :type ramp: float
+
+        :raises MaxValueError: If the ramps do not fit in the duration.
+        """
+        validate.number(rate)
+        validate.number(start)
+        validate.number(duration, minvalue=0)
+        validate.number(ramp, minvalue=0, maxvalue=duration / 2)
+        self.rate = rate
+        self.start = start
+        self.stop = start + duration
+        self.duration = duration
+        self.ramp = ramp
+        self.final = rate * (duration - ramp)
+
+    def evaluate(self, tau: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the move inside its window.
+
+        :param tau: Time since the start of the move, s
+        :type tau: np.ndarray
+
+        :return: Angle, rate and acceleration, rad, rad/s and rad/s/s
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        return _trapezoid(tau, self.rate, self.duration, self.ramp)
+
+
+class Oscillation(Command):
+    r"""
+    Sinusoidal oscillation about the current angle.
+
+    The angle follows :math:`A \sin(2 \pi f \tau)` from ``start`` for ``duration``, then holds at the
+    angle it reached, which is the starting angle after a whole number of half periods.
+    """
+
+    def __init__(self, amplitude: float, frequency: float, start: float = 0.0, duration: float = inf) -> None:
+        """
+        Initialize a sinusoidal oscillation.
+
+        :param amplitude: Amplitude of the angle, rad
+        :type amplitude: float
+
+        :param frequency: Frequency of the oscillation, Hz
+        :type frequency: float
+
+        :param start: Time the oscillation starts, defaults to 0.0, s
+        :type start: float, optional
+
+        :param duration: Duration of the oscillation, defaults to forever, s
+        :type duration: float, optional
+        """
+        validate.number(amplitude)
+        validate.number(frequency, minvalue=0)
+        validate.number(start)
+        validate.number(duration, minvalue=0)
+        self.amplitude = amplitude
+        self.omega = 2 * pi * frequency
+        self.start = start
+        self.stop = start + duration
+        self.final = amplitude * np.sin(self.omega * duration) if duration < inf else 0.0
+
+    def evaluate(self, tau: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the oscillation inside its window.
+
+        :param tau: Time since the start of the oscillation, s
+        :type tau: np.ndarray
+
+        :return: Angle, rate and acceleration, rad, rad/s and rad/s/s
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        phase = self.omega * tau
+        s, c = np.sin(phase), np.cos(phase)
+        return self.amplitude * s, (self.amplitude * self.omega) * c, (-self.amplitude * self.omega**2) * s
+
+
+class PulseTrain(Command):
+    """
+    Train of identical trapezoidal rate moves.
+
+    A pulse starts every ``period`` from ``start``, and each pulse is a :class:`RateMove` lasting
+    ``width``, so every pulse advances the axis by the same angle.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        rate: float,
+        start: float,
+        width: float,
+        ramp: float,
+        *,
+        period: float,
+        count: int,
+    ) -> None:
+        """
+        Initialize a pulse train.
+
+        :param rate: Rate of each pulse once ramped up, rad/s
+        :type rate: float
+
+        :param start: Time the first pulse starts, s
+        :type start: float
+
+        :param width: Duration of each pulse, ramps included, s
+        :type width: float
+
+        :param ramp: Duration of each ramp, 0 for a step in rate, s
+        :type ramp: float
+
+        :param period: Time between the starts of consecutive pulses, s
+        :type period: float
+
+        :param count: Number of pulses.
+        :type count: int
+
+        :raises MaxValueError: If the ramps do not fit in the width, or the pulses overlap.
+        """
+        validate.number(period, minvalue=0)
+        validate.number(width, minvalue=0, maxvalue=period)
+        validate.integer(count, minvalue=1)
+        self.pulse = RateMove(rate, start, width, ramp)
+        self.period = period
+        self.count = count
+        self.start = start
+        self.stop = start + (count - 1) * period + width
+        self.final = count * self.pulse.final
+
+    def evaluate(self, tau: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evaluate the pulse train inside its window.
+
+        :param tau: Time since the start of the first pulse, s
+        :type tau: np.ndarray
+
+        :return: Angle, rate and acceleration, rad, rad/s and rad/s/s
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        pulse = self.pulse
+        k = np.minimum(tau // self.period, self.count - 1) if self.period else np.zeros_like(tau)
+        p, v, a = _trapezoid(tau - k * self.period, pulse.rate, pulse.duration, pulse.ramp)
+        p += k * pulse.final
+        return p, v, a
+
+
+class Profile:
+    """
+    Motion profile of one rate table axis.
+
+    The angle, rate and acceleration of the profile are the sums of those of its commands. Only the
+    time steps inside the window of a command are evaluated, and the final angles of all commands
+    are added in a single cumulative sum, so short moves in a long scenario cost little. Every
+    command is in closed form, so evaluating a chunk of the time vector gives the same values as
+    evaluating all of it and slicing.
+    """
+
+    def __init__(self, commands: list[Command], axis: int = 2) -> None:
+        """
+        Initialize a motion profile.
+
+        :param commands: Motion commands, applied together.
+        :type commands: list[Command]
+
+        :param axis: Index of the rotation axis of the frame, defaults to 2
+        :type axis: int, optional
+
+        :raises ComponentTypeError: If a command is not a ``Command``.
+        :raises OptionError: If 'axis' is not 0, 1 or 2.
+        """
+        for command in commands:
+            validate.component(command, Command)
+        validate.option(axis, AXES)
+        self.commands = list(commands)
+        self.axis = axis
+
+    def evaluate(self, time: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Evaluate the angle, rate and acceleration of the profile.
+
+        :param time: Ascending time of each step, s
+        :type time: np.ndarray
+
+        :param out: 3xT array the result is written to, defaults to a new array
+        :type out: np.ndarray, optional
+
+        :return: 3xT angle, rate and acceleration, rad, rad/s and rad/s/s
+        :rtype: np.ndarray
+        """
+        if out is None:
+            out = np.zeros((3, time.size))
+        else:
+            out[...] = 0.0
+
+        steps = np.zeros(time.size + 1)
+        for command in self.commands:
+            i, j = np.searchsorted(time, (command.start, command.stop))
+            if j > i:
+                window = out[:, i:j]
+                for k, x in enumerate(command.evaluate(time[i:j] - command.start)):
+                    window[k] += x
+            steps[j] += command.final
+
+        out[0] += np.cumsum(steps[:-1])
+
+        return out
+
+    def frame(self, time: np.ndarray) -> Frame:
+        """
+        Build the rotating coordinate frame of the profile, as taken by :meth:`Axis.process`.
+
+        :param time: Ascending time of each step, or of a chunk of steps, s
+        :type time: np.ndarray
+
+        :return: Rotating frame about the profile axis.
+        :rtype: Frame[Rotating]
+        """
+        angular = PackedPVA.zeros(time.size)
+        self.evaluate(time, out=angular.buffer[:, :, self.axis, 0])
+        zero = np.zeros((3, 1))
+        return Frame(ConstantPVA(p=zero, v=zero, a=zero), angular)
+
+
+def _trapezoid(tau: np.ndarray, rate: float, duration: float, ramp: float) -> tuple[np.ndarray, ...]:
+    """Angle, rate and acceleration of a trapezoidal rate move, as a ramp up minus a delayed ramp up."""
+    p, v, a = _ramp(tau, ramp)
+    q, w, b = _ramp(tau - (duration - ramp), ramp)
+    p -= q
+    p *= rate
+    v -= w
+    v *= rate
+    a -= b
+    a *= rate
+    return p, v, a
+
+
+def _ramp(tau: np.ndarray, ramp: float) -> tuple[np.ndarray, ...]:
+    """Integral, value and derivative of a rate ramping up from 0 to 1 over 'ramp'."""
+    if not ramp:
+        return np.maximum(tau, 0.0), (tau >= 0.0).astype(float), np.zeros_like(tau)
+    c = np.clip(tau, 0.0, ramp)
+    return c * c / (2 * ramp) + np.maximum(tau - ramp, 0.0), c / ramp, ((tau >= 0.0) & (tau < ramp)) / ramp
@@ -0,0 +1,139 @@
+"""
+RTSim compiled testbed evaluation plan.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import kernel
+from . import validate
+from .exceptions import AxisCountError
+from .frame import Frame
+from .pva import ConstantPVA
+from .world import EarthRotation
+import numpy as np
+
+
+class Plan:
+    """
+    Frozen evaluation plan of a testbed geometry, built by :meth:`rtsim.Testbed.compile`.
+
+    A plan holds every quantity that depends only on the geometry of the testbed: the rotation rate of
+    the world, the rotation and offset of each axis zero frame, the navigation frame, gravity resolved
+    in the navigation frame and the position and attitude of the body on the platform. It also holds
+    the sequence of frames that make up the body attitude chain. Evaluating the plan only performs the
+    time varying math of :func:`rtsim.kernel.testbed_outputs`. The plan keeps copies rather than the
+    components of the testbed, so later changes to the testbed, even in place, do not affect the plan.
+    """
+
+    __slots__ = ("attitude", "fixed", "gravity", "nav", "omega", "platform", "zetas")
+
+    def __init__(self, testbed, *, attitude: str = "dcm", platform: tuple | None = None) -> None:
+        """
+        Initialize a plan, use :meth:`rtsim.Testbed.compile` instead.
+
+        :param testbed: Testbed to plan.
+        :type testbed: Testbed
+
+        :param attitude: Representation of the body attitude chain, "dcm" or "quaternion", defaults to "dcm"
+        :type attitude: str, optional
+
+        :param platform: Position of the body on the platform and mount to body DCM product, defaults to
+            those of the testbed mount and body
+        :type platform: tuple[np.ndarray, np.ndarray], optional
+        """
+        r_mb, Cmb = testbed._platform() if platform is None else platform
+        nav = testbed.nav
+        Cn = _frozen(kernel.rotation(nav))
+        zetas = tuple(_frozen_frame(axis.zeta) for axis in testbed.axes)
+
+        fields = {
+            "attitude": attitude,
+            "fixed": tuple(kernel.fixed(zeta) for zeta in zetas),
+            "gravity": _frozen(np.array([0.0, 0.0, -testbed.g]) if Cn is None else Cn @ [0.0, 0.0, -testbed.g]),
+            "nav": (Cn, _frozen(kernel.value(nav.linear.p))),
+            "omega": testbed.world.omega_ie,
+            "platform": (_frozen(r_mb if np.any(r_mb) else None), _frozen(Cmb)),
+            "zetas": zetas,
+        }
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        """Refuse to modify the plan."""
+        msg = f"'{type(self).__name__}' is frozen, compile the testbed again instead"
+        raise AttributeError(msg)
+
+    def process(
+        self,
+        time: np.ndarray,
+        misalignments: list[Frame],
+        rotations: list[Frame],
+        *,
+        outputs: tuple[str, ...] = kernel.OUTPUTS,
+        precision: str = "float64",
+    ) -> dict[str, np.ndarray]:
+        """
+        Evaluate the plan for one set of inputs.
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param misalignments: Misalignment coordinate frame of each testbed axis.
+        :type misalignments: list[Frame[Full]]
+
+        :param rotations: Rotating coordinate frame of each testbed axis.
+        :type rotations: list[Frame[Rotating]]
+
+        :param outputs: Names of the outputs to evaluate, defaults to all of ``OUTPUTS``
+        :type outputs: tuple[str, ...], optional
+
+        :param precision: Precision policy, "float64", "float32" or "mixed" (see :meth:`rtsim.Testbed.process`),
+            defaults to "float64"
+        :type precision: str, optional
+
+        :raises AxisCountError: If the number of misalignments or rotations does not match the axes.
+        :raises OptionError: If an output name or the precision policy is not known.
+
+        :return: ``Tx3x1`` outputs keyed by name.
+        :rtype: dict[str, np.ndarray]
+        """
+        if len(misalignments) != len(self.fixed):
+            raise AxisCountError(len(self.fixed), "misalignment")
+        if len(rotations) != len(self.fixed):
+            raise AxisCountError(len(self.fixed), "rotations")
+        for name in outputs:
+            validate.option(name, kernel.OUTPUTS)
+        validate.option(precision, kernel.PRECISIONS)
+
+        return kernel.testbed_outputs(
+            self, EarthRotation(self.omega, time), misalignments, rotations, outputs, precision
+        )
+
+    def __str__(self):
+        """Return a string representation of the plan."""
+        return f"Plan({len(self.fixed)} axes, {self.attitude})"
+
+    def __repr__(self):
+        """Return a string representation of the plan."""
+        return f"Plan({len(self.fixed)} axes, {self.attitude})"
+
+
+def _frozen(x: np.ndarray | None) -> np.ndarray | None:
+    """Return a read-only copy of an array."""
+    if x is None:
+        return None
+    x = np.array(x, dtype=float)
+    x.flags.writeable = False
+    return x
+
+
+def _frozen_frame(frame: Frame) -> Frame:
+    """Return a fixed frame of read-only copies of the offset and orientation of a fixed frame."""
+    linear, angular = (
+        ConstantPVA(p=_frozen(pva.p), v=_frozen(pva.v), a=_frozen(pva.a)) for pva in (frame.linear, frame.angular)
+    )
+    return Frame(linear, angular)
@@ -0,0 +1,179 @@
+"""
+RTSim plotting.
+
+Matplotlib is only imported when a plot is made, and global ``rcParams`` are left untouched, so
+importing ``rtsim`` stays fast on workers that never plot. Long runs are reduced to a min/max
+envelope per horizontal pixel before drawing, which looks the same on screen as drawing every
+sample.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from .testbed import Testbed
+
+AXES = ("x", "y", "z")
+
+VARIABLES = {
+    "la": {"unit": "g", "sym": r"\mathbf{a}"},
+    "sf": {"unit": "g", "sym": r"\mathbf{f}"},
+    "av": {"unit": "rad/s", "sym": r"\mathbf{\omega}"},
+    "aa": {"unit": "rad/s^2", "sym": r"\dot{\mathbf{\omega}}"},
+}
+
+PREFIXES = {
+    -24: "Y",
+    -21: "Z",
+    -18: "E",
+    -15: "P",
+    -12: "T",
+    -9: "G",
+    -6: "M",
+    -3: "k",
+    0: "",
+    3: "m",
+    6: r"\mu",
+    9: "n",
+    12: "p",
+    15: "f",
+    18: "a",
+    21: "z",
+    24: "y",
+}
+
+
+def decimate(time: np.ndarray, x: np.ndarray, buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a signal to the minimum and maximum of each of ``buckets`` consecutive runs of samples.
+
+    The extremes of each bucket are kept in time order, so a line through the result covers the same
+    pixels as a line through every sample when there is about one bucket per pixel.
+
+    :param time: ``T`` time of each sample.
+    :type time: np.ndarray
+
+    :param x: ``T`` signal.
+    :type x: np.ndarray
+
+    :param buckets: Number of buckets, such as the width of the plot in pixels.
+    :type buckets: int
+
+    :return: Time and value of at most ``2 * buckets`` samples.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    size = -(-x.size // buckets)
+    if size <= 2:  # noqa: PLR2004
+        return time, x
+
+    count = -(-x.size // size)
+    padded = np.pad(x, (0, count * size - x.size), mode="edge").reshape(count, size)
+    offset = np.arange(count)[:, None] * size
+    extremes = np.sort(np.stack([padded.argmin(axis=1), padded.argmax(axis=1)], axis=1), axis=1) + offset
+    index = np.minimum(extremes.ravel(), x.size - 1)
+    return time[index], x[index]
+
+
+def plot(testbed: "Testbed", *, variable: str = "la", frame: str = "b", separate: bool = False) -> None:
+    """
+    Plot the processed results of a testbed.
+
+    :param testbed: Processed testbed.
+    :type testbed: Testbed
+
+    :param variable: The variable to be plotted, "la" for linear acceleration, "aa" for angular
+        acceleration, "av" for angular velocity or "sf" for specific force, defaults to "la"
+    :type variable: str, optional
+
+    :param frame: Reference frame of variable, "i" for inertial frame or "b" for body frame, defaults to "b"
+    :type frame: str, optional
+
+    :param separate: Separate x, y, and z axis into subplots, defaults to False
+    :type separate: bool, optional
+    """
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    info = VARIABLES[variable]
+    x = getattr(testbed, f"{variable}{frame}ib")[..., 0]
+    scale = 1.0 if variable[0] == "a" else 1.0 / testbed.g
+
+    if separate:
+        fig, ax = plt.subplots(3, 1, sharex=True, figsize=(6.5, 8.0))
+    else:
+        fig, ax = plt.subplots(1, 1, figsize=(6.50, 4.02))
+    buckets = int(fig.get_figwidth() * fig.dpi)
+
+    lines = [decimate(testbed.time, x[:, a], buckets) for a in range(3)]
+    exp, _ = unit_modifier(np.array([y for _, y in lines]) * scale)
+    lines = [(t, np.round(y * scale, 12) * 10**exp) for t, y in lines]
+
+    unit = rf"$\mathrm{{{PREFIXES[exp]}{info['unit']}}}$"
+    title = rf"${info['sym']}^\mathrm{{{frame}}}_{{\mathrm{{ib}}}}$, {unit}"
+
+    if separate:
+        for a, (t, y) in enumerate(lines):
+            ax[a].plot(t, y)
+            ax[a].set(ylabel=AXES[a])
+            ax[a].grid(visible=True, which="both", linestyle=":", alpha=0.25)
+
+        ax[0].set(title=title)
+        ax[2].set(xlabel="Time, s")
+        fig.align_ylabels(ax)
+        fig.subplots_adjust(left=0.10, bottom=0.12, right=0.96, top=0.94, wspace=0.0, hspace=0.0)
+    else:
+        for a, (t, y) in enumerate(lines):
+            ax.plot(t, y, label=AXES[a])
+
+        ax.set(xlabel="Time, s", ylabel=title)
+        ax.grid(visible=True, which="both", linestyle=":", alpha=0.25)
+        ax.spines[:].set_visible(False)
+        ax.legend(frameon=False)
+        fig.subplots_adjust(left=0.10, bottom=0.12, right=0.96, top=0.94)
+
+
+def unit_modifier(x: np.ndarray) -> tuple[float, str]:
+    """
+    Find the SI prefix that brings the largest magnitude of a variable to at least 1.
+
+    :param x: Variable.
+    :type x: np.ndarray
+
+    :return: Power of ten to scale the variable by, and the ``siunitx`` macro of the prefix.
+    :rtype: tuple[float, str]
+    """
+    mods = {
+        -24: r"\yotta",
+        -21: r"\zetta",
+        -18: r"\exa",
+        -15: r"\peta",
+        -12: r"\tera",
+        -9: r"\giga",
+        -6: r"\mega",
+        -3: r"\kilo",
+        0: r"",
+        3: r"\milli",
+        6: r"\micro",
+        9: r"\nano",
+        12: r"\pico",
+        15: r"\femto",
+        18: r"\atto",
+        21: r"\zepto",
+        24: r"\yocto",
+    }
+
+    exp = np.arange(-24.0, 25.0, 3.0)
+    xm = np.max(np.abs(x), initial=0.0)
+
+    if xm == 0.0:
+        return 0, r""
+
+    xma = xm * 10**exp
+    idx = np.where(xma > 1.0)[0][0]
+
+    return exp[idx], mods[exp[idx]]
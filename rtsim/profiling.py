@@ -0,0 +1,272 @@
+"""
+RTSim per-stage profiling.
+
+:meth:`Testbed.process`, :meth:`Axis.process` and the fused kernel mark their stages with
+:func:`stage`. While a :class:`Profiler` is active, each stage records its wall time and,
+optionally, the memory it allocated as traced by ``tracemalloc``, which NumPy reports its arrays
+to. Otherwise :func:`stage` returns a shared no-op context manager, so instrumented code costs one
+global lookup and an empty ``with`` per stage.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Self
+import json
+import os
+import threading
+import time as clock
+import tracemalloc
+
+_active = None
+
+_disabled = nullcontext()
+
+
+class Event:
+    """Completed stage: its name, arguments, start and duration in seconds and traced memory in bytes."""
+
+    __slots__ = ("allocated", "args", "depth", "duration", "name", "peak", "start", "thread")
+
+    def __init__(self, name: str, args: dict, start: float, depth: int, thread: int) -> None:
+        """
+        Initialize a stage event when the stage is entered.
+
+        :param name: Name of the stage, such as "Axis.process".
+        :type name: str
+
+        :param args: Arguments of the stage, such as the name of the axis.
+        :type args: dict
+
+        :param start: Start of the stage, from ``time.perf_counter``, in seconds.
+        :type start: float
+
+        :param depth: Number of enclosing stages.
+        :type depth: int
+
+        :param thread: Identifier of the thread running the stage.
+        :type thread: int
+        """
+        self.name = name
+        self.args = args
+        self.start = start
+        self.depth = depth
+        self.thread = thread
+        self.duration = 0.0
+        self.allocated = None
+        self.peak = None
+
+    def __repr__(self):
+        """Return a string representation of the event."""
+        memory = "" if self.peak is None else f", allocated={self.allocated}, peak={self.peak}"
+        return f"Event({self.name!r}, duration={self.duration:.6f}{memory})"
+
+
+class Profiler:
+    """
+    Collector of the stage events of the code run while it is active.
+
+    Use it as a context manager, or call :meth:`start` and :meth:`stop`. One profiler is active at a
+    time, and starting a profiler while another is active suspends the other until it stops. Stages
+    run by worker threads are recorded with the identifier of their thread.
+    """
+
+    def __init__(self, *, memory: bool = False, callbacks: Iterable[Callable[[Event], None]] = ()) -> None:
+        """
+        Initialize an inactive profiler.
+
+        :param memory: Record the memory allocated by each stage with ``tracemalloc``, which slows
+            allocations down, defaults to False. The net and peak memory of a stage include any
+            allocated concurrently by other threads.
+        :type memory: bool, optional
+
+        :param callbacks: Callables receiving each event as its stage completes, defaults to none
+        :type callbacks: Iterable[Callable[[Event], None]], optional
+        """
+        self.memory = memory
+        self.callbacks = list(callbacks)
+        self.events = []
+        self._origin = clock.perf_counter()
+        self._local = threading.local()
+        self._previous = None
+        self._tracing = False
+
+    def __enter__(self) -> Self:
+        """Start the profiler."""
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        """Stop the profiler."""
+        self.stop()
+
+    def start(self) -> Self:
+        """
+        Make this profiler the active one.
+
+        :return: This profiler.
+        :rtype: Profiler
+        """
+        global _active  # noqa: PLW0603
+        self._previous = _active
+        self._tracing = self.memory and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        _active = self
+        return self
+
+    def stop(self) -> None:
+        """Restore the profiler that was active when this one started."""
+        global _active  # noqa: PLW0603
+        _active = self._previous
+        self._previous = None
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def subscribe(self, callback: Callable[[Event], None]) -> None:
+        """
+        Register a callable receiving each event as its stage completes.
+
+        :param callback: Callable receiving an :class:`Event`.
+        :type callback: Callable[[Event], None]
+        """
+        self.callbacks.append(callback)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Total the events of each stage.
+
+        :return: Number of calls, total duration in seconds and, when recording memory, largest peak
+            in bytes of each stage, keyed by name in order of first completion.
+        :rtype: dict[str, dict[str, float]]
+        """
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(event.name, {"calls": 0, "seconds": 0.0})
+            total["calls"] += 1
+            total["seconds"] += event.duration
+            if event.peak is not None:
+                total["peak"] = max(total.get("peak", 0), event.peak)
+        return totals
+
+    def trace(self) -> dict:
+        """
+        Build a Chrome trace of the events, viewable in ``chrome://tracing`` or Perfetto.
+
+        :return: Trace in the trace event format, with one complete event per stage.
+        :rtype: dict
+        """
+        pid = os.getpid()
+        events = []
+        for event in self.events:
+            args = dict(event.args)
+            if event.peak is not None:
+                args |= {"allocated": event.allocated, "peak": event.peak}
+            events.append(
+                {
+                    "name": event.name,
+                    "cat": "rtsim",
+                    "ph": "X",
+                    "ts": (event.start - self._origin) * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": pid,
+                    "tid": event.thread,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str | Path) -> None:
+        """
+        Write a Chrome trace of the events to a JSON file.
+
+        :param path: JSON file.
+        :type path: str | Path
+        """
+        Path(path).write_text(json.dumps(self.trace()))
+
+    def clear(self) -> None:
+        """Discard the recorded events."""
+        self.events = []
+
+    def _stack(self) -> list:
+        """Return the stack of open stages of the calling thread."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class _Stage:
+    """Context manager recording one stage to a profiler."""
+
+    __slots__ = ("args", "base", "event", "high", "name", "profiler")
+
+    def __init__(self, profiler: Profiler, name: str, args: dict) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> None:
+        stack = self.profiler._stack()
+        if self.profiler.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].high = max(stack[-1].high, peak)
+            tracemalloc.reset_peak()
+            self.base = self.high = current
+        else:
+            self.base = None
+        self.event = Event(self.name, self.args, clock.perf_counter(), len(stack), threading.get_ident())
+        stack.append(self)
+
+    def __exit__(self, *exc) -> None:
+        event = self.event
+        event.duration = clock.perf_counter() - event.start
+        stack = self.profiler._stack()
+        stack.pop()
+        if self.base is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            high = max(self.high, peak)
+            event.allocated = current - self.base
+            event.peak = high - self.base
+            if stack:
+                stack[-1].high = max(stack[-1].high, high)
+            tracemalloc.reset_peak()
+
+        self.profiler.events.append(event)
+        for callback in self.profiler.callbacks:
+            callback(event)
+
+
+def stage(name: str, **args) -> _Stage | nullcontext:
+    """
+    Mark a stage of the code run in the ``with`` block.
+
+    :param name: Name of the stage, such as "World.process".
+    :type name: str
+
+    :param args: Arguments recorded with the stage, such as the name of an axis.
+
+    :return: Context manager recording the stage to the active profiler, or doing nothing if none is.
+    :rtype: _Stage | nullcontext
+    """
+    if _active is None:
+        return _disabled
+    return _Stage(_active, name, args)
+
+
+def active() -> Profiler | None:
+    """
+    Return the active profiler.
+
+    :return: Active profiler, or None when profiling is disabled.
+    :rtype: Profiler | None
+    """
+    return _active
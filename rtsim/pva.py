@@ -15,6 +15,8 @@ from rtsim import validate
 class ConstantPVA:
     """Constant Position, Velocity, Acceleration class."""
 
+    __slots__ = ("_a", "_p", "_v")
+
     def __init__(self, *, p: np.ndarray, v: np.ndarray, a: np.ndarray) -> None:
         """
         Initialize a constant PVA.
@@ -62,6 +64,18 @@ class ConstantPVA:
         validate.constant_vector(value)
         self._a = value
 
+    def slice(self, index: slice) -> "ConstantPVA":
+        """
+        Select a range of time steps, which for a constant PVA is the PVA itself.
+
+        :param index: Time steps to select.
+        :type index: slice
+
+        :return: This constant PVA.
+        :rtype: ConstantPVA
+        """
+        return self
+
     def __repr__(self) -> str:
         """Return a string representation of the constant PVA."""
         return f"ConstantPVA(\n p={self.p!r},\n v={self.v!r},\n a={self.a!r}\n)"
@@ -82,6 +96,8 @@ class ConstantPVA:
 class TimePVA:
     """Time varying Position, Velocity, Acceleration class."""
 
+    __slots__ = ("_a", "_p", "_v")
+
     def __init__(self, *, p: np.ndarray, v: np.ndarray, a: np.ndarray) -> None:
         """
         Initialize a time varying PVA.
@@ -129,6 +145,18 @@ class TimePVA:
         validate.time_vector(value)
         self._a = value
 
+    def slice(self, index: slice) -> "TimePVA":
+        """
+        Select a range of time steps without copying.
+
+        :param index: Time steps to select.
+        :type index: slice
+
+        :return: Time varying PVA viewing the selected time steps.
+        :rtype: TimePVA
+        """
+        return TimePVA(p=self.p[index], v=self.v[index], a=self.a[index])
+
     def __repr__(self) -> str:
         """Return a string representation of the time varying PVA."""
         return f"TimePVA(\n p={self.p!r},\n v={self.v!r},\n a={self.a!r}\n)"
@@ -144,3 +172,226 @@ class TimePVA:
                 ")",
             ]
         )
+
+
+class BatchPVA(TimePVA):
+    """Batch of time varying Position, Velocity, Acceleration class."""
+
+    __slots__ = ()
+
+    def __init__(self, *, p: np.ndarray, v: np.ndarray, a: np.ndarray) -> None:
+        """
+        Initialize a batch of time varying PVA.
+
+        :param p: Position (BxTx3x1)
+        :type p: np.ndarray
+
+        :param v: Velocity (BxTx3x1)
+        :type v: np.ndarray
+
+        :param a: Acceleration (BxTx3x1)
+        :type a: np.ndarray
+        """
+        super().__init__(p=p, v=v, a=a)
+
+    @classmethod
+    def stack(cls, pvas: list[TimePVA]) -> "BatchPVA":
+        """
+        Stack time varying PVA along a new leading batch axis.
+
+        :param pvas: Time varying PVA over the same time steps.
+        :type pvas: list[TimePVA]
+
+        :return: Batch of the input PVA.
+        :rtype: BatchPVA
+        """
+        return cls(
+            p=np.stack([pva.p for pva in pvas]),
+            v=np.stack([pva.v for pva in pvas]),
+            a=np.stack([pva.a for pva in pvas]),
+        )
+
+    @property
+    def p(self):
+        """Position vector."""
+        return self._p
+
+    @p.setter
+    def p(self, value):
+        validate.batch_vector(value)
+        self._p = value
+
+    @property
+    def v(self):
+        """Velocity vector."""
+        return self._v
+
+    @v.setter
+    def v(self, value):
+        validate.batch_vector(value)
+        self._v = value
+
+    @property
+    def a(self):
+        """Acceleration vector."""
+        return self._a
+
+    @a.setter
+    def a(self, value):
+        validate.batch_vector(value)
+        self._a = value
+
+    def slice(self, index: slice) -> "BatchPVA":
+        """
+        Select a range of time steps without copying.
+
+        :param index: Time steps to select.
+        :type index: slice
+
+        :return: Batch of time varying PVA viewing the selected time steps.
+        :rtype: BatchPVA
+        """
+        return BatchPVA(p=self.p[:, index], v=self.v[:, index], a=self.a[:, index])
+
+    def __repr__(self) -> str:
+        """Return a string representation of the batch of time varying PVA."""
+        return f"BatchPVA(\n p={self.p!r},\n v={self.v!r},\n a={self.a!r}\n)"
+
+    def __str__(self) -> str:
+        """Return a string representation of the batch of time varying PVA."""
+        return "\n".join(
+            [
+                "BatchPVA(",
+                f"  p = {'x'.join([str(x) for x in self.p.shape])} Array,",
+                f"  v = {'x'.join([str(x) for x in self.v.shape])} Array,",
+                f"  a = {'x'.join([str(x) for x in self.a.shape])} Array,",
+                ")",
+            ]
+        )
+
+
+class PackedPVA:
+    """
+    Time varying Position, Velocity, Acceleration class backed by a single buffer.
+
+    The position, velocity and acceleration are views of one contiguous ``3xTx3x1`` buffer, so the PVA
+    costs a single allocation, and the buffer is validated once on construction. Assigning ``p``, ``v``
+    or ``a`` validates the vector and copies it into the view rather than replacing it. A packed PVA is
+    accepted wherever a :class:`TimePVA` is, but does not derive from it, as it holds only the buffer.
+    """
+
+    __slots__ = ("buffer",)
+
+    def __init__(self, buffer: np.ndarray) -> None:
+        """
+        Initialize a packed time varying PVA.
+
+        :param buffer: Position, velocity and acceleration (3xTx3x1)
+        :type buffer: np.ndarray
+        """
+        validate.packed_vector(buffer)
+        self.buffer = buffer
+
+    @classmethod
+    def empty(cls, steps: int) -> "PackedPVA":
+        """
+        Allocate an uninitialized packed PVA.
+
+        :param steps: Number of time steps.
+        :type steps: int
+
+        :return: Packed PVA.
+        :rtype: PackedPVA
+        """
+        return cls(np.empty((3, steps, 3, 1)))
+
+    @classmethod
+    def zeros(cls, steps: int) -> "PackedPVA":
+        """
+        Allocate a zero packed PVA.
+
+        :param steps: Number of time steps.
+        :type steps: int
+
+        :return: Packed PVA.
+        :rtype: PackedPVA
+        """
+        return cls(np.zeros((3, steps, 3, 1)))
+
+    @classmethod
+    def pack(cls, pva: "TimePVA | PackedPVA") -> "PackedPVA":
+        """
+        Copy a time varying PVA into a single buffer.
+
+        :param pva: Time varying PVA.
+        :type pva: TimePVA | PackedPVA
+
+        :return: Packed PVA.
+        :rtype: PackedPVA
+        """
+        return cls(np.stack([pva.p, pva.v, pva.a]))
+
+    @property
+    def p(self):
+        """Position vector."""
+        return self.buffer[0]
+
+    @p.setter
+    def p(self, value):
+        validate.time_vector(value, steps=self.buffer.shape[1])
+        self.buffer[0] = value
+
+    @property
+    def v(self):
+        """Velocity vector."""
+        return self.buffer[1]
+
+    @v.setter
+    def v(self, value):
+        validate.time_vector(value, steps=self.buffer.shape[1])
+        self.buffer[1] = value
+
+    @property
+    def a(self):
+        """Acceleration vector."""
+        return self.buffer[2]
+
+    @a.setter
+    def a(self, value):
+        validate.time_vector(value, steps=self.buffer.shape[1])
+        self.buffer[2] = value
+
+    def slice(self, index: slice) -> "PackedPVA":
+        """
+        Select a range of time steps without copying.
+
+        :param index: Time steps to select.
+        :type index: slice
+
+        :return: Packed PVA viewing the selected time steps.
+        :rtype: PackedPVA
+        """
+        return PackedPVA(self.buffer[:, index])
+
+    def view(self) -> TimePVA:
+        """
+        View the buffer as a time varying PVA, for callers that expect a :class:`TimePVA`.
+
+        :return: Time varying PVA of views of the buffer.
+        :rtype: TimePVA
+        """
+        return TimePVA(p=self.p, v=self.v, a=self.a)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the packed time varying PVA."""
+        return f"PackedPVA(\n p={self.p!r},\n v={self.v!r},\n a={self.a!r}\n)"
+
+    def __str__(self) -> str:
+        """Return a string representation of the packed time varying PVA."""
+        return "\n".join(
+            [
+                "PackedPVA(",
+                f"  buffer = {'x'.join([str(x) for x in self.buffer.shape])} Array,",
+                ")",
+            ]
+        )
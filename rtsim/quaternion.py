@@ -0,0 +1,151 @@
+r"""
+RTSim attitude quaternions.
+
+Quaternions are stored scalar first as the last axis of an array, :math:`q = [w, x, y, z]`,
+and follow the Hamilton convention, so that :math:`p \otimes q` represents the same rotation
+as the direction cosine matrix product :math:`C_p C_q`.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+import numpy as np
+
+
+def orientation_to_quaternion(v: np.ndarray) -> np.ndarray:
+    r"""
+    Convert an orientation vector to a unit quaternion.
+
+    Uses the same rotation sequence as :func:`rtsim.frame.orientation_to_dcm`, so that
+    ``quaternion_to_dcm(orientation_to_quaternion(v))`` equals ``orientation_to_dcm(v)``.
+
+    :param v: :math:`\mathrm{3x1}`, :math:`\mathrm{Tx3x1}` or :math:`\mathrm{BxTx3x1}` orientation vector,
+        :math:`\mathrm{rad}`
+    :type v: np.ndarray
+
+    :return: :math:`\mathrm{4}`, :math:`\mathrm{Tx4}` or :math:`\mathrm{BxTx4}` quaternion
+    :rtype: np.ndarray
+    """
+    half = 0.5 * v[..., 0]
+    s, c = np.sin(half), np.cos(half)
+    sa, sb, sg = s[..., 0], s[..., 1], s[..., 2]
+    ca, cb, cg = c[..., 0], c[..., 1], c[..., 2]
+
+    q = np.empty((*v.shape[:-2], 4), v.dtype)
+    q[..., 0] = ca * cb * cg + sa * sb * sg
+    q[..., 1] = sa * cb * cg - ca * sb * sg
+    q[..., 2] = ca * sb * cg + sa * cb * sg
+    q[..., 3] = ca * cb * sg - sa * sb * cg
+    return q
+
+
+def dcm_to_quaternion(C: np.ndarray) -> np.ndarray:
+    r"""
+    Convert a direction cosine matrix to a unit quaternion with a non-negative scalar part.
+
+    Uses Shepperd's method: the largest of the trace and the diagonal elements selects the largest
+    quaternion component as the pivot, and the others are taken from sums and differences of the
+    off-diagonal elements divided by it, which stays accurate for rotations of up to half a turn.
+
+    :param C: :math:`\mathrm{3x3}` or :math:`\mathrm{...x3x3}` direction cosine matrix
+    :type C: np.ndarray
+
+    :return: :math:`\mathrm{4}` or :math:`\mathrm{...x4}` quaternion
+    :rtype: np.ndarray
+    """
+    pivots = np.stack((np.trace(C, axis1=-2, axis2=-1), C[..., 0, 0], C[..., 1, 1], C[..., 2, 2]), axis=-1)
+    pivot = np.argmax(pivots, axis=-1)
+
+    q = np.empty((*C.shape[:-2], 4), C.dtype)
+    for k in range(4):
+        selected = pivot == k
+        if selected.any():
+            q[selected] = _shepperd(C[selected], k)
+
+    q[q[..., 0] < 0.0] *= -1.0
+    return normalize(q)
+
+
+def multiply(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    r"""
+    Hamilton product :math:`p \otimes q`, broadcasting over leading axes.
+
+    :param p: :math:`\mathrm{4}` or :math:`\mathrm{...x4}` left quaternion.
+    :type p: np.ndarray
+
+    :param q: :math:`\mathrm{4}` or :math:`\mathrm{...x4}` right quaternion.
+    :type q: np.ndarray
+
+    :return: :math:`\mathrm{...x4}` quaternion product.
+    :rtype: np.ndarray
+    """
+    pw, px, py, pz = (p[..., i] for i in range(4))
+    qw, qx, qy, qz = (q[..., i] for i in range(4))
+
+    r = np.empty(np.broadcast_shapes(p.shape, q.shape), np.result_type(p, q))
+    r[..., 0] = pw * qw - px * qx - py * qy - pz * qz
+    r[..., 1] = pw * qx + px * qw + py * qz - pz * qy
+    r[..., 2] = pw * qy - px * qz + py * qw + pz * qx
+    r[..., 3] = pw * qz + px * qy - py * qx + pz * qw
+    return r
+
+
+def normalize(q: np.ndarray) -> np.ndarray:
+    r"""
+    Scale quaternions to unit norm, in place.
+
+    :param q: :math:`\mathrm{4}` or :math:`\mathrm{...x4}` quaternion.
+    :type q: np.ndarray
+
+    :return: ``q``
+    :rtype: np.ndarray
+    """
+    q /= np.sqrt(np.einsum("...i,...i->...", q, q))[..., None]
+    return q
+
+
+def quaternion_to_dcm(q: np.ndarray) -> np.ndarray:
+    r"""
+    Convert a unit quaternion to a direction cosine matrix.
+
+    :param q: :math:`\mathrm{4}` or :math:`\mathrm{...x4}` quaternion.
+    :type q: np.ndarray
+
+    :return: :math:`\mathrm{3x3}` or :math:`\mathrm{...x3x3}` direction cosine matrix
+    :rtype: np.ndarray
+    """
+    w, x, y, z = (q[..., i] for i in range(4))
+    ww, xx, yy, zz = w * w, x * x, y * y, z * z
+    wx, wy, wz = w * x, w * y, w * z
+    xy, xz, yz = x * y, x * z, y * z
+
+    C = np.empty((*q.shape[:-1], 3, 3), q.dtype)
+    C[..., 0, 0] = ww + xx - yy - zz
+    C[..., 0, 1] = 2.0 * (xy - wz)
+    C[..., 0, 2] = 2.0 * (xz + wy)
+    C[..., 1, 0] = 2.0 * (xy + wz)
+    C[..., 1, 1] = ww - xx + yy - zz
+    C[..., 1, 2] = 2.0 * (yz - wx)
+    C[..., 2, 0] = 2.0 * (xz - wy)
+    C[..., 2, 1] = 2.0 * (yz + wx)
+    C[..., 2, 2] = ww - xx - yy + zz
+    return C
+
+
+def _shepperd(C: np.ndarray, k: int) -> np.ndarray:
+    """Return four times the pivot component 'k' times the quaternion of each direction cosine matrix."""
+    c00, c11, c22 = C[..., 0, 0], C[..., 1, 1], C[..., 2, 2]
+    trace = c00 + c11 + c22
+    d0, d1, d2 = C[..., 2, 1] - C[..., 1, 2], C[..., 0, 2] - C[..., 2, 0], C[..., 1, 0] - C[..., 0, 1]
+    s01, s02, s12 = C[..., 0, 1] + C[..., 1, 0], C[..., 0, 2] + C[..., 2, 0], C[..., 1, 2] + C[..., 2, 1]
+
+    rows = (
+        lambda: (1.0 + trace, d0, d1, d2),
+        lambda: (d0, 1.0 + 2.0 * c00 - trace, s01, s02),
+        lambda: (d1, s01, 1.0 + 2.0 * c11 - trace, s12),
+        lambda: (d2, s02, s12, 1.0 + 2.0 * c22 - trace),
+    )
+    return np.stack(rows[k](), axis=-1)
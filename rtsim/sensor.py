@@ -0,0 +1,248 @@
+"""
+RTSim inertial sensor models.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import validate
+from collections.abc import Iterable, Iterator
+import numpy as np
+
+BLOCK = 4096
+
+MAX_EXPONENT = 500.0
+
+SENSORS = {"gyro": "avbib", "accel": "sfbib"}
+
+
+class Sensor:
+    """
+    Error specification of a triad of gyros or accelerometers.
+
+    The scale factor, misalignment and bias are constant for each sensor instance and drawn from
+    zero mean normal distributions with the given standard deviations. The bias instability is a
+    first order Gauss-Markov process, and the white noise is given as a density so that it does not
+    depend on the sample interval.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        scale_factor: float = 0.0,
+        misalignment: float = 0.0,
+        bias: float = 0.0,
+        bias_instability: float = 0.0,
+        correlation_time: float = 100.0,
+        noise: float = 0.0,
+        quantization: float = 0.0,
+    ) -> None:
+        """
+        Initialize a sensor error specification.
+
+        :param scale_factor: Standard deviation of the scale factor error of each axis, defaults to 0.0
+        :type scale_factor: float, optional
+
+        :param misalignment: Standard deviation of the cross-axis coupling, defaults to 0.0, rad
+        :type misalignment: float, optional
+
+        :param bias: Standard deviation of the turn-on bias, defaults to 0.0, rad/s or m/s/s
+        :type bias: float, optional
+
+        :param bias_instability: Standard deviation of the Gauss-Markov bias, defaults to 0.0,
+            rad/s or m/s/s
+        :type bias_instability: float, optional
+
+        :param correlation_time: Correlation time of the Gauss-Markov bias, defaults to 100.0, s
+        :type correlation_time: float, optional
+
+        :param noise: White noise density, defaults to 0.0, rad/s/√Hz or m/s/s/√Hz
+        :type noise: float, optional
+
+        :param quantization: Size of an output increment, 0 for no quantization, defaults to 0.0,
+            rad or m/s
+        :type quantization: float, optional
+
+        :raises MinValueError: If a parameter is negative, or the correlation time is not positive.
+        """
+        for value in (scale_factor, misalignment, bias, bias_instability, noise, quantization):
+            validate.number(value, minvalue=0)
+        validate.number(correlation_time, minvalue=np.finfo(float).tiny)
+
+        self.scale_factor = scale_factor
+        self.misalignment = misalignment
+        self.bias = bias
+        self.bias_instability = bias_instability
+        self.correlation_time = correlation_time
+        self.noise = noise
+        self.quantization = quantization
+
+
+class IMU:
+    """
+    Inertial measurement unit model turning testbed outputs into gyro and accelerometer outputs.
+
+    A model holds ``count`` sensor instances, each with its own constant errors, and every error
+    is applied to all instances and time steps at once. The Gauss-Markov bias and the quantization
+    residual carry over from one call to :meth:`process` to the next, and the noise of each sensor
+    is drawn from its own generator, so a run processed in chunks, such as those of
+    :meth:`Testbed.process_iter`, gives the same outputs as the whole run processed at once.
+    """
+
+    def __init__(self, gyro: Sensor, accel: Sensor, dt: float, *, count: int = 1, seed: int = 0) -> None:
+        """
+        Initialize an IMU model and draw the constant errors of its instances.
+
+        :param gyro: Gyro error specification.
+        :type gyro: Sensor
+
+        :param accel: Accelerometer error specification.
+        :type accel: Sensor
+
+        :param dt: Sample interval, s
+        :type dt: float
+
+        :param count: Number of sensor instances, defaults to 1
+        :type count: int, optional
+
+        :param seed: Seed of the errors, defaults to 0
+        :type seed: int, optional
+
+        :raises ComponentTypeError: If 'gyro' or 'accel' is not a ``Sensor``.
+        """
+        validate.component(gyro, Sensor)
+        validate.component(accel, Sensor)
+        validate.number(dt, minvalue=np.finfo(float).tiny)
+        validate.integer(count, minvalue=1)
+        validate.integer(seed, minvalue=0)
+
+        self.sensors = {"gyro": gyro, "accel": accel}
+        self.dt = dt
+        self.count = count
+        self.seed = seed
+        self.reset()
+
+    def reset(self) -> None:
+        """Draw the constant errors again and restart the time varying errors from the start of a run."""
+        seeds = np.random.SeedSequence(self.seed).spawn(3 * len(self.sensors))
+        self._state = {
+            name: _SensorState(sensor, self.dt, self.count, *seeds[3 * k : 3 * k + 3])
+            for k, (name, sensor) in enumerate(self.sensors.items())
+        }
+
+    def process(self, avbib: np.ndarray, sfbib: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Apply the sensor errors to the next time steps of a run.
+
+        :param avbib: ``Tx3x1`` angular velocity of the body, or ``BxTx3x1`` with one realization per
+            instance, rad/s
+        :type avbib: np.ndarray
+
+        :param sfbib: ``Tx3x1`` specific force of the body, or ``BxTx3x1`` with one realization per
+            instance, m/s/s
+        :type sfbib: np.ndarray
+
+        :return: Gyro and accelerometer outputs, ``Tx3x1`` for a single instance of ``Tx3x1`` inputs
+            and ``BxTx3x1`` otherwise, rad/s and m/s/s
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        return self._state["gyro"].apply(avbib), self._state["accel"].apply(sfbib)
+
+    def process_iter(
+        self, chunks: Iterable[tuple[slice, dict[str, np.ndarray]]]
+    ) -> Iterator[tuple[slice, dict[str, np.ndarray]]]:
+        """
+        Apply the sensor errors to streamed chunks of testbed outputs, in time order.
+
+        :param chunks: Time steps and outputs of each chunk, as from :meth:`Testbed.process_iter`,
+            which must include "avbib" and "sfbib".
+        :type chunks: Iterable[tuple[slice, dict[str, np.ndarray]]]
+
+        :return: Iterator of the time steps of each chunk and its "gyro" and "accel" outputs.
+        :rtype: Iterator[tuple[slice, dict[str, np.ndarray]]]
+        """
+        for chunk, outputs in chunks:
+            yield chunk, dict(zip(SENSORS, self.process(*(outputs[name] for name in SENSORS.values())), strict=True))
+
+
+class _SensorState:
+    """Constant errors, time varying error state and noise generators of the instances of one sensor."""
+
+    def __init__(
+        self,
+        sensor: Sensor,
+        dt: float,
+        count: int,
+        *seeds: np.random.SeedSequence,
+    ) -> None:
+        """Draw the constant errors and the initial Gauss-Markov bias."""
+        constant, self.noise, self.drive = (np.random.default_rng(s) for s in seeds)
+        self.sensor = sensor
+        self.dt = dt
+
+        # Error matrix I + diag(scale factor) + off-diagonal misalignment, stored transposed for x @ K.T
+        K = np.eye(3) + sensor.misalignment * constant.standard_normal((count, 3, 3)) * (1.0 - np.eye(3))
+        K[:, range(3), range(3)] += sensor.scale_factor * constant.standard_normal((count, 3))
+        self.KT = K.transpose(0, 2, 1)
+        self.bias = sensor.bias * constant.standard_normal((count, 1, 3))
+
+        self.phi = np.exp(-dt / sensor.correlation_time)
+        self.markov = sensor.bias_instability * constant.standard_normal((count, 3))
+        self.residual = np.zeros((count, 3))
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        """Apply the errors to a ``Tx3x1`` or ``BxTx3x1`` input."""
+        sensor, count = self.sensor, self.KT.shape[0]
+        y = x[..., 0] @ self.KT
+        y += self.bias
+
+        steps = x.shape[-3]
+        if sensor.noise:
+            y += (sensor.noise / np.sqrt(self.dt)) * self._draw(self.noise, steps)
+        if sensor.bias_instability:
+            y += self._gauss_markov(steps)
+        if sensor.quantization:
+            self._quantize(y)
+
+        return y[0, ..., None] if x.ndim == validate.TIME_NDIM and count == 1 else y[..., None]
+
+    def _draw(self, rng: np.random.Generator, steps: int) -> np.ndarray:
+        """Draw standard normal samples time step first, so chunked draws equal a single draw."""
+        return rng.standard_normal((steps, self.KT.shape[0], 3)).transpose(1, 0, 2)
+
+    def _gauss_markov(self, steps: int) -> np.ndarray:
+        r"""
+        Gauss-Markov bias :math:`b_k = \phi b_{k-1} + w_k`, scanned one block of time steps at a time.
+
+        Within a block, :math:`b_k = \phi^{k+1} (b_{-1} + \sum_{j \le k} \phi^{-(j+1)} w_j)` is a
+        cumulative sum, and the block is short enough that :math:`\phi^{-(j+1)}` cannot overflow.
+        """
+        sensor, phi = self.sensor, self.phi
+        w = (sensor.bias_instability * np.sqrt(1.0 - phi * phi)) * self._draw(self.drive, steps)
+
+        block = int(np.clip(MAX_EXPONENT * sensor.correlation_time / self.dt, 1, BLOCK))
+        powers = phi ** np.arange(1, min(block, steps) + 1)[:, None]
+        for start in range(0, steps, block):
+            chunk = w[:, start : start + block]
+            p = powers[: chunk.shape[1]]
+            chunk /= p
+            np.cumsum(chunk, axis=1, out=chunk)
+            chunk += self.markov[:, None]
+            chunk *= p
+            self.markov = chunk[:, -1].copy()
+        return w
+
+    def _quantize(self, y: np.ndarray) -> None:
+        """Quantize the increments of a ``BxTx3`` output in place, carrying the residual, in counts, over."""
+        scale = self.dt / self.sensor.quantization
+        counts = np.cumsum(y, axis=1)
+        counts *= scale
+        counts += self.residual[:, None]
+        self.residual = counts[:, -1] - np.round(counts[:, -1])
+        np.round(counts, out=counts)
+        y[:, 0] = counts[:, 0]
+        np.subtract(counts[:, 1:], counts[:, :-1], out=y[:, 1:])
+        y /= scale
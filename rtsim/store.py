@@ -0,0 +1,166 @@
+"""
+RTSim out-of-core output store.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from .kernel import OUTPUTS
+from pathlib import Path
+from typing import Self
+import json
+import numpy as np
+import queue
+import threading
+
+MANIFEST = "run.json"
+
+QUEUE_DEPTH = 2
+
+
+class OutputStore:
+    """
+    Directory of memory-mapped ``.npy`` files holding the time vector and outputs of a run.
+
+    A writable store preallocates one file per output and copies each chunk handed to
+    :meth:`write` into the files from a background thread, so disk I/O overlaps with the
+    processing of the next chunk. At most ``QUEUE_DEPTH`` chunks wait to be written at any time.
+    A manifest is written by :meth:`close`, which marks the run as finished.
+    """
+
+    def __init__(self, path: str | Path, arrays: dict[str, np.ndarray], *, writable: bool) -> None:
+        """
+        Initialize an output store, use :meth:`create` or :meth:`open` instead.
+
+        :param path: Directory of the store.
+        :type path: str | Path
+
+        :param arrays: Memory-mapped arrays keyed by name.
+        :type arrays: dict[str, np.ndarray]
+
+        :param writable: Start the background writer.
+        :type writable: bool
+        """
+        self.path = Path(path)
+        self.arrays = arrays
+        self._error = None
+        self._queue = None
+        self._thread = None
+
+        if writable:
+            self._queue = queue.Queue(maxsize=QUEUE_DEPTH)
+            self._thread = threading.Thread(target=self._writer, name=f"rtsim-store-{self.path.name}", daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def create(cls, path: str | Path, time: np.ndarray) -> "OutputStore":
+        """
+        Create a store for a run and preallocate its files.
+
+        :param path: Directory of the store, created if needed.
+        :type path: str | Path
+
+        :param time: Relative time of each step, written to the store immediately.
+        :type time: np.ndarray
+
+        :return: Writable output store.
+        :rtype: OutputStore
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / MANIFEST).unlink(missing_ok=True)
+
+        arrays = {"time": np.lib.format.open_memmap(path / "time.npy", mode="w+", dtype=time.dtype, shape=time.shape)}
+        arrays["time"][...] = time
+        for name in OUTPUTS:
+            arrays[name] = np.lib.format.open_memmap(path / f"{name}.npy", mode="w+", shape=(time.size, 3, 1))
+
+        return cls(path, arrays, writable=True)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "OutputStore":
+        """
+        Reopen a finished run without reading it into memory.
+
+        :param path: Directory of the store.
+        :type path: str | Path
+
+        :raises FileNotFoundError: If the run was never finished.
+
+        :return: Read-only output store.
+        :rtype: OutputStore
+        """
+        path = Path(path)
+        manifest = json.loads((path / MANIFEST).read_text())
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in manifest["arrays"]}
+        return cls(path, arrays, writable=False)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Return a stored array by name."""
+        return self.arrays[name]
+
+    def __enter__(self) -> Self:
+        """Enter a context that closes the store on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """Close the store, leaving the run unfinished if the context raised."""
+        if exc_type is None:
+            self.close()
+        else:
+            self._stop()
+
+    def write(self, chunk: slice, outputs: dict[str, np.ndarray]) -> None:
+        """
+        Queue the outputs of a chunk of time steps to be written.
+
+        Blocks while ``QUEUE_DEPTH`` chunks are already waiting.
+
+        :param chunk: Time steps of the chunk.
+        :type chunk: slice
+
+        :param outputs: Outputs of the chunk keyed by name.
+        :type outputs: dict[str, np.ndarray]
+        """
+        self._raise_error()
+        self._queue.put((chunk, outputs))
+
+    def close(self) -> None:
+        """Wait for queued chunks, flush the files and write the manifest."""
+        if self._thread is None:
+            return
+
+        self._stop()
+        self._raise_error()
+
+        for array in self.arrays.values():
+            array.flush()
+
+        manifest = {"steps": int(self.arrays["time"].size), "arrays": list(self.arrays)}
+        (self.path / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+    def _stop(self) -> None:
+        """Wait for queued chunks and stop the background writer."""
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _writer(self) -> None:
+        """Copy queued chunks into the memory-mapped files."""
+        while (item := self._queue.get()) is not None:
+            if self._error is not None:
+                continue
+            chunk, outputs = item
+            try:
+                for name, value in outputs.items():
+                    self.arrays[name][chunk] = value
+            except Exception as error:  # noqa: BLE001
+                self._error = error
+
+    def _raise_error(self) -> None:
+        """Raise an error from the background writer in the calling thread."""
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,258 @@
+"""
+RTSim Arrow and Parquet tables.
+
+Runs are stored as one row per time step: a ``time`` column and one fixed size ``array[f64, 3]``
+column per output. A ``Tx3x1`` output is laid out like an ``Array(Float64, 3)`` column buffer, so
+tables are built from and read back into arrays without copying.
+
+Copyright © 2024, National Technology & Engineering Solutions of
+Sandia, LLC (NTESS). Under the terms of Contract DE-NA0003525 with
+NTESS, the U.S. Government retains certain rights in this software.
+"""
+
+# SPDX-License-Identifier: BSD-3-Clause
+
+from . import validate
+from .frame import Frame
+from .pva import ConstantPVA, PackedPVA
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from polars.io.plugins import register_io_source
+import numpy as np
+import polars as pl
+
+TIME = "time"
+
+VECTOR = pl.Array(pl.Float64, 3)
+
+
+def to_polars(time: np.ndarray, outputs: dict[str, np.ndarray]) -> pl.DataFrame:
+    """
+    Build a data frame of a run, sharing the buffers of contiguous arrays.
+
+    :param time: Relative time of each step.
+    :type time: np.ndarray
+
+    :param outputs: ``Tx3x1`` outputs keyed by name.
+    :type outputs: dict[str, np.ndarray]
+
+    :return: Data frame with a ``time`` column and a 3 element array column per output.
+    :rtype: pl.DataFrame
+    """
+    columns = [pl.Series(TIME, time)]
+    columns.extend(pl.Series(name, value[..., 0], dtype=VECTOR) for name, value in outputs.items())
+    return pl.DataFrame(columns)
+
+
+def to_arrow(time: np.ndarray, outputs: dict[str, np.ndarray]):
+    """
+    Build an Arrow table of a run, sharing the buffers of contiguous arrays.
+
+    Requires the optional ``pyarrow`` package, installed with the ``arrow`` extra.
+
+    :param time: Relative time of each step.
+    :type time: np.ndarray
+
+    :param outputs: ``Tx3x1`` outputs keyed by name.
+    :type outputs: dict[str, np.ndarray]
+
+    :return: Arrow table with a ``time`` column and a fixed size list column per output.
+    :rtype: pyarrow.Table
+    """
+    return to_polars(time, outputs).to_arrow()
+
+
+def write_parquet(
+    path: str | Path, time: np.ndarray, outputs: dict[str, np.ndarray], *, row_group_size: int | None = None
+) -> None:
+    """
+    Write a run to a Parquet file.
+
+    :param path: Parquet file.
+    :type path: str | Path
+
+    :param time: Relative time of each step.
+    :type time: np.ndarray
+
+    :param outputs: ``Tx3x1`` outputs keyed by name.
+    :type outputs: dict[str, np.ndarray]
+
+    :param row_group_size: Number of time steps per row group, defaults to the Polars default
+    :type row_group_size: int, optional
+    """
+    to_polars(time, outputs).write_parquet(path, row_group_size=row_group_size)
+
+
+def sink_parquet(
+    path: str | Path,
+    time: np.ndarray,
+    chunks: Iterable[tuple[slice, dict[str, np.ndarray]]],
+    names: tuple[str, ...],
+    *,
+    row_group_size: int | None = None,
+) -> None:
+    """
+    Stream chunks of a run to a Parquet file, holding only the chunk being written in memory.
+
+    :param path: Parquet file.
+    :type path: str | Path
+
+    :param time: Relative time of each step.
+    :type time: np.ndarray
+
+    :param chunks: Time steps and outputs of each chunk, in order, as from :meth:`Testbed.process_iter`.
+    :type chunks: Iterable[tuple[slice, dict[str, np.ndarray]]]
+
+    :param names: Names of the outputs of every chunk.
+    :type names: tuple[str, ...]
+
+    :param row_group_size: Number of time steps per row group, set to the chunk size to match the
+        streaming mode, defaults to the Polars default
+    :type row_group_size: int, optional
+    """
+    _scan_chunks(time, chunks, names).sink_parquet(path, row_group_size=row_group_size)
+
+
+def _scan_chunks(
+    time: np.ndarray, chunks: Iterable[tuple[slice, dict[str, np.ndarray]]], names: tuple[str, ...]
+) -> pl.LazyFrame:
+    """
+    Lazy frame of chunks of a run, evaluated as they are read.
+
+    The source applies the column selection, filter and row limit Polars pushes down to it, one chunk
+    at a time. Polars IO plugins are unstable, hence the upper bound on the Polars version.
+    """
+    schema = {TIME: pl.Series(TIME, time[:0]).dtype} | dict.fromkeys(names, VECTOR)
+
+    def source(with_columns, predicate, n_rows, batch_size) -> Iterator[pl.DataFrame]:
+        for chunk, outputs in chunks:
+            frame = to_polars(time[chunk], {name: outputs[name] for name in names})
+            if predicate is not None:
+                frame = frame.filter(predicate)
+            if with_columns is not None:
+                frame = frame.select(with_columns)
+            if n_rows is not None:
+                frame = frame.head(n_rows)
+                n_rows -= frame.height
+            yield frame
+            if n_rows == 0:
+                return
+
+    return register_io_source(source, schema=schema)
+
+
+def read_rotations(
+    path: str | Path, columns: list[tuple[str, str, str]], *, axis: int = 2, time: str = TIME
+) -> tuple[np.ndarray, list[Frame]]:
+    """
+    Read the rotating coordinate frame of each testbed axis from a Parquet file.
+
+    Only the listed columns are read. See :func:`iter_rotations` for the column layout.
+
+    :param path: Parquet file, or glob of Parquet files.
+    :type path: str | Path
+
+    :param columns: Angle, rate and acceleration columns of each axis.
+    :type columns: list[tuple[str, str, str]]
+
+    :param axis: Index of the rotation axis of scalar columns, defaults to 2
+    :type axis: int, optional
+
+    :param time: Name of the time column, defaults to ``TIME``
+    :type time: str, optional
+
+    :return: Time of each step and rotating frame of each axis.
+    :rtype: tuple[np.ndarray, list[Frame[Rotating]]]
+    """
+    validate.option(axis, (0, 1, 2))
+    return _rotations(_scan(path, columns, time).collect(), columns, axis, time)
+
+
+def iter_rotations(
+    path: str | Path, columns: list[tuple[str, str, str]], *, chunk_size: int, axis: int = 2, time: str = TIME
+) -> Iterator[tuple[slice, np.ndarray, list[Frame]]]:
+    """
+    Read the rotating coordinate frame of each testbed axis from a Parquet file, one chunk at a time.
+
+    Each axis is given by the names of its angle, rate and acceleration columns. A scalar column
+    holds the component about ``axis``, and a 3 element array column holds the whole vector. Only
+    the listed columns and the row groups of the current chunk are read, from a memory map of a
+    local file.
+
+    :param path: Parquet file, or glob of Parquet files.
+    :type path: str | Path
+
+    :param columns: Angle, rate and acceleration columns of each axis.
+    :type columns: list[tuple[str, str, str]]
+
+    :param chunk_size: Number of time steps per chunk.
+    :type chunk_size: int
+
+    :param axis: Index of the rotation axis of scalar columns, defaults to 2
+    :type axis: int, optional
+
+    :param time: Name of the time column, defaults to ``TIME``
+    :type time: str, optional
+
+    :return: Iterator of the time steps, time and rotating frame of each axis of each chunk.
+    :rtype: Iterator[tuple[slice, np.ndarray, list[Frame[Rotating]]]]
+    """
+    validate.integer(chunk_size, minvalue=1)
+    validate.option(axis, (0, 1, 2))
+    scan = _scan(path, columns, time)
+    steps = scan.select(pl.len()).collect().item()
+
+    for start in range(0, steps, chunk_size):
+        chunk = slice(start, min(start + chunk_size, steps))
+        yield chunk, *_rotations(scan.slice(start, chunk_size).collect(), columns, axis, time)
+
+
+def rotations(
+    block: dict[str, np.ndarray], columns: list[tuple[str, str, str]], *, axis: int = 2, scale: float = 1.0
+) -> list[Frame]:
+    """
+    Build the rotating coordinate frame of each testbed axis from columns of time steps.
+
+    Each column is copied, and scaled, once into the buffer of a :class:`PackedPVA`, so columns may
+    be strided views of a memory map.
+
+    :param block: Columns keyed by name, ``T`` arrays for the component about ``axis`` or ``Tx3``
+        arrays for the whole vector.
+    :type block: dict[str, np.ndarray]
+
+    :param columns: Angle, rate and acceleration column names of each axis.
+    :type columns: list[tuple[str, str, str]]
+
+    :param axis: Index of the rotation axis of ``T`` columns, defaults to 2
+    :type axis: int, optional
+
+    :param scale: Factor converting the columns to rad, rad/s and rad/s/s, defaults to 1.0
+    :type scale: float, optional
+
+    :return: Rotating frame of each axis.
+    :rtype: list[Frame[Rotating]]
+    """
+    steps = len(block[columns[0][0]]) if columns else 0
+    zero = np.zeros((3, 1))
+    frames = []
+    for names in columns:
+        angular = PackedPVA.zeros(steps)
+        for k, name in enumerate(names):
+            column = block[name]
+            out = angular.buffer[k, :, :, 0] if column.ndim > 1 else angular.buffer[k, :, axis, 0]
+            np.multiply(column, scale, out=out)
+        frames.append(Frame(ConstantPVA(p=zero, v=zero, a=zero), angular))
+    return frames
+
+
+def _scan(path: str | Path, columns: list[tuple[str, str, str]], time: str) -> pl.LazyFrame:
+    """Scan the time and rotation columns of a Parquet file."""
+    return pl.scan_parquet(path).select(time, *(name for names in columns for name in names))
+
+
+def _rotations(
+    frame: pl.DataFrame, columns: list[tuple[str, str, str]], axis: int, time: str
+) -> tuple[np.ndarray, list[Frame]]:
+    """Build the rotating frame of each axis from the columns of a data frame."""
+    block = {name: frame.get_column(name).to_numpy() for names in columns for name in names}
+    return frame.get_column(time).to_numpy(), rotations(block, columns, axis=axis)
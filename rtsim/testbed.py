@@ -8,24 +8,37 @@ NTESS, the U.S. Government retains certain rights in this software.
 
 # SPDX-License-Identifier: BSD-3-Clause
 
+from . import kernel, profiling
 from .axis import Axis
 from .base import Base
 from .body import Body
+from .cache import PrefixCache, frame_key
 from .exceptions import AxisCountError
-from .pva import ConstantPVA
+from .pva import BatchPVA, ConstantPVA
 from .frame import Frame
 from .mount import Mount
-from .world import World
+from .plan import Plan
+from .plotting import unit_modifier  # noqa: F401
+from .store import OutputStore
+from .world import EarthRotation, World
 from . import validate
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from math import tau
-import matplotlib.pyplot as plt
+from pathlib import Path
+from typing import TYPE_CHECKING
 import numpy as np
 
-plt.rc("text", usetex=True)
-plt.rc(
-    "text.latex",
-    preamble="\n".join([r"\usepackage{siunitx}", r"\usepackage{amsmath}", r"\DeclareSIUnit{\gravity}{\textsl{g}}"]),
-)
+if TYPE_CHECKING:
+    import polars as pl
+    import pyarrow
+
+CHUNK_SIZE = 65536
+
+SHARD_SIZE = 16384
+
+CACHE_SIZE = 0
 
 
 class Testbed(Base):
@@ -56,6 +69,8 @@ class Testbed(Base):
 
         self.world, self.axes, self.mount, self.body = components
 
+        self._prefix = PrefixCache(CACHE_SIZE)
+
         phi = np.radians(self._lat)
         lam = np.radians(self._lon)
         sin_phi = np.sin(phi)
@@ -165,10 +180,49 @@ class Testbed(Base):
         validate.component(obj, Body)
         self._body = obj
 
-    def process(self, time: np.ndarray, misalignments: dict[int, Frame], rotations: dict[int, Frame]) -> None:
+    @property
+    def cache_size(self):
+        """
+        Memory cap, in bytes, of the per-axis state cached by the reference method of :meth:`process`.
+
+        The state after each axis is cached together with the frames it was evaluated from. Processing
+        again with the same frames for the leading axes, for example after replacing only the rotation of
+        an inner axis, resumes from the cached state and only evaluates the downstream axes. Frames are
+        matched by identity, so a changed input must be a new frame rather than a frame modified in place.
+        The cache is opt-in: ``CACHE_SIZE`` is 0, and setting 0 disables it again. Each cached axis holds
+        up to 15 doubles per time step.
+        """
+        return self._prefix.size
+
+    @cache_size.setter
+    def cache_size(self, value):
+        self._prefix.resize(value)
+
+    def process(  # noqa: PLR0913
+        self,
+        time: np.ndarray,
+        misalignments: dict[int, Frame],
+        rotations: dict[int, Frame],
+        *,
+        method: str = "reference",
+        workers: int | None = None,
+        outputs: tuple[str, ...] | None = None,
+        precision: str = "float64",
+    ) -> None:
         """
         Process testbed inputs into body inputs.
 
+        The requested outputs are stored on the testbed. The other outputs are evaluated from the same
+        inputs the first time they are accessed, and then stored as well. The inputs are referenced, not
+        copied, so they must not be modified in place while outputs are pending. The intermediates the
+        pending outputs share, the state after the last axis, the body attitude chain and the inertial
+        outputs, are kept until no pending output needs them.
+
+        The largest absolute error of each stored output against the double precision evaluation is stored
+        in ``precision_error``. Every time step is evaluated again in double precision, ``CHUNK_SIZE`` steps
+        at a time, so the error bounds the whole output, at the cost of a second, double precision, run.
+        It is zero for the "float64" precision.
+
         :param time: Relative time of each step.
         :type time: np.ndarray
 
@@ -177,55 +231,612 @@ class Testbed(Base):
 
         :param rotations: Rotating coordinate frame of each testbed axis.
         :type rotations: list[Frame[Rotating]]
+
+        :param method: Evaluation method, "reference", "fused" or "quaternion", defaults to "reference".
+            The fused method evaluates the same equations in a single pass with cross products and
+            preallocated buffers. The quaternion method is the fused method composing the body attitude
+            chain with quaternions, converted to a direction cosine matrix once.
+        :type method: str, optional
+
+        :param workers: Number of threads evaluating shards of ``SHARD_SIZE`` time steps into shared output
+            arrays, defaults to evaluating all time steps at once in the calling thread. The full length world
+            frame is only stored by the reference method without sharding, the other methods apply the
+            rotation of the world in closed form.
+        :type workers: int, optional
+
+        :param outputs: Names of the outputs to evaluate now, such as ``("sfbib", "avbib")``, defaults to
+            all of ``OUTPUTS``. Only the intermediates of the requested outputs are evaluated.
+        :type outputs: tuple[str, ...], optional
+
+        :param precision: Precision policy of the fused and quaternion methods, "float64", "float32" or
+            "mixed", defaults to "float64". The "float32" precision evaluates and stores every output in
+            single precision, halving the memory of the outputs and of the intermediates. The "mixed"
+            precision evaluates the earth rate and position terms in double precision, and the axes and
+            body attitude chain in single precision, and stores the outputs in single precision.
+        :type precision: str, optional
+
+        :raises AxisCountError: If the number of misalignments or rotations does not match the axes.
+        :raises OptionError: If 'method' is not a known evaluation method, an output name is not known,
+            or 'precision' is not a known precision policy of the method.
         """
-        if len(misalignments) != len(self._axes):
-            raise AxisCountError(len(self._axes), "misalignment")
-        if len(rotations) != len(self._axes):
-            raise AxisCountError(len(self._axes), "rotations")
+        outputs = self._check_inputs(misalignments, rotations, method, outputs)
+        validate.option(precision, kernel.PRECISIONS if method != "reference" else kernel.PRECISIONS[:1])
+        if workers is not None:
+            validate.integer(workers, minvalue=1)
 
         self.time = time
-        self.world.process(self.time)
 
-        alpha = ConstantPVA(
-            p=self.mount.frame.linear.p + self.mount.frame.C @ self.body.frame.linear.p,
-            v=np.zeros((3, 1)),
-            a=np.zeros((3, 1)),
+        with profiling.stage("Testbed.process", method=method, steps=time.size, axes=len(self.axes)):
+            if workers is None:
+                with profiling.stage("World.process"):
+                    if method == "reference":
+                        self.world.process(self.time)
+                        world = self.world.frame
+                    else:
+                        world = self._world_at(time, method)
+                results = self._evaluate(
+                    world, misalignments, rotations, method, outputs, cache=True, precision=precision
+                )
+            else:
+                results = self._process_sharded(
+                    time, misalignments, rotations, method, workers, outputs=outputs, precision=precision
+                )
+
+            for axis, mu, rho in zip(self.axes, misalignments, rotations, strict=True):
+                axis.mu, axis.rho = mu, rho
+
+            inputs = (time, misalignments, rotations, method, precision)
+            self.precision_error = {}
+            self._store(results, inputs)
+            with profiling.stage("precision error"):
+                self._measure_error(results, inputs)
+
+    def __getattr__(self, name: str):
+        """Evaluate and store an output left pending by :meth:`process` on first access."""
+        pending = self.__dict__.get("_pending")
+        if name not in kernel.OUTPUTS or pending is None:
+            msg = f"'{type(self).__name__}' object has no attribute '{name}'"
+            raise AttributeError(msg)
+
+        run, inputs = pending
+        results = run.evaluate((name,))
+        value = results[name]
+        setattr(self, name, value)
+        self._measure_error(results, inputs)
+
+        if not run.pending:
+            self._pending = None
+
+        return value
+
+    def _world_at(self, time: np.ndarray, method: str, *, cache: bool = False) -> Frame | EarthRotation:
+        """World frame for the reference method, and its closed form rotation for the kernel methods."""
+        if method == "reference":
+            return self.world.frame_at(time, cache=cache)
+        return self.world.rotation_at(time)
+
+    def _measure_error(self, results: dict[str, np.ndarray], inputs: tuple) -> None:
+        """Store the largest error of each result over all steps against the double precision evaluation."""
+        time, misalignments, rotations, method, precision = inputs
+        self.precision_error.update(dict.fromkeys(results, 0.0))
+        if precision == "float64":
+            return
+
+        for start in range(0, time.size, CHUNK_SIZE):
+            chunk = slice(start, start + CHUNK_SIZE)
+            reference = self._evaluate_chunk(time, misalignments, rotations, chunk, method, outputs=tuple(results))
+            for name, value in results.items():
+                error = float(np.max(np.abs(value[chunk] - reference[name]), initial=0.0))
+                self.precision_error[name] = max(self.precision_error[name], error)
+
+    def _store(self, outputs: dict[str, np.ndarray], inputs: tuple | None = None) -> None:
+        """Replace the outputs of a previous run, leaving the missing outputs pending on 'inputs'."""
+        for name in kernel.OUTPUTS:
+            self.__dict__.pop(name, None)
+        for name, value in outputs.items():
+            setattr(self, name, value)
+
+        self._pending = None
+        if len(outputs) < len(kernel.OUTPUTS):
+            pending = [name for name in kernel.OUTPUTS if name not in outputs]
+            self._pending = (_Run(partial(self._stages, *inputs), pending), inputs)
+
+    def compile(self, *, method: str = "fused") -> Plan:
+        """
+        Compile the geometry of the testbed into a frozen evaluation plan.
+
+        The plan precomputes every quantity that does not depend on the inputs, so evaluating it
+        repeatedly with :meth:`Plan.process` only costs the time varying math. The outputs are
+        returned rather than stored on the testbed.
+
+        :param method: Evaluation method of the plan, "fused" or "quaternion", defaults to "fused"
+        :type method: str, optional
+
+        :raises OptionError: If 'method' is not a compiled evaluation method.
+
+        :return: Evaluation plan.
+        :rtype: Plan
+        """
+        validate.option(method, kernel.METHODS[1:])
+        return Plan(self, attitude="quaternion" if method == "quaternion" else "dcm")
+
+    def diagnose(self, time: np.ndarray, misalignments: dict[int, Frame], rotations: dict[int, Frame], **kwargs):
+        """
+        Process testbed inputs as :meth:`process` does, and report the memory used by each stage.
+
+        The inputs are checked for arrays that force copies or conversions, the memory of the run is
+        estimated beforehand, and the bytes allocated by each stage and the high-water mark of the run
+        are traced with ``tracemalloc``, which slows the run down.
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param misalignments: Misalignment coordinate frame of each testbed axis.
+        :type misalignments: list[Frame[Full]]
+
+        :param rotations: Rotating coordinate frame of each testbed axis.
+        :type rotations: list[Frame[Rotating]]
+
+        :param kwargs: Other arguments of :meth:`process`.
+
+        :return: Findings on the inputs, memory of each stage, high-water mark and estimate.
+        :rtype: rtsim.diagnostics.Report
+        """
+        from . import diagnostics  # noqa: PLC0415
+
+        return diagnostics.diagnose(self, time, misalignments, rotations, **kwargs)
+
+    def _process_sharded(  # noqa: PLR0913
+        self, time, misalignments, rotations, method, workers, *, outputs=kernel.OUTPUTS, precision="float64"
+    ) -> dict[str, np.ndarray]:
+        """Evaluate shards of time steps on a thread pool, writing into shared output arrays."""
+        dtype = np.float64 if precision == "float64" else np.float32
+        results = {name: np.empty((time.size, 3, 1), dtype) for name in outputs}
+        if not outputs:
+            return results
+
+        def evaluate(shard: slice) -> None:
+            with profiling.stage("shard", start=shard.start):
+                chunk = self._evaluate_chunk(
+                    time, misalignments, rotations, shard, method, outputs=outputs, precision=precision
+                )
+            for name, value in chunk.items():
+                results[name][shard] = value
+
+        shards = [slice(start, start + SHARD_SIZE) for start in range(0, time.size, SHARD_SIZE)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(evaluate, shards):
+                pass
+
+        return results
+
+    def process_iter(  # noqa: PLR0913
+        self,
+        time: np.ndarray,
+        misalignments: dict[int, Frame],
+        rotations: dict[int, Frame],
+        *,
+        chunk_size: int = CHUNK_SIZE,
+        method: str = "reference",
+        outputs: tuple[str, ...] | None = None,
+    ) -> Iterator[tuple[slice, dict[str, np.ndarray]]]:
+        """
+        Process testbed inputs into body inputs, one chunk of time steps at a time.
+
+        Every output depends only on its own time step, so the inputs are sliced into chunks
+        and each chunk is processed independently. World, axis and body chain matrices are only
+        built for the current chunk, so peak memory is set by 'chunk_size' rather than by the
+        length of the scenario. The processed results are not stored on the testbed.
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param misalignments: Misalignment coordinate frame of each testbed axis.
+        :type misalignments: list[Frame[Full]]
+
+        :param rotations: Rotating coordinate frame of each testbed axis.
+        :type rotations: list[Frame[Rotating]]
+
+        :param chunk_size: Number of time steps per chunk, defaults to ``CHUNK_SIZE``
+        :type chunk_size: int, optional
+
+        :param method: Evaluation method, "reference", "fused" or "quaternion", defaults to "reference"
+        :type method: str, optional
+
+        :param outputs: Names of the outputs to evaluate, defaults to all of ``OUTPUTS``
+        :type outputs: tuple[str, ...], optional
+
+        :raises AxisCountError: If the number of misalignments or rotations does not match the axes.
+        :raises OptionError: If 'method' is not a known evaluation method, or an output name is not known.
+
+        :return: Iterator of the time steps of each chunk and the outputs of that chunk, keyed by name.
+        :rtype: Iterator[tuple[slice, dict[str, np.ndarray]]]
+        """
+        outputs = self._check_inputs(misalignments, rotations, method, outputs)
+        validate.integer(chunk_size, minvalue=1)
+
+        return self._iter_chunks(time, misalignments, rotations, chunk_size, method, outputs=outputs)
+
+    def process_chunks(
+        self,
+        chunks: Iterable[tuple[slice, np.ndarray, list[Frame]]],
+        misalignments: dict[int, Frame],
+        *,
+        method: str = "reference",
+        outputs: tuple[str, ...] | None = None,
+    ) -> Iterator[tuple[slice, dict[str, np.ndarray]]]:
+        """
+        Process testbed inputs into body inputs from streamed chunks of rotations.
+
+        Unlike :meth:`process_iter`, the time vector and rotations are never held in full: each chunk
+        brings its own, such as those read by :meth:`EncoderLog.chunks`. Misalignments span the
+        whole run and are sliced to each chunk. The processed results are not stored on the testbed.
+
+        :param chunks: Time steps, time and rotating frame of each testbed axis of each chunk.
+        :type chunks: Iterable[tuple[slice, np.ndarray, list[Frame[Rotating]]]]
+
+        :param misalignments: Misalignment coordinate frame of each testbed axis.
+        :type misalignments: list[Frame[Full]]
+
+        :param method: Evaluation method, "reference", "fused" or "quaternion", defaults to "reference"
+        :type method: str, optional
+
+        :param outputs: Names of the outputs to evaluate, defaults to all of ``OUTPUTS``
+        :type outputs: tuple[str, ...], optional
+
+        :raises AxisCountError: If the number of misalignments or rotations does not match the axes.
+        :raises OptionError: If 'method' is not a known evaluation method, or an output name is not known.
+
+        :return: Iterator of the time steps of each chunk and the outputs of that chunk, keyed by name.
+        :rtype: Iterator[tuple[slice, dict[str, np.ndarray]]]
+        """
+        outputs = self._check_inputs(misalignments, None, method, outputs)
+
+        return self._iter_streamed(chunks, misalignments, method, outputs)
+
+    def process_to(  # noqa: PLR0913
+        self,
+        path: str | Path,
+        time: np.ndarray,
+        misalignments: dict[int, Frame],
+        rotations: dict[int, Frame],
+        *,
+        chunk_size: int = CHUNK_SIZE,
+        method: str = "reference",
+    ) -> OutputStore:
+        """
+        Process testbed inputs into body inputs, writing the outputs to memory-mapped files.
+
+        Chunks from :meth:`process_iter` are written to an :class:`OutputStore` by a background
+        thread while the next chunk is processed. The time vector and outputs of the testbed are
+        set to read-only memory maps of the finished run.
+
+        :param path: Directory of the output store.
+        :type path: str | Path
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param misalignments: Misalignment coordinate frame of each testbed axis.
+        :type misalignments: list[Frame[Full]]
+
+        :param rotations: Rotating coordinate frame of each testbed axis.
+        :type rotations: list[Frame[Rotating]]
+
+        :param chunk_size: Number of time steps per chunk, defaults to ``CHUNK_SIZE``
+        :type chunk_size: int, optional
+
+        :param method: Evaluation method, "reference", "fused" or "quaternion", defaults to "reference"
+        :type method: str, optional
+
+        :return: Read-only output store of the finished run.
+        :rtype: OutputStore
+        """
+        chunks = self.process_iter(time, misalignments, rotations, chunk_size=chunk_size, method=method)
+
+        with OutputStore.create(path, time) as store:
+            for chunk, outputs in chunks:
+                store.write(chunk, outputs)
+
+        store = OutputStore.open(path)
+        self.time = store["time"]
+        self._store({name: store[name] for name in kernel.OUTPUTS})
+        self.precision_error = dict.fromkeys(kernel.OUTPUTS, 0.0)
+
+        return store
+
+    def process_to_parquet(  # noqa: PLR0913
+        self,
+        path: str | Path,
+        time: np.ndarray,
+        misalignments: dict[int, Frame],
+        rotations: dict[int, Frame],
+        *,
+        chunk_size: int = CHUNK_SIZE,
+        method: str = "reference",
+        outputs: tuple[str, ...] | None = None,
+    ) -> None:
+        """
+        Process testbed inputs into body inputs, streaming the outputs to a Parquet file.
+
+        Chunks from :meth:`process_iter` are written as they are processed, one row group per chunk,
+        so memory is bounded by 'chunk_size'. The processed results are not stored on the testbed.
+
+        :param path: Parquet file.
+        :type path: str | Path
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param misalignments: Misalignment coordinate frame of each testbed axis.
+        :type misalignments: list[Frame[Full]]
+
+        :param rotations: Rotating coordinate frame of each testbed axis.
+        :type rotations: list[Frame[Rotating]]
+
+        :param chunk_size: Number of time steps per chunk and row group, defaults to ``CHUNK_SIZE``
+        :type chunk_size: int, optional
+
+        :param method: Evaluation method, "reference", "fused" or "quaternion", defaults to "reference"
+        :type method: str, optional
+
+        :param outputs: Names of the outputs to write, defaults to all of ``OUTPUTS``
+        :type outputs: tuple[str, ...], optional
+        """
+        from . import table  # noqa: PLC0415
+
+        outputs = self._check_inputs(misalignments, rotations, method, outputs)
+        chunks = self.process_iter(
+            time, misalignments, rotations, chunk_size=chunk_size, method=method, outputs=outputs
         )
+        table.sink_parquet(path, time, chunks, outputs, row_group_size=chunk_size)
 
-        omega = ConstantPVA(p=np.zeros((3, 1)), v=np.zeros((3, 1)), a=np.zeros((3, 1)))
+    def to_polars(self, outputs: tuple[str, ...] | None = None) -> "pl.DataFrame":
+        """
+        Build a data frame of the processed outputs, sharing their buffers where they are contiguous.
+
+        :param outputs: Names of the outputs, defaults to all of ``OUTPUTS``
+        :type outputs: tuple[str, ...], optional
+
+        :raises OptionError: If an output name is not known.
+
+        :return: Data frame with a ``time`` column and a 3 element array column per output.
+        :rtype: pl.DataFrame
+        """
+        from . import table  # noqa: PLC0415
 
-        Cib = self.mount.frame.C @ self.body.frame.C
+        outputs = kernel.OUTPUTS if outputs is None else outputs
+        for name in outputs:
+            validate.option(name, kernel.OUTPUTS)
+        return table.to_polars(self.time, {name: getattr(self, name) for name in outputs})
+
+    def to_arrow(self, outputs: tuple[str, ...] | None = None) -> "pyarrow.Table":
+        """
+        Build an Arrow table of the processed outputs, sharing their buffers where they are contiguous.
+
+        Requires the optional ``pyarrow`` package, installed with the ``arrow`` extra.
+
+        :param outputs: Names of the outputs, defaults to all of ``OUTPUTS``
+        :type outputs: tuple[str, ...], optional
+
+        :raises OptionError: If an output name is not known.
+
+        :return: Arrow table with a ``time`` column and a fixed size list column per output.
+        :rtype: pyarrow.Table
+        """
+        return self.to_polars(outputs).to_arrow()
+
+    def write_parquet(
+        self, path: str | Path, *, outputs: tuple[str, ...] | None = None, row_group_size: int = CHUNK_SIZE
+    ) -> None:
+        """
+        Write the processed outputs to a Parquet file.
 
-        for a in range(len(self.axes)):
-            alpha, omega = self.axes[a].process(misalignments[a], rotations[a], alpha, omega)
-            Cib = self.axes[a].zeta.C @ self.axes[a].mu.C @ self.axes[a].rho.C @ Cib
+        :param path: Parquet file.
+        :type path: str | Path
 
-        Cin = self.world.frame.C @ self.nav.C
-        Cib = Cin @ Cib
+        :param outputs: Names of the outputs, defaults to all of ``OUTPUTS``
+        :type outputs: tuple[str, ...], optional
 
-        self.aaiib = self.world.frame.Omega @ Cin @ omega.v + Cin @ omega.a
-        self.aviib = self.world.frame.angular.v + Cin @ omega.v
+        :param row_group_size: Number of time steps per row group, defaults to ``CHUNK_SIZE``
+        :type row_group_size: int, optional
 
-        self.laiib = (
-            self.world.frame.Omega @ self.world.frame.Omega @ self.world.frame.C @ self.nav.linear.p
-            + self.world.frame.Omega @ self.world.frame.Omega @ Cin @ alpha.p
-            + 2 * self.world.frame.Omega @ Cin @ alpha.v
-            + Cin @ alpha.a
+        :raises OptionError: If an output name is not known.
+        """
+        self.to_polars(outputs).write_parquet(path, row_group_size=row_group_size)
+
+    def _iter_chunks(self, time, misalignments, rotations, chunk_size, method, *, outputs=kernel.OUTPUTS):  # noqa: PLR0913
+        """Yield the outputs of each chunk of time steps."""
+        for start in range(0, time.size, chunk_size):
+            chunk = slice(start, min(start + chunk_size, time.size))
+            yield chunk, self._evaluate_chunk(time, misalignments, rotations, chunk, method, outputs=outputs)
+
+    def _iter_streamed(self, chunks, misalignments, method, outputs):
+        """Yield the outputs of each streamed chunk of time steps."""
+        for chunk, time, rotations in chunks:
+            self._check_inputs(misalignments, rotations, method)
+            world = self._world_at(time, method)
+            yield chunk, self._evaluate(world, [m.slice(chunk) for m in misalignments], rotations, method, outputs)
+
+    def _evaluate_chunk(  # noqa: PLR0913
+        self, time, misalignments, rotations, chunk, method, *, outputs=kernel.OUTPUTS, precision="float64"
+    ) -> dict[str, np.ndarray]:
+        """Evaluate the outputs for a range of time steps."""
+        return self._evaluate(
+            self._world_at(time[chunk], method),
+            [frame.slice(chunk) for frame in misalignments],
+            [frame.slice(chunk) for frame in rotations],
+            method,
+            outputs,
+            precision=precision,
         )
 
-        self.sfiib = self.laiib + Cin @ np.array([[0.0], [0.0], [-self.g]])
+    def process_batch(  # noqa: PLR0913
+        self,
+        time: np.ndarray,
+        misalignments: list[list[Frame]],
+        rotations: dict[int, Frame],
+        *,
+        mounts: list[Mount] | None = None,
+        bodies: list[Body] | None = None,
+        batch_size: int | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Process a batch of misalignment realizations against one rotation history.
+
+        The world frame, the rotation matrices of each axis and the navigation frame are computed
+        once and broadcast against every realization with the fused kernel. The results are not
+        stored on the testbed.
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param misalignments: Misalignment coordinate frames of each testbed axis, one set per realization.
+        :type misalignments: list[list[Frame[Full]]]
+
+        :param rotations: Rotating coordinate frame of each testbed axis, shared by all realizations.
+        :type rotations: list[Frame[Rotating]]
+
+        :param mounts: Mount of each realization, defaults to the testbed mount
+        :type mounts: list[Mount], optional
+
+        :param bodies: Body of each realization, defaults to the testbed body
+        :type bodies: list[Body], optional
+
+        :param batch_size: Number of realizations evaluated together, which bounds the memory used by
+            intermediate results, defaults to all of them
+        :type batch_size: int, optional
+
+        :return: ``BxTx3x1`` outputs keyed by name.
+        :rtype: dict[str, np.ndarray]
+        """
+        count = len(misalignments)
+        batch_size = count if batch_size is None else batch_size
+        chunks = self.process_batch_iter(
+            time, misalignments, rotations, mounts=mounts, bodies=bodies, batch_size=batch_size
+        )
+
+        results = {name: np.empty((count, time.size, 3, 1)) for name in kernel.OUTPUTS}
+        for batch, outputs in chunks:
+            for name, value in outputs.items():
+                results[name][batch] = value
+
+        return results
+
+    def process_batch_iter(  # noqa: PLR0913
+        self,
+        time: np.ndarray,
+        misalignments: list[list[Frame]],
+        rotations: dict[int, Frame],
+        *,
+        mounts: list[Mount] | None = None,
+        bodies: list[Body] | None = None,
+        batch_size: int = 1,
+    ) -> Iterator[tuple[slice, dict[str, np.ndarray]]]:
+        """
+        Process a batch of misalignment realizations, one sub-batch of realizations at a time.
+
+        See :meth:`process_batch` for the parameters.
 
-        Cbi = np.transpose(Cib, (0, 2, 1))
+        :raises AxisCountError: If a realization does not have one misalignment per axis.
+        :raises ComponentTypeError: If a mount or body is of the wrong type.
 
-        self.avbib = Cbi @ self.aviib
-        self.aabib = Cbi @ self.aaiib
-        self.labib = Cbi @ self.laiib
-        self.sfbib = Cbi @ self.sfiib
+        :return: Iterator of the realizations of each sub-batch and the ``bxTx3x1`` outputs of that sub-batch.
+        :rtype: Iterator[tuple[slice, dict[str, np.ndarray]]]
+        """
+        for realization in misalignments:
+            self._check_inputs(realization, rotations, "fused")
+        for mount in mounts or []:
+            validate.component(mount, Mount)
+        for body in bodies or []:
+            validate.component(body, Body)
+        validate.integer(batch_size, minvalue=1)
+
+        return self._iter_batches(time, misalignments, rotations, batch_size, mounts=mounts, bodies=bodies)
+
+    def _iter_batches(self, time, misalignments, rotations, batch_size, *, mounts, bodies):  # noqa: PLR0913
+        """Yield the outputs of each sub-batch of realizations."""
+        world = self.world.rotation_at(time)
+
+        for start in range(0, len(misalignments), batch_size):
+            batch = slice(start, min(start + batch_size, len(misalignments)))
+            stacked = [
+                Frame(
+                    BatchPVA.stack([realization[a].linear for realization in misalignments[batch]]),
+                    BatchPVA.stack([realization[a].angular for realization in misalignments[batch]]),
+                )
+                for a in range(len(self.axes))
+            ]
+            platform = self._platform(
+                None if mounts is None else mounts[batch],
+                None if bodies is None else bodies[batch],
+            )
+            yield batch, kernel.testbed_outputs(Plan(self, platform=platform), world, stacked, rotations)
+
+    def _platform(self, mounts=None, bodies=None) -> tuple[np.ndarray, np.ndarray]:
+        """Position of the body on the platform and the mount to body DCM product, per realization if given."""
+        if mounts is None and bodies is None:
+            mount, body = self.mount.frame, self.body.frame
+            return kernel.vec(mount.linear.p + mount.C @ body.linear.p), mount.C @ body.C
+
+        count = len(mounts if mounts is not None else bodies)
+        mounts = [self.mount] * count if mounts is None else mounts
+        bodies = [self.body] * count if bodies is None else bodies
+
+        r_mb = np.stack([m.frame.linear.p + m.frame.C @ b.frame.linear.p for m, b in zip(mounts, bodies, strict=True)])
+        Cmb = np.stack([m.frame.C @ b.frame.C for m, b in zip(mounts, bodies, strict=True)])
+        return kernel.vec(r_mb)[:, None, :], Cmb[:, None, :, :]
+
+    def _check_inputs(self, misalignments, rotations, method, outputs=None) -> tuple[str, ...]:
+        """
+        Validate the per-axis inputs, evaluation method and output names, returning the output names.
+
+        Rotations of ``None`` are left to be validated with each streamed chunk.
+        """
+        if len(misalignments) != len(self._axes):
+            raise AxisCountError(len(self._axes), "misalignment")
+        if rotations is not None and len(rotations) != len(self._axes):
+            raise AxisCountError(len(self._axes), "rotations")
+
+        validate.option(method, kernel.METHODS)
+
+        if outputs is None:
+            return kernel.OUTPUTS
+        for name in outputs:
+            validate.option(name, kernel.OUTPUTS)
+        return tuple(name for name in kernel.OUTPUTS if name in outputs)
+
+    def _evaluate(  # noqa: PLR0913
+        self,
+        world: Frame,
+        misalignments,
+        rotations,
+        method: str,
+        outputs=kernel.OUTPUTS,
+        *,
+        cache: bool = False,
+        precision: str = "float64",
+    ) -> dict[str, np.ndarray]:
+        """Evaluate the requested outputs for the time steps of the world frame, resuming cached axes if 'cache'."""
+        if method != "reference":
+            plan = self.compile(method=method)
+            return kernel.testbed_outputs(plan, world, misalignments, rotations, outputs, precision)
+        return _Run(partial(_Reference, self, world, misalignments, rotations, cache=cache)).evaluate(outputs)
+
+    def _stages(self, time, misalignments, rotations, method, precision) -> "kernel.Evaluation | _Reference":
+        """Stages of the evaluation of a whole run, for the outputs left pending by :meth:`process`."""
+        world = self._world_at(time, method, cache=True)
+        if method == "reference":
+            return _Reference(self, world, misalignments, rotations)
+        return kernel.Evaluation(self.compile(method=method), world, misalignments, rotations, precision)
 
     def plot(self, *, variable="la", frame="b", separate=False) -> None:
         """
         Plot the processed results.
 
+        Matplotlib is imported on first use, and long runs are reduced to a min/max envelope per
+        pixel before drawing.
+
         :param variable: The variable to be plotted.
             options:
                 "la" for linear acceleration
@@ -245,79 +856,184 @@ class Testbed(Base):
         :param separate: Separate x, y, and z axis into subplots (True, False), defaults to False
         :type separate: bool, optional
         """
-        axs = ["x", "y", "z"]
+        from . import plotting  # noqa: PLC0415
 
-        var_info = {
-            "la": {"unit": r"\gravity", "sym": r"\boldsymbol{a}"},
-            "sf": {"unit": r"\gravity", "sym": r"\boldsymbol{f}"},
-            "av": {"unit": r"\radian/\second", "sym": r"\boldsymbol{\omega}"},
-            "aa": {"unit": r"\radian/\second\squared", "sym": r"\dot{\boldsymbol{\omega}}"},
-        }
+        plotting.plot(self, variable=variable, frame=frame, separate=separate)
 
-        x = np.round(vars(self)[f"{variable}{frame}ib"].copy(), 12)
-        x /= 1 if variable[0] == "a" else self.g
-        exp, mdf = unit_modifier(x)
 
-        ustr = "".join([r"\unit{", f"{mdf}{var_info[variable]['unit']}", r"}"])
+class _Reference:
+    """Stages of the reference evaluation of a testbed, as those of :class:`rtsim.kernel.Evaluation`."""
 
-        title = "".join(
-            ["$", f"{var_info[variable]['sym']}", r"^\mathrm{", f"{frame}", r"}_{\mathrm{i}\mathrm{b}}$, ", f"{ustr}"]
-        )
+    def __init__(self, testbed: Testbed, world: Frame, misalignments, rotations, *, cache: bool = False) -> None:
+        self.testbed = testbed
+        self.world = world
+        self.misalignments = misalignments
+        self.rotations = rotations
+        self.cache = cache
+        self._Cin = None
+
+    @property
+    def Cin(self) -> np.ndarray:
+        """Inertial to navigation frame direction cosine matrix."""
+        if self._Cin is None:
+            self._Cin = self.world.C @ self.testbed.nav.C
+        return self._Cin
+
+    def state(self, needs: tuple[str, ...]) -> tuple:
+        """
+        Propagate the state through the axes, resuming cached axes if 'cache'.
+
+        Returns the linear and angular PVA after the last axis if any of ``STATE`` is in 'needs', and the
+        attitude chain of the axes, mount and body if "C" is.
+        """
+        testbed, misalignments, rotations = self.testbed, self.misalignments, self.rotations
+        mount, body = testbed.mount.frame, testbed.body.frame
+        chain = "C" in needs
+        Cib = mount.C @ body.C
+        if not set(kernel.STATE).intersection(needs):
+            return None, None, self._chain(range(len(testbed.axes)), Cib) if chain else None
+
+        alpha = ConstantPVA(p=mount.linear.p + mount.C @ body.linear.p, v=np.zeros((3, 1)), a=np.zeros((3, 1)))
+        omega = ConstantPVA(p=np.zeros((3, 1)), v=np.zeros((3, 1)), a=np.zeros((3, 1)))
 
-        if separate:
-            fig, ax = plt.subplots(3, 1, sharex=True, figsize=(6.5, 8.0))
-
-            for a in range(3):
-                ax[a].plot(self.time, x[:, a].flatten() * 10**exp)
-                ax[a].set(ylabel=f"{axs[a]}")
-                ax[a].grid(visible=True, which="both", linestyle=":", alpha=0.25)
-
-            ax[0].set(title=title)
-            ax[2].set(xlabel=r"Time, \unit{\second}")
-            fig.align_ylabels(ax)
-            fig.subplots_adjust(left=0.10, bottom=0.12, right=0.96, top=0.94, wspace=0.0, hspace=0.0)
-        else:
-            fig, ax = plt.subplots(1, 1, figsize=(6.50, 4.02))
-
-            for a in range(3):
-                ax.plot(self.time, x[:, a].flatten() * 10**exp, label=f"{axs[a]}")
-
-            ax.set(xlabel=r"Time, \unit{\second}", ylabel=title)
-            ax.grid(visible=True, which="both", linestyle=":", alpha=0.25)
-            ax.spines[:].set_visible(False)
-            ax.legend(frameon=False)
-            fig.subplots_adjust(left=0.10, bottom=0.12, right=0.96, top=0.94)
-
-
-def unit_modifier(x: np.ndarray):
-    """Modify units of varable."""
-    mods = {
-        -24: r"\yotta",
-        -21: r"\zetta",
-        -18: r"\exa",
-        -15: r"\peta",
-        -12: r"\tera",
-        -9: r"\giga",
-        -6: r"\mega",
-        -3: r"\kilo",
-        0: r"",
-        3: r"\milli",
-        6: r"\micro",
-        9: r"\nano",
-        12: r"\pico",
-        15: r"\femto",
-        18: r"\atto",
-        21: r"\zepto",
-        24: r"\yocto",
-    }
-
-    exp = np.arange(-24.0, 25.0, 3.0)
-    xm = max(abs(x.flatten()))
-
-    if xm == 0.0:
-        return 0, r""
-
-    xma = xm * 10**exp
-    idx = np.where(xma > 1.0)[0][0]
-
-    return exp[idx], mods[exp[idx]]
+        keys = [
+            (axis, axis.zeta, *frame_key(misalignments[a]), *frame_key(rotations[a]))
+            for a, axis in enumerate(testbed.axes)
+        ]
+        if keys:
+            keys[0] = (testbed.mount, *frame_key(mount), testbed.body, *frame_key(body), *keys[0])
+
+        start = 0
+        if self.cache:
+            start, entry = testbed._prefix.resume(keys)
+            if entry is not None:
+                alpha, omega, cached = entry
+                Cib = cached if cached is not None or not chain else self._chain(range(start), Cib)
+
+        for a in range(start, len(testbed.axes)):
+            alpha, omega = testbed.axes[a].process(misalignments[a], rotations[a], alpha, omega)
+            if chain:
+                Cib = self._chain(range(a, a + 1), Cib)
+            if self.cache:
+                testbed._prefix.store(a, keys[a], (alpha, omega, Cib if chain else None))
+
+        return alpha, omega, Cib if chain else None
+
+    def _chain(self, axes: range, Cib: np.ndarray) -> np.ndarray:
+        """Left multiply the attitude chain by the attitude of each of 'axes' in turn."""
+        for a in axes:
+            with profiling.stage("Cib", axis=self.testbed.axes[a].moniker):
+                Cib = self.testbed.axes[a].zeta.C @ self.misalignments[a].C @ self.rotations[a].C @ Cib
+        return Cib
+
+    def inertial(self, state: tuple, names) -> dict[str, np.ndarray]:
+        """Evaluate the inertial outputs in 'names' from the state after the last axis."""
+        alpha, omega, _ = state
+        world, Cin = self.world, self.Cin
+        out = {}
+        with profiling.stage("inertial"):
+            if "aaiib" in names:
+                out["aaiib"] = world.Omega @ Cin @ omega.v + Cin @ omega.a
+            if "aviib" in names:
+                out["aviib"] = world.angular.v + Cin @ omega.v
+
+            if {"laiib", "sfiib"}.intersection(names):
+                laiib = (
+                    world.Omega @ world.Omega @ world.C @ self.testbed.nav.linear.p
+                    + world.Omega @ world.Omega @ Cin @ alpha.p
+                    + 2 * world.Omega @ Cin @ alpha.v
+                    + Cin @ alpha.a
+                )
+                if "sfiib" in names:
+                    out["sfiib"] = laiib + Cin @ np.array([[0.0], [0.0], [-self.testbed.g]])
+                if "laiib" in names:
+                    out["laiib"] = laiib
+        return out
+
+    def chain(self, state: tuple) -> np.ndarray:
+        """Inertial to body frame direction cosine matrix, from the attitude chain of the state."""
+        with profiling.stage("Cib"):
+            return np.swapaxes(self.Cin @ state[2], -1, -2)
+
+    def body(self, chain: np.ndarray, inertial: dict[str, np.ndarray], names, *, release=()) -> dict[str, np.ndarray]:
+        """Resolve inertial outputs in the body frame, removing those in 'release' from 'inertial'."""
+        out = {}
+        with profiling.stage("body"):
+            for name in names:
+                source = kernel.INERTIAL[name]
+                out[name] = chain @ (inertial.pop(source) if source in release else inertial[source])
+        return out
+
+
+class _Run:
+    """
+    Outputs of one set of testbed inputs, evaluated on request.
+
+    The intermediates that outputs share, the state after the last axis, the body attitude chain and the
+    inertial outputs, are kept while an output in ``pending`` needs them and released once none does.
+    The stages are built by 'stages' when first needed, and released with the last intermediate.
+    """
+
+    def __init__(self, stages: Callable[[], "kernel.Evaluation | _Reference"], pending: Iterable[str] = ()) -> None:
+        self.stages = stages
+        self.pending = set(pending)
+        self.evaluation = None
+        self.state = None
+        self.chain = None
+        self.inertial = {}
+
+    def evaluate(self, names: Iterable[str]) -> dict[str, np.ndarray]:
+        """Evaluate outputs, removing them from the pending outputs."""
+        self.pending.difference_update(names)
+        body = [name for name in kernel.OUTPUTS[4:] if name in names]
+        inertial = [name for name in kernel.OUTPUTS[:4] if name in names or name in {kernel.INERTIAL[b] for b in body}]
+        if not inertial:
+            return {}
+
+        if self.evaluation is None:
+            self.evaluation = self.stages()
+        evaluation = self.evaluation
+
+        missing = [name for name in inertial if name not in self.inertial]
+        needs = kernel.state_needs(missing) + (("C",) if body and self.chain is None else ())
+        if needs:
+            state = self._state(needs)
+        if missing:
+            self.inertial |= evaluation.inertial(state, missing)
+
+        out = {name: self.inertial[name] for name in inertial if name in names}
+        if body:
+            if self.chain is None:
+                self.chain = evaluation.chain(state)
+            kept = self._kept()
+            release = [name for name in inertial if name not in names and name not in kept]
+            out |= evaluation.body(self.chain, self.inertial, body, release=release)
+
+        self._release()
+        return {name: out[name] for name in kernel.OUTPUTS if name in out}
+
+    def _kept(self) -> set[str]:
+        """Inertial outputs needed by the pending outputs."""
+        return {kernel.INERTIAL.get(name, name) for name in self.pending}
+
+    def _state(self, needs: tuple[str, ...]) -> tuple | list:
+        """State covering 'needs', propagated for the pending outputs as well if it has to be evaluated."""
+        if self.state is not None and set(needs).issubset(self.state[0]):
+            return self.state[1]
+        kept = self._kept()
+        needs += kernel.state_needs(kept.difference(self.inertial))
+        needs += ("C",) if any(name in kernel.INERTIAL for name in self.pending) else ()
+        self.state = (needs, self.evaluation.state(needs))
+        return self.state[1]
+
+    def _release(self) -> None:
+        """Release the intermediates that no pending output needs."""
+        kept = self._kept()
+        self.inertial = {name: value for name, value in self.inertial.items() if name in kept}
+        body = any(name in kernel.INERTIAL for name in self.pending)
+        if not body:
+            self.chain = None
+        if not kept.difference(self.inertial) and (self.chain is not None or not body):
+            self.state = None
+        if self.state is None and self.chain is None and not self.inertial:
+            self.evaluation = None
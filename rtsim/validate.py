@@ -12,11 +12,13 @@ import numpy as np
 from .exceptions import (
     ComponentTypeError,
     ColCountError,
+    IntegerTypeError,
     MatrixTypeError,
     MaxValueError,
     MinValueError,
     NumDimError,
     NumberTypeError,
+    OptionError,
     RowCountError,
     StringError,
     StringLengthError,
@@ -25,10 +27,22 @@ from .exceptions import (
 
 CONSTANT_NDIM = 2
 TIME_NDIM = 3
+BATCH_NDIM = 4
 ROWS = 3
 COLS = 1
 
 
+def batch_vector(value):
+    """Validate batch of time vectors."""
+    if not isinstance(value, np.ndarray):
+        raise MatrixTypeError(value)
+
+    if value.ndim != BATCH_NDIM:
+        raise NumDimError(value, BATCH_NDIM)
+
+    time_vector(value[0])
+
+
 def constant_vector(value):
     """Validate constant vector."""
     if not isinstance(value, np.ndarray):
@@ -56,12 +70,25 @@ def number(value, minvalue=None, maxvalue=None):
         raise MaxValueError(value, maxvalue)
 
 
+def integer(value, minvalue=None, maxvalue=None):
+    """Validate integer input."""
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise IntegerTypeError(value)
+    number(value, minvalue, maxvalue)
+
+
 def component(obj, obj_type):
     """Validate component type."""
     if not isinstance(obj, obj_type):
         raise ComponentTypeError(obj, obj_type)
 
 
+def option(value, options):
+    """Validate option input."""
+    if value not in options:
+        raise OptionError(value, options)
+
+
 def string(value):
     """Validate string input."""
     if not isinstance(value, str):
@@ -71,8 +98,22 @@ def string(value):
         raise StringLengthError(value)
 
 
-def time_vector(value):
-    """Validate time vector."""
+def packed_vector(value):
+    """Validate packed position, velocity and acceleration time vectors."""
+    if not isinstance(value, np.ndarray):
+        raise MatrixTypeError(value)
+
+    if value.ndim != BATCH_NDIM:
+        raise NumDimError(value, BATCH_NDIM)
+
+    if value.shape[0] != ROWS:
+        raise RowCountError(value, ROWS)
+
+    time_vector(value[0])
+
+
+def time_vector(value, steps=None):
+    """Validate time vector, of 'steps' time steps if given."""
     if not isinstance(value, np.ndarray):
         raise MatrixTypeError(value)
 
@@ -81,8 +122,8 @@ def time_vector(value):
 
     shape = value.shape
 
-    if shape[0] < 1:
-        raise TimeCountError(value)
+    if shape[0] < 1 or (steps is not None and shape[0] != steps):
+        raise TimeCountError(value, steps)
 
     if shape[1] != ROWS:
         raise RowCountError(value, ROWS)
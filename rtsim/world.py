@@ -10,11 +10,42 @@ NTESS, the U.S. Government retains certain rights in this software.
 
 from . import validate
 from .base import Base
+from .cache import FrameCache, time_key
 from .frame import Frame
-from .pva import ConstantPVA, TimePVA
+from .pva import ConstantPVA, PackedPVA
 from math import tau
 import numpy as np
 
+CACHE_SIZE = 0
+
+
+class EarthRotation:
+    """
+    Rotation of a world about its polar axis at a constant rate.
+
+    Holds only the cosine and sine of the rotation angle of each time step. The world coordinate frame
+    is a pure rotation about z, so its direction cosine matrix is
+    ``[[cos, sin, 0], [-sin, cos, 0], [0, 0, 1]]`` and its angular velocity the constant ``[0, 0, omega]``,
+    which :func:`rtsim.kernel.testbed_outputs` applies in closed form.
+    """
+
+    __slots__ = ("cos", "omega", "sin")
+
+    def __init__(self, omega: float, time: np.ndarray) -> None:
+        r"""
+        Initialize the rotation for the input time steps.
+
+        :param omega: Rotation rate :math:`(\omega_{ie})`, rad/s
+        :type omega: float
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+        """
+        theta = omega * np.reshape(time, -1)
+        self.omega = omega
+        self.cos = np.cos(theta)
+        self.sin = np.sin(theta)
+
 
 class World(Base):
     """Representation of a world."""
@@ -40,6 +71,7 @@ class World(Base):
         f = 1 / inv_flattening
         self.e2 = f * (2 - f)
         self.omega_ie = rotation_rate
+        self.cache = FrameCache(CACHE_SIZE)
 
     @property
     def a(self):
@@ -61,6 +93,23 @@ class World(Base):
         validate.number(value, minvalue=0.0, maxvalue=tau)
         self._omega_ie = value
 
+    @property
+    def cache_size(self):
+        """
+        Memory cap, in bytes, of the world frames cached by :meth:`process`.
+
+        Frames are keyed by the time vector object, a descriptor of its grid (see :func:`~rtsim.cache.time_key`) and the
+        rotation rate, and the least recently used frames are evicted first. ``cache.hits`` and
+        ``cache.misses`` count the lookups. Memory is accounted when a frame is cached, not for matrices it
+        computes lazily later. The cache is opt-in: ``CACHE_SIZE`` is 0, and setting 0 disables it again.
+        While it is enabled, the frames stored by :meth:`process` are shared and read-only.
+        """
+        return self.cache.size
+
+    @cache_size.setter
+    def cache_size(self, value):
+        self.cache.resize(value)
+
     def process(self, time: np.ndarray) -> None:
         """
         Compute world coordinate frame parameters for all input time steps.
@@ -68,16 +117,50 @@ class World(Base):
         :param time: Relative time of each step.
         :type time: np.ndarray
         """
-        steps = time.size
-        omega = np.zeros((steps, 3, 1))
-        omega[:, 2, 0] = self._omega_ie
+        self.frame = self.frame_at(time, cache=True)
+
+    def rotation_at(self, time: np.ndarray) -> EarthRotation:
+        """
+        Compute the closed form rotation of the world for the input time steps.
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :return: Rotation of the world.
+        :rtype: EarthRotation
+        """
+        return EarthRotation(self._omega_ie, time)
+
+    def frame_at(self, time: np.ndarray, *, cache: bool = False) -> Frame:
+        """
+        Compute the world coordinate frame for the input time steps without storing it.
+
+        :param time: Relative time of each step.
+        :type time: np.ndarray
+
+        :param cache: Look the frame up in, and add it to, the frame cache, defaults to False. The arrays
+            of a cached frame are read-only, as the frame is shared by every lookup.
+        :type cache: bool, optional
+
+        :return: World coordinate frame.
+        :rtype: Frame[Rotating]
+        """
+        if cache and self.cache.size:
+            key = (time_key(time), self._omega_ie)
+            frame = self.cache.get(key)
+            if frame is None:
+                frame = self.frame_at(time)
+                for x in (frame.linear.p, frame.linear.v, frame.linear.a, frame.angular.buffer, frame.C):
+                    x.flags.writeable = False
+                self.cache.put(key, frame)
+            return frame
+
+        angular = PackedPVA.zeros(time.size)
+        angular.v[:, 2, 0] = self._omega_ie
+        np.multiply(angular.v[:, 2, 0], time, out=angular.p[:, 2, 0])
 
-        theta = np.zeros((steps, 3, 1))
-        theta[:, 2, 0] = omega[:, 2, 0] * time
+        frame = Frame(ConstantPVA(p=np.zeros((3, 1)), v=np.zeros((3, 1)), a=np.zeros((3, 1))), angular)
 
-        self.frame = Frame(
-            ConstantPVA(p=np.zeros((3, 1)), v=np.zeros((3, 1)), a=np.zeros((3, 1))),
-            TimePVA(p=theta, v=omega, a=np.zeros((steps, 3, 1))),
-        )
+        frame.C = np.transpose(frame.C, (0, 2, 1))
 
-        self.frame.C = np.transpose(self.frame.C, (0, 2, 1))
+        return frame
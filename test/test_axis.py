@@ -1,5 +1,6 @@
 """Axis component tests."""
 
+from concurrent.futures import ThreadPoolExecutor
 from math import tau
 import numpy as np
 import pytest
@@ -97,3 +98,59 @@ def test_process():
     assert (new_omega.p == 0).all()
     assert (new_omega.v == 0).all()
     assert (new_omega.a == 0).all()
+
+
+def test_process_fused():
+    """Test fused axis processing against the reference method."""
+    rng = np.random.default_rng(0)
+    mu = Frame(
+        linear=TimePVA(p=rng.normal(size=(500, 3, 1)), v=rng.normal(size=(500, 3, 1)), a=rng.normal(size=(500, 3, 1))),
+        angular=TimePVA(p=rng.normal(size=(500, 3, 1)), v=rng.normal(size=(500, 3, 1)), a=rng.normal(size=(500, 3, 1))),
+    )
+    rho = Frame(
+        linear=ConstantPVA(p=np.zeros((3, 1)), v=np.zeros((3, 1)), a=np.zeros((3, 1))),
+        angular=TimePVA(p=rng.normal(size=(500, 3, 1)), v=rng.normal(size=(500, 3, 1)), a=rng.normal(size=(500, 3, 1))),
+    )
+    omega = TimePVA(p=np.zeros((500, 3, 1)), v=rng.normal(size=(500, 3, 1)), a=rng.normal(size=(500, 3, 1)))
+    axis = Axis("SART Axis", MOUNT.frame)
+
+    ref_alpha, ref_omega = axis.process(mu, rho, ALPHA, omega)
+    new_alpha, new_omega = axis.process(mu, rho, ALPHA, omega, method="fused")
+
+    for ref, new in ((ref_alpha, new_alpha), (ref_omega, new_omega)):
+        assert isinstance(new, TimePVA)
+        assert np.allclose(new.p, ref.p, rtol=0.0, atol=1e-12)
+        assert np.allclose(new.v, ref.v, rtol=0.0, atol=1e-12)
+        assert np.allclose(new.a, ref.a, rtol=0.0, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["reference", "fused"])
+def test_process_concurrent(method):
+    """Test concurrent processing of one axis evaluates each call from its own frames."""
+    rng = np.random.default_rng(1)
+    axis = Axis("SART Axis", MOUNT.frame)
+
+    def frames(steps):
+        def pva():
+            return TimePVA(
+                p=rng.normal(size=(steps, 3, 1)), v=rng.normal(size=(steps, 3, 1)), a=rng.normal(size=(steps, 3, 1))
+            )
+
+        mu = Frame(linear=pva(), angular=pva())
+        rho = Frame(linear=ConstantPVA(p=GCI, v=GCI, a=GCI), angular=pva())
+        return (
+            mu,
+            rho,
+            TimePVA(p=np.zeros((steps, 3, 1)), v=rng.normal(size=(steps, 3, 1)), a=rng.normal(size=(steps, 3, 1))),
+        )
+
+    calls = [frames(steps) for steps in range(100, 116)]
+    expected = [axis.process(mu, rho, ALPHA, omega, method=method) for mu, rho, omega in calls]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda call: axis.process(call[0], call[1], ALPHA, call[2], method=method), calls))
+
+    assert not hasattr(axis, "mu")
+    for (ref_alpha, ref_omega), (new_alpha, new_omega) in zip(expected, results, strict=True):
+        assert np.array_equal(new_alpha.a, ref_alpha.a)
+        assert np.array_equal(new_omega.a, ref_omega.a)
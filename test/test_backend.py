@@ -0,0 +1,97 @@
+"""Compute backend tests."""
+
+import numpy as np
+import pytest
+from rtsim import backend
+from rtsim.backend import Backend, axis_loop, compose_loop, dcm_loop
+from rtsim.exceptions import OptionError
+from rtsim.frame import Frame, orientation_to_dcm
+from rtsim.kernel import OUTPUTS, compose
+from rtsim.pva import TimePVA
+from .test_testbed import scenario
+
+# The uncompiled loops, so that they are checked without Numba.
+LOOPS = Backend(
+    "python",
+    dcm=getattr(dcm_loop, "py_func", dcm_loop),
+    compose=getattr(compose_loop, "py_func", compose_loop),
+    axis_update=getattr(axis_loop, "py_func", axis_loop),
+)
+
+BACKENDS = ["python", pytest.param("numba", marks=pytest.mark.skipif(backend.numba is None, reason="needs numba"))]
+
+
+@pytest.fixture(autouse=True)
+def loops(monkeypatch):
+    """Register the uncompiled loops for a test, restoring the backends and the active one after it."""
+    monkeypatch.setitem(backend._backends, LOOPS.name, LOOPS)
+    monkeypatch.setattr(backend, "_active", backend.active())
+
+
+def evaluate(name, function):
+    """Evaluate a function with a backend."""
+    with backend.using(name):
+        return function()
+
+
+def test_select():
+    """Verify the default backend and selecting an unknown backend."""
+    assert backend.available()[0] == "numpy"
+    assert backend.active().name == "numpy"
+    with backend.using("numpy") as selected:
+        assert backend.active() is selected
+    with pytest.raises(OptionError):
+        backend.use("fortran")
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_conversions(name):
+    """Verify the DCM and composition kernels agree with NumPy, in place and broadcast."""
+    rng = np.random.default_rng(0)
+    v = rng.normal(size=(50, 3, 1))
+    C = orientation_to_dcm(v)
+    F = orientation_to_dcm(rng.normal(size=(3, 1)))
+
+    assert np.allclose(evaluate(name, lambda: orientation_to_dcm(v)), C, rtol=0.0, atol=1e-15)
+
+    expected = compose(F, C, np.empty_like(C))
+    chain = C.copy()
+    evaluate(name, lambda: compose(F, chain, chain))
+    assert np.allclose(chain, expected, rtol=0.0, atol=1e-15)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_axis(name):
+    """Verify the axis kernel agrees with NumPy."""
+    testbed, _, misalignments, rotations = scenario(steps=40)
+    rng = np.random.default_rng(1)
+    alpha = TimePVA(p=rng.normal(size=(40, 3, 1)), v=rng.normal(size=(40, 3, 1)), a=rng.normal(size=(40, 3, 1)))
+    omega = TimePVA(p=np.zeros((40, 3, 1)), v=rng.normal(size=(40, 3, 1)), a=rng.normal(size=(40, 3, 1)))
+    axis = testbed.axes[1]
+
+    def process():
+        mu, rho = (
+            Frame(misalignments[1].linear, misalignments[1].angular),
+            Frame(rotations[1].linear, rotations[1].angular),
+        )
+        return axis.process(mu, rho, alpha, omega, method="fused")
+
+    expected = evaluate("numpy", process)
+    result = evaluate(name, process)
+    for x, y in zip(result, expected, strict=True):
+        for attr in ("p", "v", "a"):
+            assert np.allclose(getattr(x, attr), getattr(y, attr), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("method", ["fused", "quaternion"])
+def test_testbed(name, method):
+    """Verify every testbed output agrees with NumPy."""
+    testbed, time, misalignments, rotations = scenario(steps=60)
+    testbed.process(time, misalignments, rotations, method=method)
+    expected = {output: getattr(testbed, output) for output in OUTPUTS}
+
+    testbed, time, misalignments, rotations = scenario(steps=60)
+    evaluate(name, lambda: testbed.process(time, misalignments, rotations, method=method, workers=2))
+    for output in OUTPUTS:
+        assert np.allclose(getattr(testbed, output), expected[output], rtol=1e-12, atol=1e-12), output
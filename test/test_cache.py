@@ -0,0 +1,53 @@
+"""Cache tests."""
+
+import numpy as np
+from rtsim.cache import PrefixCache, time_key
+
+
+def entry(steps):
+    """Build a cache entry of 'steps' time steps."""
+    return (np.zeros((steps, 3, 1)), np.zeros((steps, 3, 3)))
+
+
+def test_prefix_resume():
+    """Test the cache resumes the leading axes with identical keys and drops the others."""
+    a, b, c, d = object(), object(), object(), object()
+    cache = PrefixCache(2**20)
+    entries = [entry(10) for _ in range(3)]
+    for index, (key, value) in enumerate(zip([(a,), (b,), (c,)], entries, strict=True)):
+        cache.store(index, key, value)
+
+    assert cache.resume([(a,), (b,), (c,)]) == (3, entries[2])
+    assert cache.resume([(a,), (d,), (c,)]) == (1, entries[0])
+    assert len(cache.entries) == 1
+    assert cache.resume([(d,)]) == (0, None)
+    assert cache.nbytes == 0
+
+
+def test_prefix_size():
+    """Test the cache keeps only the leading entries that fit in its memory cap."""
+    size = sum(x.nbytes for x in entry(10))
+    count = 2
+    cache = PrefixCache(count * size)
+    for index in range(count + 1):
+        cache.store(index, (object(),), entry(10))
+    assert len(cache.entries) == count
+
+    cache.resize(size)
+    assert cache.nbytes == size
+    cache.store(2, (object(),), entry(10))
+    assert len(cache.entries) == 1
+
+
+def test_time_key():
+    """Test a time vector is keyed by identity and by the descriptor of its grid."""
+    time = np.arange(5) * 1e-2
+    key = time_key(time)
+    assert time_key(time) == key
+    assert hash(time_key(time)) == hash(key)
+    assert time_key(time.copy()) != key
+
+    time *= 2.0
+    assert time_key(time) != key
+    assert time_key(time[:1])[1:] == ((1,), "<f8", 0.0, 0.0, 0.0)
+    assert time_key(np.zeros(0))[1:] == ((0,), "<f8", 0.0, 0.0, 0.0)
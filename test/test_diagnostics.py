@@ -0,0 +1,53 @@
+"""Memory diagnostics tests."""
+
+import numpy as np
+import pytest
+from rtsim import TimePVA
+from rtsim.diagnostics import check_inputs, estimate
+from rtsim.exceptions import OptionError
+from rtsim.frame import Frame
+from .test_testbed import scenario
+
+
+def test_check_inputs():
+    """Verify strided, single precision and byte swapped inputs are flagged."""
+    _, time, misalignments, rotations = scenario(steps=50)
+    assert check_inputs(time, misalignments, rotations) == []
+
+    wide = np.zeros((50, 3, 2))
+    rotation = rotations[1].angular
+    rotations[1] = Frame(rotations[1].linear, TimePVA(p=wide[..., :1], v=rotation.v, a=rotation.a.astype(np.float32)))
+    findings = check_inputs(time.astype(">f8"), misalignments, rotations)
+    assert len(findings) == len(["time", "p", "a"])
+    assert findings[0].startswith("time is not in native byte order")
+    assert findings[1].startswith("rotations[1].angular.p is not C-contiguous")
+    assert findings[2].startswith("rotations[1].angular.a is float32")
+
+
+@pytest.mark.parametrize("method", ["reference", "fused"])
+def test_diagnose(method):
+    """Verify the high-water mark of a run is reported per stage and matches the estimate."""
+    testbed, time, misalignments, rotations = scenario(steps=20000)
+    testbed.cache_size = testbed.world.cache_size = 0
+    report = testbed.diagnose(time, misalignments, rotations, method=method)
+
+    assert report.findings == []
+    assert report.stages["Testbed.process"]["peak"] == report.peak
+    assert all(stage["peak"] <= report.peak for stage in report.stages.values())
+    assert report.peak >= sum(getattr(testbed, name).nbytes for name in ("sfbib", "avbib"))
+    assert report.inputs == time.nbytes + 3 * 9 * time.size * 24
+    assert "high-water mark" in str(report)
+
+    expected = estimate(time.size, len(testbed.axes), method=method)
+    assert expected == report.estimate
+    assert abs(expected - report.inputs - report.peak) < 0.2 * report.peak
+
+
+def test_estimate():
+    """Verify the estimate grows with the number of steps and axes."""
+    small = estimate(10**5, 1, method="fused", outputs=("sfbib",))
+    assert estimate(10**6, 1, method="fused", outputs=("sfbib",)) > 9 * small
+    assert estimate(10**5, 3, method="fused", outputs=("sfbib",)) > small
+    assert estimate(10**5, 1, method="fused") > small
+    with pytest.raises(OptionError):
+        estimate(10, 1, method="fast")
@@ -0,0 +1,109 @@
+"""Encoder log tests."""
+
+from math import tau
+import numpy as np
+import polars as pl
+import pytest
+from rtsim import PackedPVA
+from rtsim.encoder import EncoderLog
+from rtsim.exceptions import AxisCountError, OptionError
+from rtsim.kernel import OUTPUTS
+from .test_testbed import scenario
+
+COLUMNS = [("ti", "wi", "di"), ("tm", "wm", "dm"), ("to", "wo", "do")]
+
+
+def recorded(rotations, time):
+    """Record the rotations of a scenario as an encoder log in milliseconds and degrees."""
+    log = {"time": np.round(time * 1e3).astype(np.int64)}
+    for names, frame in zip(COLUMNS, rotations, strict=True):
+        for name, x in zip(names, (frame.angular.p, frame.angular.v, frame.angular.a), strict=True):
+            log[name] = x[:, 2, 0] * 360 / tau
+    return log
+
+
+def planar(rotations):
+    """Keep only the rotation about the z axis of each frame, as recorded by an encoder."""
+    for frame in rotations:
+        for x in (frame.angular.p, frame.angular.v, frame.angular.a):
+            x[:, :2] = 0.0
+    return rotations
+
+
+@pytest.mark.parametrize("kind", ["npy", "structured", "binary", "csv"])
+def test_encoder_log(tmp_path, kind):
+    """Verify streaming an encoder log through the testbed matches processing the recorded rotations."""
+    testbed, time, misalignments, rotations = scenario(steps=203)
+    rotations = planar(rotations)
+    log = recorded(rotations, time)
+    names = list(log)
+    options = {"scale": tau / 360, "time_scale": 1e-3}
+
+    if kind == "npy":
+        np.save(tmp_path / "log.npy", np.stack([log[name] for name in names], axis=1).astype(float))
+        encoder = EncoderLog.npy(tmp_path / "log.npy", COLUMNS, names=names, **options)
+    elif kind in {"structured", "binary"}:
+        records = np.empty(time.size, dtype=[(name, "<i8" if name == "time" else "<f8") for name in names])
+        for name in names:
+            records[name] = log[name]
+        if kind == "structured":
+            np.save(tmp_path / "log.npy", records)
+            encoder = EncoderLog.npy(tmp_path / "log.npy", COLUMNS, **options)
+        else:
+            (tmp_path / "log.bin").write_bytes(b"header" + records.tobytes())
+            encoder = EncoderLog.binary(tmp_path / "log.bin", records.dtype, COLUMNS, offset=6, **options)
+    else:
+        pl.DataFrame(log).write_csv(tmp_path / "log.csv")
+        encoder = EncoderLog.csv(tmp_path / "log.csv", COLUMNS, **options)
+
+    chunks = list(encoder.chunks(50))
+    assert [chunk for chunk, *_ in chunks] == [slice(k, min(k + 50, 203)) for k in range(0, 203, 50)]
+    for chunk, t, frames in chunks:
+        assert np.allclose(t, time[chunk])
+        assert all(isinstance(frame.angular, PackedPVA) for frame in frames)
+        assert np.allclose(frames[1].angular.v, rotations[1].angular.v[chunk])
+
+    testbed.process(time, misalignments, rotations)
+    streamed = list(testbed.process_chunks(encoder.chunks(64), misalignments, method="fused", outputs=("sfbib",)))
+    assert all(list(outputs) == ["sfbib"] for _, outputs in streamed)
+    result = np.concatenate([outputs["sfbib"] for _, outputs in streamed])
+    assert np.allclose(result, testbed.sfbib, rtol=0.0, atol=1e-9)
+
+
+def test_encoder_single_step_chunk(tmp_path):
+    """Verify a log one step longer than a multiple of the chunk size streams its last single step chunk."""
+    testbed, time, misalignments, rotations = scenario(steps=5)
+    rotations = planar(rotations)
+    log = recorded(rotations, time)
+    names = list(log)
+    np.save(tmp_path / "log.npy", np.stack([log[name] for name in names], axis=1).astype(float))
+    encoder = EncoderLog.npy(tmp_path / "log.npy", COLUMNS, names=names, scale=tau / 360, time_scale=1e-3)
+
+    testbed.process(time, misalignments, rotations)
+    streamed = list(testbed.process_chunks(encoder.chunks(2), misalignments))
+    assert [chunk for chunk, _ in streamed] == [slice(0, 2), slice(2, 4), slice(4, 5)]
+    for name in OUTPUTS:
+        result = np.concatenate([outputs[name] for _, outputs in streamed])
+        assert np.allclose(result, getattr(testbed, name), rtol=0.0, atol=1e-9)
+
+
+def test_process_chunks_all_outputs():
+    """Verify streamed chunks give every output, matching the whole run."""
+    testbed, time, misalignments, rotations = scenario(steps=120)
+    testbed.process(time, misalignments, rotations)
+    chunks = ((slice(k, k + 40), time[k : k + 40], [r.slice(slice(k, k + 40)) for r in rotations]) for k in (0, 40, 80))
+    streamed = list(testbed.process_chunks(chunks, misalignments))
+    for name in OUTPUTS:
+        result = np.concatenate([outputs[name] for _, outputs in streamed])
+        assert np.allclose(result, getattr(testbed, name), rtol=0.0, atol=1e-12)
+
+
+def test_process_chunks_invalid():
+    """Verify invalid streamed inputs are rejected."""
+    testbed, time, misalignments, rotations = scenario(steps=20)
+    with pytest.raises(OptionError):
+        testbed.process_chunks([], misalignments, method="fast")
+    with pytest.raises(AxisCountError):
+        list(testbed.process_chunks([(slice(0, 20), time, rotations[:2])], misalignments))
+    with pytest.raises(OptionError):
+        EncoderLog.csv("log.csv", COLUMNS, axis=3)
@@ -1,7 +1,7 @@
 """Frame tests."""
 
 import numpy as np
-from rtsim.frame import Frame
+from rtsim.frame import Frame, constant_dcm, orientation_to_dcm, skew_symetric
 from rtsim.pva import ConstantPVA, TimePVA
 
 GCI = np.zeros((3, 1))
@@ -13,6 +13,8 @@ TLINEAR = TimePVA(p=GTI, v=GTI, a=GTI)
 CANGULAR = ConstantPVA(p=GCI, v=GCI, a=GCI)
 TANGULAR = TimePVA(p=GTI, v=GTI, a=GTI)
 
+ORIENTATION = np.random.default_rng(0).normal(size=(5, 3, 1))
+
 
 def test_frame_exists():
     """Verify ConstantPVA class exists."""
@@ -58,3 +60,57 @@ def test_full_frame():
     assert frame.C.ndim == ndim
     assert frame.Omega.ndim == ndim
     assert frame.Omega_dot.ndim == ndim
+
+
+def test_slice_fixed_frame():
+    """Verify slicing a Fixed coordinate frame returns the frame."""
+    frame = Frame(linear=CLINEAR, angular=CANGULAR)
+    assert frame.slice(slice(1, 3)) is frame
+
+
+def test_slice_full_frame():
+    """Verify slicing a Full coordinate frame selects time steps."""
+    frame = Frame(linear=TLINEAR, angular=TANGULAR)
+    sliced = frame.slice(slice(1, 3))
+    assert sliced.frame_type == "Full"
+    assert sliced.linear.p.shape == (2, 3, 1)
+    assert sliced.C.shape == (2, 3, 3)
+    assert np.shares_memory(sliced.angular.p, TANGULAR.p)
+
+
+def test_orientation_to_dcm():
+    """Verify DCMs against products of elementary rotations about x, then y, then z."""
+    C = orientation_to_dcm(ORIENTATION)
+    for v, dcm in zip(ORIENTATION[..., 0], C, strict=True):
+        (ca, cb, cg), (sa, sb, sg) = np.cos(v), np.sin(v)
+        x = np.array([[1.0, 0.0, 0.0], [0.0, ca, -sa], [0.0, sa, ca]])
+        y = np.array([[cb, 0.0, sb], [0.0, 1.0, 0.0], [-sb, 0.0, cb]])
+        z = np.array([[cg, -sg, 0.0], [sg, cg, 0.0], [0.0, 0.0, 1.0]])
+        assert np.allclose(dcm, z @ y @ x, rtol=0.0, atol=1e-15)
+    assert np.allclose(orientation_to_dcm(ORIENTATION[2]), C[2], rtol=0.0, atol=1e-15)
+
+
+def test_conversions_out():
+    """Verify the conversions write into a provided buffer."""
+    out = np.empty((5, 3, 3))
+    assert orientation_to_dcm(ORIENTATION, out=out) is out
+    assert np.array_equal(out, orientation_to_dcm(ORIENTATION))
+    assert skew_symetric(ORIENTATION, out=out) is out
+    assert np.array_equal(out, skew_symetric(ORIENTATION))
+    assert np.array_equal(out[:, 0, 1], -ORIENTATION[:, 2, 0])
+    assert np.array_equal(np.diagonal(out, axis1=1, axis2=2), np.zeros((5, 3)))
+
+
+def test_single_step_conversions():
+    """Verify a single time step keeps its time axis."""
+    assert orientation_to_dcm(ORIENTATION[:1]).shape == (1, 3, 3)
+    assert skew_symetric(ORIENTATION[:1]).shape == (1, 3, 3)
+
+
+def test_constant_dcm():
+    """Verify equal constant orientations share a read-only DCM."""
+    C = constant_dcm(ORIENTATION[1])
+    assert constant_dcm(ORIENTATION[1].copy()) is C
+    assert not C.flags.writeable
+    assert np.array_equal(C, orientation_to_dcm(ORIENTATION[1]))
+    assert Frame(linear=CLINEAR, angular=ConstantPVA(p=ORIENTATION[1], v=GCI, a=GCI)).C is C
@@ -0,0 +1,69 @@
+"""Monte Carlo runner tests."""
+
+import numpy as np
+from rtsim import Frame, TimePVA
+from rtsim.kernel import OUTPUTS
+from rtsim.montecarlo import MonteCarlo, _combine
+from .test_testbed import scenario
+
+
+def sampler(rng, time):
+    """Draw a misalignment set for three axes."""
+
+    def noise():
+        return rng.normal(scale=1e-3, size=(time.size, 3, 1))
+
+    return [Frame(TimePVA(p=noise(), v=noise(), a=noise()), TimePVA(p=noise(), v=noise(), a=noise())) for _ in range(3)]
+
+
+def test_run(tmp_path):
+    """Test Monte Carlo statistics and result cube against batch processing."""
+    testbed, time, _, rotations = scenario(steps=50)
+    runner = MonteCarlo(testbed, time, rotations, sampler)
+    count = 7
+
+    result = runner.run(count, seed=3, workers=2, batch_size=3, path=tmp_path)
+
+    misalignments = [
+        sampler(np.random.default_rng(np.random.SeedSequence(3, spawn_key=(i,))), time) for i in range(count)
+    ]
+    expected = testbed.process_batch(time, misalignments, rotations)
+
+    assert result.count == count
+    for name in OUTPUTS:
+        assert np.allclose(result.cube[name], expected[name], rtol=0.0, atol=1e-12)
+        assert np.allclose(result.mean[name], expected[name].mean(axis=0), rtol=0.0, atol=1e-12)
+        assert np.allclose(result.std[name], expected[name].std(axis=0, ddof=1), rtol=0.0, atol=1e-12)
+
+
+def test_reproducible():
+    """Test results do not depend on the number of workers or the task size."""
+    testbed, time, _, rotations = scenario(steps=50)
+    runner = MonteCarlo(testbed, time, rotations, sampler)
+
+    first = runner.run(6, seed=1, workers=1, batch_size=6)
+    second = runner.run(6, seed=1, workers=2, batch_size=2)
+
+    assert first.cube is None
+    for name in OUTPUTS:
+        assert np.allclose(first.mean[name], second.mean[name], rtol=0.0, atol=1e-12)
+        assert np.allclose(first.std[name], second.std[name], rtol=0.0, atol=1e-12)
+
+
+def test_combine():
+    """Test folding task statistics one at a time gives the statistics of all realizations."""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(10, 4, 3, 1))
+
+    reduced = (0, {}, {})
+    for start, stop in ((0, 3), (3, 4), (4, 10)):
+        task = values[start:stop]
+        mean = {name: task.mean(axis=0) for name in OUTPUTS}
+        m2 = {name: ((task - mean[name]) ** 2).sum(axis=0) for name in OUTPUTS}
+        reduced = _combine(reduced, (stop - start, mean, m2))
+
+    total, mean, m2 = reduced
+    assert total == len(values)
+    for name in OUTPUTS:
+        assert np.allclose(mean[name], values.mean(axis=0), rtol=0.0, atol=1e-12)
+        assert np.allclose(m2[name] / (total - 1), values.var(axis=0, ddof=1), rtol=0.0, atol=1e-12)
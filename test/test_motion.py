@@ -0,0 +1,105 @@
+"""Motion profile tests."""
+
+from itertools import pairwise
+from math import tau
+import numpy as np
+import pytest
+from rtsim import PackedPVA
+from rtsim.exceptions import ComponentTypeError, MaxValueError, OptionError
+from rtsim.motion import Command, Hold, Oscillation, Profile, PulseTrain, RateMove
+
+STEPS = 20000
+
+
+def assert_consistent(pva: np.ndarray, time: np.ndarray) -> None:
+    """Verify the angle and rate of a profile are the integrals of its rate and acceleration."""
+    dt = np.diff(time)
+    for x, dx in pairwise(pva):
+        integral = np.concatenate([[x[0]], x[0] + np.cumsum(0.5 * (dx[1:] + dx[:-1]) * dt)])
+        assert np.allclose(integral, x, atol=10 * dt.max() * np.abs(dx).max())
+
+
+def test_rate_move():
+    """Verify a trapezoidal rate move against its integrated acceleration pulses."""
+    time = np.arange(STEPS) * 1e-3
+    rate, ramp, start, cruise = tau / 6, 0.6, 2.0, 7.2
+    pva = Profile([RateMove(rate, start, cruise + ramp, ramp)]).evaluate(time)
+
+    accel = np.zeros_like(time)
+    stop = start + cruise
+    accel[(time >= start) & (time < start + ramp)] = rate / ramp
+    accel[(time >= stop) & (time < stop + ramp)] = -rate / ramp
+    omega = np.cumsum(accel) * 1e-3
+
+    assert np.allclose(pva[2], accel)
+    assert np.allclose(pva[1], omega, atol=2 * rate / ramp * 1e-3)
+    assert pva[1].max() == pytest.approx(rate)
+    assert pva[0, -1] == pytest.approx(rate * cruise)
+    assert_consistent(pva, time)
+
+
+def test_pulse_train():
+    """Verify a pulse train equals its rate moves."""
+    time = np.arange(STEPS) * 1e-3
+    count, period = 3, 5.0
+    train = Profile([PulseTrain(1.0, 1.0, 2.0, 0.5, period=period, count=count)]).evaluate(time)
+    moves = Profile([RateMove(1.0, 1.0 + k * period, 2.0, 0.5) for k in range(count)]).evaluate(time)
+    assert np.allclose(train, moves)
+    assert_consistent(train, time)
+
+
+def test_oscillation_hold():
+    """Verify an oscillation about a held angle, and the hold after it."""
+    time = np.arange(STEPS) * 1e-3
+    angle, amplitude, frequency, start, duration = 0.5, 0.1, 2.0, 1.0, 4.0
+    pva = Profile([Hold(angle), Oscillation(amplitude, frequency, start, duration)]).evaluate(time)
+    window = (time >= start) & (time < start + duration)
+    phase = tau * frequency * (time[window] - start)
+    assert np.allclose(pva[0, window], angle + amplitude * np.sin(phase))
+    assert np.allclose(pva[2, window], -amplitude * (tau * frequency) ** 2 * np.sin(phase))
+    assert np.allclose(pva[0, ~window], angle)
+    assert (pva[1:, ~window] == 0.0).all()
+
+
+def test_profile_chunks():
+    """Verify evaluating a chunk of time steps equals slicing the full evaluation."""
+    time = np.arange(STEPS) * 1e-3
+    profile = Profile([RateMove(1.0, 0.5, 3.0, 0.25), Oscillation(0.2, 0.7, start=4.0)])
+    full = profile.evaluate(time)
+    chunk = slice(3000, 7000)
+    assert np.array_equal(profile.evaluate(time[chunk]), full[:, chunk])
+
+
+def test_profile_frame():
+    """Verify the profile frame is a rotating frame about the profile axis."""
+    time = np.arange(100) * 1e-3
+    frame = Profile([Oscillation(0.2, 1.0)], axis=1).frame(time)
+    assert frame.frame_type == "Rotating"
+    assert isinstance(frame.angular, PackedPVA)
+    assert np.array_equal(frame.angular.p[:, 1, 0], Profile([Oscillation(0.2, 1.0)]).evaluate(time)[0])
+    assert (frame.angular.p[:, [0, 2]] == 0.0).all()
+    assert (frame.linear.p == 0.0).all()
+
+
+def test_profile_invalid():
+    """Verify invalid commands and profiles are rejected."""
+    with pytest.raises(MaxValueError):
+        RateMove(1.0, 0.0, 1.0, 0.6)
+    with pytest.raises(MaxValueError):
+        PulseTrain(1.0, 0.0, 2.0, 0.5, period=1.0, count=2)
+    with pytest.raises(ComponentTypeError):
+        Profile([1.0])
+    with pytest.raises(OptionError):
+        Profile([Hold(0.0)], axis=3)
+
+
+def test_command_abstract():
+    """Verify a command without an evaluation fails when it is instantiated."""
+
+    class Incomplete(Command):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    hold = Hold(1.0).evaluate(np.arange(3.0))
+    assert all((x == 0.0).all() and x.shape == (3,) for x in hold)
@@ -0,0 +1,104 @@
+"""Packed PVA tests."""
+
+import copy
+import numpy as np
+import pytest
+from rtsim import ConstantPVA, Frame, PackedPVA, TimePVA
+from rtsim.exceptions import ColCountError, MatrixTypeError, NumDimError, RowCountError, TimeCountError
+
+GTI = np.arange(15.0).reshape(5, 3, 1)
+
+
+def test_packed_views():
+    """Verify the position, velocity and acceleration are views of the buffer."""
+    pva = PackedPVA.pack(TimePVA(p=GTI, v=2 * GTI, a=3 * GTI))
+    assert pva.buffer.shape == (3, 5, 3, 1)
+    assert pva.buffer.flags.c_contiguous
+    for k, x in enumerate((pva.p, pva.v, pva.a), start=1):
+        assert np.shares_memory(x, pva.buffer)
+        assert np.array_equal(x, k * GTI)
+
+
+def test_packed_assign():
+    """Verify assigning a vector copies into the buffer."""
+    pva = PackedPVA.zeros(5)
+    buffer = pva.buffer
+    pva.v = GTI
+    pva.a = np.ones((5, 3, 1))
+    assert pva.buffer is buffer
+    assert np.array_equal(pva.v, GTI)
+    assert (pva.a == 1.0).all()
+    assert (pva.p == 0.0).all()
+
+
+@pytest.mark.parametrize(
+    ("value", "error"),
+    [
+        (1.0, MatrixTypeError),
+        (GTI[0], NumDimError),
+        (GTI[:4], TimeCountError),
+        (np.zeros((5, 2, 1)), RowCountError),
+        (np.zeros((5, 3, 2)), ColCountError),
+    ],
+)
+def test_packed_assign_invalid(value, error):
+    """Test an assigned vector is validated against the buffer before it is copied."""
+    pva = PackedPVA.zeros(5)
+    for name in ("p", "v", "a"):
+        with pytest.raises(error):
+            setattr(pva, name, value)
+    assert (pva.buffer == 0.0).all()
+
+
+def test_packed_slots():
+    """Verify packed PVA, and the other PVA, hold no instance dictionary."""
+    for pva in (PackedPVA.zeros(5), TimePVA(p=GTI, v=GTI, a=GTI), ConstantPVA(p=GTI[0], v=GTI[0], a=GTI[0])):
+        assert not hasattr(pva, "__dict__")
+    assert not isinstance(PackedPVA.zeros(5), TimePVA)
+    assert [name for cls in PackedPVA.__mro__ for name in getattr(cls, "__slots__", ())] == ["buffer"]
+
+
+def test_packed_slice():
+    """Verify slicing a packed PVA views the selected time steps."""
+    pva = PackedPVA.pack(TimePVA(p=GTI, v=GTI, a=GTI))
+    part = pva.slice(slice(1, 3))
+    assert isinstance(part, PackedPVA)
+    assert np.shares_memory(part.buffer, pva.buffer)
+    assert np.array_equal(part.v, GTI[1:3])
+
+
+def test_packed_view():
+    """Verify a packed PVA is viewed as a time varying PVA sharing its buffer."""
+    pva = PackedPVA.pack(TimePVA(p=GTI, v=2 * GTI, a=3 * GTI))
+    view = pva.view()
+    assert type(view) is TimePVA
+    for x, y in ((view.p, pva.p), (view.v, pva.v), (view.a, pva.a)):
+        assert np.shares_memory(x, pva.buffer)
+        assert np.array_equal(x, y)
+
+
+def test_packed_frame_copy():
+    """Verify a frame of packed PVA is time varying and a packed PVA can be copied."""
+    pva = PackedPVA.pack(TimePVA(p=GTI, v=GTI, a=GTI))
+    frame = Frame(pva, pva)
+    assert frame.frame_type == "Full"
+
+    duplicate = copy.deepcopy(pva)
+    assert np.array_equal(duplicate.buffer, pva.buffer)
+    assert not np.shares_memory(duplicate.buffer, pva.buffer)
+
+
+@pytest.mark.parametrize(
+    ("buffer", "error"),
+    [
+        (GTI.tolist(), MatrixTypeError),
+        (GTI, NumDimError),
+        (np.zeros((2, 5, 3, 1)), RowCountError),
+        (np.zeros((3, 5, 2, 1)), RowCountError),
+        (np.zeros((3, 5, 3, 2)), ColCountError),
+    ],
+)
+def test_packed_invalid(buffer, error):
+    """Test the buffer is validated on construction."""
+    with pytest.raises(error):
+        PackedPVA(buffer)
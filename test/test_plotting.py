@@ -0,0 +1,61 @@
+"""Plotting tests."""
+
+import subprocess
+import sys
+import numpy as np
+import pytest
+from rtsim.plotting import decimate, unit_modifier
+from .test_testbed import scenario
+
+
+def test_import_without_matplotlib():
+    """Verify importing the package does not import matplotlib."""
+    code = "import sys, rtsim; print('matplotlib' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # noqa: S603
+    assert result.stdout.strip() == "False"
+
+
+def test_decimate():
+    """Verify decimation keeps the minimum and maximum of each bucket in time order."""
+    rng = np.random.default_rng(0)
+    time = np.arange(10_007) * 1e-3
+    x = rng.normal(size=time.size)
+    buckets = 100
+
+    t, y = decimate(time, x, buckets)
+    assert t.size <= 2 * buckets
+    assert np.all(np.diff(t) >= 0.0)
+    assert y.max() == x.max()
+    assert y.min() == x.min()
+    assert np.isin(t, time).all()
+
+    short = time[: 2 * buckets]
+    assert decimate(short, x[: 2 * buckets], buckets)[0] is short
+
+
+def test_unit_modifier():
+    """Verify the SI prefix of the largest magnitude."""
+    assert unit_modifier(np.zeros((5, 3, 1))) == (0, "")
+    assert unit_modifier(np.array([1e-4, -2e-4])) == (6.0, r"\micro")
+    assert unit_modifier(np.array([2.0e3])) == (-3.0, r"\kilo")
+
+
+def test_plot():
+    """Verify plotting leaves the global matplotlib settings alone."""
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    testbed, time, misalignments, rotations = scenario(steps=5000)
+    testbed.process(time, misalignments, rotations)
+    params = dict(matplotlib.rcParams)
+
+    for separate in (False, True):
+        testbed.plot(variable="sf", separate=separate)
+        fig = plt.gcf()
+        fig.canvas.draw()
+        for line in fig.axes[0].get_lines():
+            assert line.get_xdata().size < time.size
+        plt.close(fig)
+
+    assert dict(matplotlib.rcParams) == params
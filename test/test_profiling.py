@@ -0,0 +1,78 @@
+"""Profiling tests."""
+
+import json
+import numpy as np
+from rtsim import profiling
+from rtsim.profiling import Profiler
+from .test_testbed import scenario
+
+
+def test_disabled():
+    """Verify stages do nothing without an active profiler."""
+    assert profiling.active() is None
+    assert profiling.stage("a") is profiling.stage("b")
+    with Profiler() as profiler:
+        assert profiling.active() is profiler
+        with profiling.stage("a"):
+            pass
+    assert profiling.active() is None
+    with profiling.stage("b"):
+        pass
+    assert [event.name for event in profiler.events] == ["a"]
+
+
+def test_reference_stages():
+    """Verify the stages of the reference method, their nesting and the memory they allocate."""
+    testbed, time, misalignments, rotations = scenario(steps=1000)
+    received = []
+
+    with Profiler(memory=True, callbacks=[received.append]) as profiler:
+        testbed.process(time, misalignments, rotations)
+
+    summary = profiler.summary()
+    assert received == profiler.events
+    assert list(summary) == [
+        "World.process",
+        "Axis.process",
+        "Cib",
+        "inertial",
+        "body",
+        "precision error",
+        "Testbed.process",
+    ]
+    assert summary["Axis.process"]["calls"] == len(testbed.axes)
+    monikers = [event.args["axis"] for event in profiler.events if event.name == "Axis.process"]
+    assert monikers == [axis.moniker for axis in testbed.axes]
+
+    root = profiler.events[-1]
+    assert root.depth == 0
+    assert all(event.depth == 1 for event in profiler.events[:-1])
+    assert all(0.0 <= event.duration <= root.duration for event in profiler.events)
+    assert all(event.peak >= max(event.allocated, 0) for event in profiler.events)
+    assert all(root.peak >= event.peak for event in profiler.events)
+    assert root.allocated >= 8 * time.size * 3 * 8
+
+
+def test_fused_trace(tmp_path):
+    """Verify the stages of the fused kernel are exported as a Chrome trace."""
+    testbed, time, misalignments, rotations = scenario(steps=100)
+    profiler = Profiler()
+    profiler.start()
+    testbed.process(time, misalignments, rotations, method="fused", workers=2)
+    profiler.stop()
+
+    summary = profiler.summary()
+    assert summary["shard"]["calls"] == 1
+    assert summary["axis_step"]["calls"] == len(testbed.axes)
+    assert "peak" not in summary["Testbed.process"]
+
+    profiler.write_trace(tmp_path / "trace.json")
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    events = trace["traceEvents"]
+    assert len(events) == len(profiler.events)
+    assert {event["ph"] for event in events} == {"X"}
+    assert [event["args"]["axis"] for event in events if event["name"] == "axis_step"] == [0, 1, 2]
+    assert np.all(np.array([event["dur"] for event in events]) >= 0.0)
+
+    profiler.clear()
+    assert profiler.summary() == {}
@@ -0,0 +1,75 @@
+"""Quaternion tests."""
+
+import numpy as np
+from rtsim.frame import Frame, orientation_to_dcm
+from rtsim.pva import ConstantPVA, TimePVA
+from rtsim.quaternion import (
+    dcm_to_quaternion,
+    multiply,
+    normalize,
+    orientation_to_quaternion,
+    quaternion_to_dcm,
+)
+
+RNG = np.random.default_rng(0)
+
+ORIENTATION = RNG.normal(scale=2.0, size=(50, 3, 1))
+OTHER = RNG.normal(scale=2.0, size=(50, 3, 1))
+
+
+def test_orientation_to_quaternion():
+    """Verify the quaternion of an orientation matches its direction cosine matrix."""
+    q = orientation_to_quaternion(ORIENTATION)
+    assert q.shape == (50, 4)
+    assert np.allclose(np.linalg.norm(q, axis=-1), 1.0)
+    assert np.allclose(quaternion_to_dcm(q), orientation_to_dcm(ORIENTATION), rtol=0.0, atol=1e-14)
+
+
+def test_constant_orientation():
+    """Verify a constant orientation gives a single quaternion."""
+    q = orientation_to_quaternion(ORIENTATION[0])
+    assert q.shape == (4,)
+    assert np.allclose(quaternion_to_dcm(q), orientation_to_dcm(ORIENTATION[0]), rtol=0.0, atol=1e-14)
+
+
+def test_multiply():
+    """Verify the quaternion product matches the direction cosine matrix product."""
+    q = multiply(orientation_to_quaternion(ORIENTATION), orientation_to_quaternion(OTHER))
+    expected = orientation_to_dcm(ORIENTATION) @ orientation_to_dcm(OTHER)
+    assert np.allclose(quaternion_to_dcm(q), expected, rtol=0.0, atol=1e-14)
+
+
+def test_dcm_to_quaternion():
+    """Verify the round trip from a direction cosine matrix."""
+    C = orientation_to_dcm(ORIENTATION)
+    q = dcm_to_quaternion(C)
+    assert (q[..., 0] >= 0.0).all()
+    assert np.allclose(quaternion_to_dcm(q), C, rtol=0.0, atol=1e-14)
+
+
+def test_dcm_to_quaternion_half_turn():
+    """Verify the round trip of half turn rotations, where the scalar part vanishes."""
+    axes = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [1.0, -1.0, 0.0], [1.0, 2.0, -3.0]])
+    axes /= np.linalg.norm(axes, axis=-1, keepdims=True)
+    C = 2.0 * axes[:, :, None] * axes[:, None, :] - np.eye(3)
+    q = dcm_to_quaternion(C)
+    assert np.allclose(np.abs(q[:, 1:]), np.abs(axes), rtol=0.0, atol=1e-14)
+    assert np.allclose(quaternion_to_dcm(q), C, rtol=0.0, atol=1e-14)
+    assert np.allclose(quaternion_to_dcm(dcm_to_quaternion(C[3])), C[3], rtol=0.0, atol=1e-14)
+
+
+def test_normalize():
+    """Verify quaternions are scaled to unit norm in place."""
+    q = 3.0 * orientation_to_quaternion(ORIENTATION)
+    assert normalize(q) is q
+    assert np.allclose(np.linalg.norm(q, axis=-1), 1.0)
+
+
+def test_frame_quaternion():
+    """Verify the frame quaternion follows an assigned direction cosine matrix."""
+    zeros = np.zeros((50, 3, 1))
+    frame = Frame(ConstantPVA(p=zeros[0], v=zeros[0], a=zeros[0]), TimePVA(p=ORIENTATION, v=zeros, a=zeros))
+    assert np.allclose(quaternion_to_dcm(frame.q), frame.C, rtol=0.0, atol=1e-14)
+
+    frame.C = np.swapaxes(frame.C, -1, -2)
+    assert np.allclose(quaternion_to_dcm(frame.q), frame.C, rtol=0.0, atol=1e-14)
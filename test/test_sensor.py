@@ -0,0 +1,126 @@
+"""IMU sensor model tests."""
+
+import numpy as np
+import pytest
+from rtsim.exceptions import ComponentTypeError, MinValueError
+from rtsim.sensor import IMU, Sensor
+from .test_testbed import scenario
+
+GYRO = Sensor(
+    scale_factor=1e-4,
+    misalignment=1e-4,
+    bias=1e-5,
+    bias_instability=1e-6,
+    correlation_time=0.5,
+    noise=1e-5,
+    quantization=1e-7,
+)
+ACCEL = Sensor(
+    scale_factor=1e-4,
+    misalignment=1e-4,
+    bias=1e-3,
+    bias_instability=1e-4,
+    correlation_time=0.5,
+    noise=1e-4,
+    quantization=1e-5,
+)
+
+
+def signals(steps=1000, seed=1):
+    """Draw angular velocity and specific force histories."""
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(steps, 3, 1)), rng.normal(size=(steps, 3, 1)) + 9.8
+
+
+def test_imu_ideal():
+    """Verify a sensor without errors outputs its inputs."""
+    avbib, sfbib = signals()
+    gyro, accel = IMU(Sensor(), Sensor(), 1e-3).process(avbib, sfbib)
+    assert np.array_equal(gyro, avbib)
+    assert np.array_equal(accel, sfbib)
+
+
+def test_imu_constant_errors():
+    """Verify the scale factor, misalignment and bias of each instance are constant in time."""
+    avbib, _ = signals()
+    count = 4
+    sensor = Sensor(scale_factor=1e-3, misalignment=1e-3, bias=1e-2)
+    gyro, _ = IMU(sensor, Sensor(), 1e-3, count=count).process(avbib, avbib)
+    assert gyro.shape == (count, *avbib.shape)
+
+    # Each instance is an affine map of the input, recovered by least squares
+    A = np.concatenate([avbib[:, :, 0], np.ones((avbib.shape[0], 1))], axis=1)
+    for y in gyro[..., 0]:
+        coefficients, residuals, *_ = np.linalg.lstsq(A, y, rcond=None)
+        assert np.allclose(residuals, 0.0, atol=1e-20)
+        assert not np.allclose(coefficients[:3], np.eye(3))
+        assert np.allclose(coefficients[:3], np.eye(3), atol=1e-2)
+
+
+def test_imu_gauss_markov():
+    """Verify the bias instability follows the Gauss-Markov recursion."""
+    dt, steps = 1e-3, 5000
+    sensor = Sensor(bias_instability=1e-3, correlation_time=1e-3)
+    zero = np.zeros((steps, 3, 1))
+    gyro, _ = IMU(sensor, Sensor(), dt).process(zero, zero)
+
+    phi = np.exp(-dt / sensor.correlation_time)
+    w = gyro[1:, :, 0] - phi * gyro[:-1, :, 0]
+    assert np.std(gyro) == pytest.approx(sensor.bias_instability, rel=0.1)
+    assert np.std(w) == pytest.approx(sensor.bias_instability * np.sqrt(1 - phi**2), rel=0.1)
+    assert abs(np.corrcoef(w[1:].ravel(), w[:-1].ravel())[0, 1]) < 0.1  # noqa: PLR2004
+
+
+def test_imu_quantization():
+    """Verify quantized increments are whole counts that track the integrated input."""
+    dt, lsb = 1e-3, 1e-4
+    avbib, _ = signals()
+    gyro, _ = IMU(Sensor(quantization=lsb), Sensor(), dt).process(avbib, avbib)
+    counts = gyro * dt / lsb
+    assert np.allclose(counts, np.round(counts))
+    assert np.abs(np.cumsum(gyro - avbib, axis=0) * dt).max() <= lsb / 2 + 1e-12
+
+
+def test_imu_chunks():
+    """Verify processing a run in chunks equals processing it at once."""
+    avbib, sfbib = signals()
+    imu = IMU(GYRO, ACCEL, 1e-3, count=3, seed=7)
+    gyro, accel = imu.process(avbib, sfbib)
+
+    imu.reset()
+    chunks = [
+        (slice(k, k + 300), {"avbib": avbib[k : k + 300], "sfbib": sfbib[k : k + 300]}) for k in range(0, 1000, 300)
+    ]
+    results = list(imu.process_iter(chunks))
+    assert np.allclose(np.concatenate([r["gyro"] for _, r in results], axis=1), gyro, rtol=0.0, atol=1e-15)
+    assert np.allclose(np.concatenate([r["accel"] for _, r in results], axis=1), accel, rtol=0.0, atol=1e-15)
+
+
+def test_imu_testbed():
+    """Verify the sensor model consumes testbed outputs, streamed or whole, and is reproducible."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations)
+    dt = time[1] - time[0]
+
+    gyro, accel = IMU(GYRO, ACCEL, dt, seed=3).process(testbed.avbib, testbed.sfbib)
+    again = IMU(GYRO, ACCEL, dt, seed=3).process(testbed.avbib, testbed.sfbib)
+    assert np.array_equal(gyro, again[0])
+    assert np.array_equal(accel, again[1])
+    assert not np.array_equal(gyro, IMU(GYRO, ACCEL, dt, seed=4).process(testbed.avbib, testbed.sfbib)[0])
+
+    chunks = testbed.process_iter(time, misalignments, rotations, chunk_size=64, outputs=("avbib", "sfbib"))
+    streamed = list(IMU(GYRO, ACCEL, dt, seed=3).process_iter(chunks))
+    assert np.allclose(np.concatenate([r["gyro"] for _, r in streamed]), gyro, rtol=0.0, atol=1e-12)
+    assert np.allclose(np.concatenate([r["accel"] for _, r in streamed]), accel, rtol=0.0, atol=1e-9)
+
+
+def test_imu_invalid():
+    """Verify invalid specifications are rejected."""
+    with pytest.raises(MinValueError):
+        Sensor(noise=-1.0)
+    with pytest.raises(MinValueError):
+        Sensor(correlation_time=0.0)
+    with pytest.raises(ComponentTypeError):
+        IMU(GYRO, None, 1e-3)
+    with pytest.raises(MinValueError):
+        IMU(GYRO, ACCEL, 1e-3, count=0)
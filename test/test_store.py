@@ -0,0 +1,58 @@
+"""Output store tests."""
+
+import numpy as np
+import pytest
+from rtsim.kernel import OUTPUTS
+from rtsim.store import MANIFEST, OutputStore
+from .test_testbed import scenario
+
+
+def test_process_to(tmp_path):
+    """Test writing a run to an output store against processing in memory."""
+    testbed, time, misalignments, rotations = scenario(steps=203)
+    testbed.process(time, misalignments, rotations)
+    reference = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    store = testbed.process_to(tmp_path / "run", time, misalignments, rotations, chunk_size=50, method="fused")
+
+    assert (tmp_path / "run" / MANIFEST).exists()
+    assert isinstance(testbed.sfbib, np.memmap)
+    assert (store["time"] == time).all()
+    for name in OUTPUTS:
+        assert np.allclose(store[name], reference[name], rtol=0.0, atol=1e-12)
+
+
+def test_open(tmp_path):
+    """Test reopening a finished run read-only."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process_to(tmp_path, time, misalignments, rotations)
+
+    store = OutputStore.open(tmp_path)
+
+    assert isinstance(store["sfbib"], np.memmap)
+    assert not store["sfbib"].flags.writeable
+    assert (store["sfbib"] == testbed.sfbib).all()
+
+
+def interrupted_run(path):
+    """Write one chunk of a run and fail."""
+    with OutputStore.create(path, np.arange(10.0)) as store:
+        store.write(slice(0, 10), {"sfbib": np.zeros((10, 3, 1))})
+        raise KeyError
+
+
+def test_unfinished_run(tmp_path):
+    """Test a run interrupted by an error is not reopened."""
+    with pytest.raises(KeyError):
+        interrupted_run(tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        OutputStore.open(tmp_path)
+
+
+def test_writer_error(tmp_path):
+    """Test errors in the background writer are raised by close."""
+    store = OutputStore.create(tmp_path, np.arange(10.0))
+    store.write(slice(0, 10), {"sfbib": np.zeros((4, 3, 1))})
+    with pytest.raises(ValueError):  # noqa: PT011
+        store.close()
@@ -0,0 +1,121 @@
+"""Arrow and Parquet table tests."""
+
+import numpy as np
+import polars as pl
+import pytest
+from rtsim import PackedPVA
+from rtsim.exceptions import OptionError
+from rtsim.kernel import OUTPUTS
+from rtsim.motion import Oscillation, Profile
+from rtsim.table import VECTOR, _scan_chunks, iter_rotations, read_rotations, to_arrow, to_polars
+from .test_testbed import scenario
+
+
+def test_to_polars():
+    """Verify the data frame of a run shares the buffers of the outputs."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations)
+    frame = testbed.to_polars()
+
+    assert frame.columns == ["time", *OUTPUTS]
+    assert frame.schema["aviib"] == VECTOR
+    for name in OUTPUTS:
+        column = frame.get_column(name).to_numpy()
+        assert np.array_equal(column, getattr(testbed, name)[..., 0])
+        assert np.shares_memory(column, getattr(testbed, name))
+
+    with pytest.raises(OptionError):
+        testbed.to_polars(("aviib", "speed"))
+
+
+def test_to_arrow():
+    """Verify the Arrow export matches the data frame of the outputs."""
+    pytest.importorskip("pyarrow")
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations)
+
+    arrow = testbed.to_arrow(("avbib",))
+    assert arrow.column_names == ["time", "avbib"]
+    assert arrow.num_rows == time.size
+    assert pl.from_arrow(arrow).equals(testbed.to_polars(("avbib",)))
+    assert to_arrow(time, {"avbib": testbed.avbib}).equals(arrow)
+
+    with pytest.raises(OptionError):
+        testbed.to_arrow(("avbib", "speed"))
+
+
+def test_write_parquet(tmp_path):
+    """Verify a run round trips through a Parquet file."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations)
+    testbed.write_parquet(tmp_path / "run.parquet", outputs=("avbib", "sfbib"), row_group_size=64)
+
+    frame = pl.read_parquet(tmp_path / "run.parquet")
+    assert frame.columns == ["time", "avbib", "sfbib"]
+    assert np.array_equal(frame.get_column("time").to_numpy(), time)
+    assert np.array_equal(frame.get_column("sfbib").to_numpy()[..., None], testbed.sfbib)
+
+
+def test_process_to_parquet(tmp_path):
+    """Verify streaming a run to Parquet matches processing it in memory."""
+    testbed, time, misalignments, rotations = scenario(steps=203)
+    testbed.process_to_parquet(tmp_path / "run.parquet", time, misalignments, rotations, chunk_size=50)
+    testbed.process(time, misalignments, rotations)
+
+    frame = pl.read_parquet(tmp_path / "run.parquet")
+    assert frame.columns == ["time", *OUTPUTS]
+    for name in OUTPUTS:
+        assert np.allclose(frame.get_column(name).to_numpy()[..., None], getattr(testbed, name), rtol=0.0, atol=1e-12)
+
+
+def test_scan_chunks():
+    """Verify the streamed chunks of a run apply a filter, a column selection and a row limit."""
+    testbed, time, misalignments, rotations = scenario(steps=203)
+    testbed.process(time, misalignments, rotations)
+    expected = to_polars(time, {name: getattr(testbed, name) for name in OUTPUTS})
+
+    def chunks(read):
+        for chunk, outputs in testbed.process_iter(time, misalignments, rotations, chunk_size=50):
+            read.append(chunk)
+            yield chunk, outputs
+
+    read = []
+    query = _scan_chunks(time, chunks(read), OUTPUTS).filter(pl.col("time") > 1.0).select("sfbib")
+    assert query.collect().equals(expected.filter(pl.col("time") > 1.0).select("sfbib"))
+    assert read[-1].stop == time.size
+
+    read = []
+    assert _scan_chunks(time, chunks(read), OUTPUTS).head(60).collect().equals(expected.head(60))
+    assert [chunk.stop for chunk in read] == [50, 100]
+
+
+def test_read_rotations(tmp_path):
+    """Verify rotating frames are read from scalar and vector columns, whole or in chunks."""
+    time = np.arange(1000) * 1e-3
+    pva = Profile([Oscillation(0.2, 2.0)]).evaluate(time)
+    vector = np.zeros((time.size, 3))
+    vector[:, 0] = pva[2]
+    pl.DataFrame(
+        [
+            pl.Series("time", time),
+            pl.Series("theta", pva[0]),
+            pl.Series("omega", pva[1]),
+            pl.Series("omega_dot", vector, dtype=VECTOR),
+            pl.Series("unused", time),
+        ]
+    ).write_parquet(tmp_path / "profile.parquet", row_group_size=256)
+
+    columns = [("theta", "omega", "omega_dot")]
+    t, (frame,) = read_rotations(tmp_path / "profile.parquet", columns)
+    assert np.array_equal(t, time)
+    assert frame.frame_type == "Rotating"
+    assert isinstance(frame.angular, PackedPVA)
+    assert np.array_equal(frame.angular.p[:, 2, 0], pva[0])
+    assert np.array_equal(frame.angular.v[:, 2, 0], pva[1])
+    assert np.array_equal(frame.angular.a[..., 0], vector)
+
+    chunks = list(iter_rotations(tmp_path / "profile.parquet", columns, chunk_size=300))
+    assert [chunk for chunk, *_ in chunks] == [slice(0, 300), slice(300, 600), slice(600, 900), slice(900, 1000)]
+    for chunk, t, (frame,) in chunks:
+        assert np.array_equal(t, time[chunk])
+        assert np.array_equal(frame.angular.p[:, 2, 0], pva[0, chunk])
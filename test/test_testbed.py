@@ -1,10 +1,21 @@
 """Testbed tests."""
 
 from math import tau
+import tracemalloc
 import numpy as np
 import pytest
-from rtsim import Axis, Body, Frame, Mount, Testbed, World, ConstantPVA
-from rtsim.exceptions import ComponentTypeError, MaxValueError, MinValueError, NumberTypeError
+from rtsim import Axis, Body, Frame, Mount, Testbed, World, ConstantPVA, TimePVA
+from rtsim.exceptions import (
+    AxisCountError,
+    ComponentTypeError,
+    IntegerTypeError,
+    MaxValueError,
+    MinValueError,
+    NumberTypeError,
+    OptionError,
+)
+from rtsim import kernel
+from rtsim.kernel import OUTPUTS
 
 
 BODY = Body(
@@ -33,6 +44,41 @@ AXIS = Axis(
 
 WORLD = World("Terra", 6378137.0, 298.257223563, 72.921151467064e-6)
 
+LLHG = (35.05133916, -106.54504361, 1625.57, 9.7920631997)
+
+
+def scenario(steps=200, axes=3, seed=0):
+    """Build a testbed with non-trivial misalignments and rotations."""
+    rng = np.random.default_rng(seed)
+    time = np.arange(steps) * 1e-2
+
+    def noise(scale):
+        return rng.normal(scale=scale, size=(steps, 3, 1))
+
+    misalignments = [
+        Frame(
+            linear=TimePVA(p=noise(1e-3), v=noise(1e-3), a=noise(1e-3)),
+            angular=TimePVA(p=noise(1e-3), v=noise(1e-3), a=noise(1e-3)),
+        )
+        for _ in range(axes)
+    ]
+
+    rotations = []
+    for a in range(axes):
+        theta, omega, omega_dot = noise(0.1), noise(0.1), noise(0.1)
+        theta[:, 2, 0] += np.sin((a + 1) * time)
+        omega[:, 2, 0] += (a + 1) * np.cos((a + 1) * time)
+        omega_dot[:, 2, 0] -= (a + 1) ** 2 * np.sin((a + 1) * time)
+        rotations.append(
+            Frame(
+                linear=ConstantPVA(p=np.zeros((3, 1)), v=np.zeros((3, 1)), a=np.zeros((3, 1))),
+                angular=TimePVA(p=theta, v=omega, a=omega_dot),
+            )
+        )
+
+    testbed = Testbed("SART", llhg=LLHG, components=(WORLD, [AXIS] * axes, MOUNT, BODY))
+    return testbed, time, misalignments, rotations
+
 
 def test_testbed_exists():
     """Test existence of Testbed class."""
@@ -126,3 +172,523 @@ def test_body_incorrect():
     """Test body of inccorrect type."""
     with pytest.raises(ComponentTypeError):
         Testbed("SART", llhg=(35.05133916, -106.54504361, 1625.57, 9.792063), components=(WORLD, [AXIS], MOUNT, WORLD))
+
+
+@pytest.mark.parametrize("method", ["fused", "quaternion"])
+def test_method_matches_reference(method):
+    """Test the fused and quaternion evaluation methods against the reference method."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations)
+    reference = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    testbed.process(time, misalignments, rotations, method=method)
+
+    for name in OUTPUTS:
+        assert getattr(testbed, name).shape == reference[name].shape
+        assert np.allclose(getattr(testbed, name), reference[name], rtol=0.0, atol=1e-12)
+
+
+def test_quaternion_quarter_turns():
+    """Test the quaternion method against the reference for mounts and bodies turned by quarter turns."""
+    testbed, time, misalignments, rotations = scenario(steps=10)
+    turns = [tau / 4 * np.array([[a], [b], [c]]) for a in range(4) for b in range(4) for c in range(4)]
+
+    for mount in turns:
+        for body in (turns[8], turns[33], turns[55]):
+            testbed.mount = Mount(
+                "Turned", Frame(MOUNT.frame.linear, ConstantPVA(p=mount, v=np.zeros((3, 1)), a=np.zeros((3, 1))))
+            )
+            testbed.body = Body(
+                "Turned", Frame(BODY.frame.linear, ConstantPVA(p=body, v=np.zeros((3, 1)), a=np.zeros((3, 1))))
+            )
+            testbed.process(time, misalignments, rotations)
+            expected = {name: getattr(testbed, name) for name in OUTPUTS}
+            testbed.process(time, misalignments, rotations, method="quaternion")
+            for name in OUTPUTS:
+                assert np.allclose(getattr(testbed, name), expected[name], rtol=0.0, atol=1e-12)
+
+
+def sparsify(frames, attribute, field):
+    """Zero a field of the PVA of each frame, keeping the frame types."""
+    for frame in frames:
+        pva = getattr(frame, attribute)
+        values = {name: getattr(pva, name) for name in ("p", "v", "a")}
+        values[field] = np.zeros_like(values[field])
+        setattr(frame, attribute, type(pva)(**values))
+        frame.C = None
+
+
+@pytest.mark.parametrize("method", ["fused", "quaternion"])
+@pytest.mark.parametrize(
+    ("inputs", "attribute", "field"),
+    [
+        ("misalignments", "linear", "p"),
+        ("misalignments", "linear", "v"),
+        ("misalignments", "linear", "a"),
+        ("misalignments", "angular", "p"),
+        ("misalignments", "angular", "v"),
+        ("misalignments", "angular", "a"),
+        ("rotations", "angular", "p"),
+        ("rotations", "angular", "v"),
+        ("rotations", "angular", "a"),
+        ("all", None, None),
+    ],
+)
+def test_sparse_inputs(method, inputs, attribute, field):
+    """Test the skipped zero, identity and constant terms against the reference method."""
+    testbed, time, misalignments, rotations = scenario()
+    if inputs == "all":
+        for name in ("p", "v", "a"):
+            sparsify(misalignments, "linear", name)
+            sparsify(misalignments, "angular", name)
+            sparsify(rotations, "angular", name)
+        testbed = Testbed("Ideal", llhg=LLHG, components=(WORLD, [Axis("Plain", MOUNT.frame)] * 3, MOUNT, BODY))
+    else:
+        sparsify(misalignments if inputs == "misalignments" else rotations, attribute, field)
+
+    testbed.process(time, misalignments, rotations)
+    reference = {name: getattr(testbed, name) for name in OUTPUTS}
+    testbed.process(time, misalignments, rotations, method=method)
+
+    for name in OUTPUTS:
+        assert getattr(testbed, name).shape == reference[name].shape
+        assert np.allclose(getattr(testbed, name), reference[name], rtol=0.0, atol=1e-12)
+
+
+def test_unknown_method():
+    """Test processing with an unknown evaluation method."""
+    testbed, time, misalignments, rotations = scenario()
+    with pytest.raises(OptionError):
+        testbed.process(time, misalignments, rotations, method="fast")
+
+
+@pytest.mark.parametrize("method", ["reference", "fused", "quaternion"])
+def test_process_iter(method):
+    """Test chunked processing against processing the whole run."""
+    testbed, time, misalignments, rotations = scenario(steps=203)
+    testbed.process(time, misalignments, rotations)
+
+    chunks = list(testbed.process_iter(time, misalignments, rotations, chunk_size=50, method=method))
+
+    assert [chunk for chunk, _ in chunks] == [
+        slice(0, 50),
+        slice(50, 100),
+        slice(100, 150),
+        slice(150, 200),
+        slice(200, 203),
+    ]
+    for name in OUTPUTS:
+        result = np.concatenate([outputs[name] for _, outputs in chunks])
+        assert np.allclose(result, getattr(testbed, name), rtol=0.0, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["reference", "fused", "quaternion"])
+def test_process_single_step_chunk(monkeypatch, method):
+    """Test chunked and sharded processing when the last chunk is a single time step."""
+    testbed, time, misalignments, rotations = scenario(steps=101)
+    testbed.process(time, misalignments, rotations)
+    reference = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    chunks = list(testbed.process_iter(time, misalignments, rotations, chunk_size=50, method=method))
+    assert chunks[-1][0] == slice(100, 101)
+
+    monkeypatch.setattr("rtsim.testbed.SHARD_SIZE", 50)
+    testbed.process(time, misalignments, rotations, method=method, workers=2)
+
+    for name in OUTPUTS:
+        result = np.concatenate([outputs[name] for _, outputs in chunks])
+        assert result.shape == reference[name].shape
+        assert np.allclose(result, reference[name], rtol=0.0, atol=1e-12)
+        assert np.allclose(getattr(testbed, name), reference[name], rtol=0.0, atol=1e-12)
+
+
+def test_process_iter_chunk_size():
+    """Test chunked processing with an invalid chunk size."""
+    testbed, time, misalignments, rotations = scenario()
+    with pytest.raises(IntegerTypeError):
+        testbed.process_iter(time, misalignments, rotations, chunk_size=10.0)
+    with pytest.raises(MinValueError):
+        testbed.process_iter(time, misalignments, rotations, chunk_size=0)
+
+
+@pytest.mark.parametrize("method", ["reference", "fused", "quaternion"])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_process_workers(monkeypatch, method, workers):
+    """Test sharded multithreaded processing against processing the whole run."""
+    testbed, time, misalignments, rotations = scenario(steps=203)
+    testbed.process(time, misalignments, rotations)
+    reference = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    monkeypatch.setattr("rtsim.testbed.SHARD_SIZE", 50)
+    testbed.process(time, misalignments, rotations, method=method, workers=workers)
+
+    for name in OUTPUTS:
+        assert getattr(testbed, name).shape == reference[name].shape
+        assert np.allclose(getattr(testbed, name), reference[name], rtol=0.0, atol=1e-12)
+
+
+def test_process_workers_invalid():
+    """Test processing with an invalid number of workers."""
+    testbed, time, misalignments, rotations = scenario()
+    with pytest.raises(IntegerTypeError):
+        testbed.process(time, misalignments, rotations, workers=2.0)
+    with pytest.raises(MinValueError):
+        testbed.process(time, misalignments, rotations, workers=0)
+
+
+@pytest.mark.parametrize("method", ["reference", "fused", "quaternion"])
+@pytest.mark.parametrize("outputs", [("sfbib", "avbib"), ("sfiib",), ("labib", "sfiib"), ("aabib",), ()])
+def test_process_outputs(method, outputs):
+    """Test processing a subset of the outputs stores only them, and evaluates the others on access."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations, method=method)
+    expected = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    testbed.process(time, misalignments, rotations, method=method, outputs=outputs)
+    assert {name for name in OUTPUTS if name in vars(testbed)} == set(outputs)
+
+    for name in OUTPUTS:
+        assert np.allclose(getattr(testbed, name), expected[name], rtol=0.0, atol=1e-12)
+        assert name in vars(testbed)
+    assert testbed._pending is None
+
+
+def count_calls(monkeypatch, owner, name):
+    """Count the calls to a function or method."""
+    calls = []
+    function = getattr(owner, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return function(*args, **kwargs)
+
+    monkeypatch.setattr(owner, name, counted)
+    return calls
+
+
+@pytest.mark.parametrize("method", ["reference", "fused", "quaternion"])
+def test_process_outputs_shared(monkeypatch, method):
+    """Test outputs evaluated on access share the axis state and attitude chain."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations, method=method)
+    expected = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    steps = (
+        count_calls(monkeypatch, Axis, "process")
+        if method == "reference"
+        else count_calls(monkeypatch, kernel, "axis_step")
+    )
+    chains = count_calls(monkeypatch, kernel, "attitude_chain")
+    testbed.process(time, misalignments, rotations, method=method, outputs=())
+    assert not steps
+
+    for name in ("sfbib", "avbib", "aaiib", "labib", "laiib", "aabib", "aviib", "sfiib"):
+        assert np.allclose(getattr(testbed, name), expected[name], rtol=0.0, atol=1e-12)
+
+    assert len(steps) == len(testbed.axes)
+    assert len(chains) == (method != "reference")
+    assert testbed._pending is None
+
+
+@pytest.mark.parametrize("method", ["reference", "fused"])
+def test_process_outputs_memory(method):
+    """Test a run of some outputs retains less memory than a run of all of them."""
+    retained = {}
+    for outputs in (None, ("sfbib", "avbib")):
+        testbed, time, misalignments, rotations = scenario(steps=20000)
+        testbed.world = World("Terra", 6378137.0, 298.257223563, 72.921151467064e-6)
+        testbed.world.cache_size = 0
+        tracemalloc.start()
+        try:
+            testbed.process(time, misalignments, rotations, method=method, outputs=outputs)
+            retained[outputs] = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    assert retained[("sfbib", "avbib")] < retained[None] - 5 * 3 * time.nbytes
+
+
+def test_process_outputs_plan():
+    """Test a compiled plan evaluates only the requested outputs."""
+    testbed, time, misalignments, rotations = scenario()
+    plan = testbed.compile()
+    expected = plan.process(time, misalignments, rotations)
+    outputs = plan.process(time, misalignments, rotations, outputs=("sfbib", "aviib"))
+
+    assert list(outputs) == ["aviib", "sfbib"]
+    for name, value in outputs.items():
+        assert np.array_equal(value, expected[name])
+
+
+def test_process_outputs_invalid():
+    """Test an unknown output name is rejected."""
+    testbed, time, misalignments, rotations = scenario()
+    with pytest.raises(OptionError):
+        testbed.process(time, misalignments, rotations, outputs=("sfbi",))
+    with pytest.raises(AttributeError):
+        _ = testbed.sfbib
+
+
+@pytest.mark.parametrize("method", ["fused", "quaternion"])
+@pytest.mark.parametrize("precision", ["float32", "mixed"])
+@pytest.mark.parametrize("workers", [None, 2])
+def test_process_precision(monkeypatch, method, precision, workers):
+    """Test single and mixed precision outputs and their reported error against double precision."""
+    monkeypatch.setattr("rtsim.testbed.SHARD_SIZE", 50)
+    monkeypatch.setattr("rtsim.testbed.CHUNK_SIZE", 64)
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations, method=method)
+    expected = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    testbed.process(time, misalignments, rotations, method=method, precision=precision, workers=workers)
+    tolerance = 1e-4
+    assert list(testbed.precision_error) == list(OUTPUTS)
+    for name in OUTPUTS:
+        value = getattr(testbed, name)
+        error = np.max(np.abs(value - expected[name]))
+        assert value.dtype == np.float32
+        assert 0.0 < testbed.precision_error[name] < tolerance
+        assert testbed.precision_error[name] == pytest.approx(error, rel=1e-6)
+
+
+def test_process_precision_lazy():
+    """Test the error of an output evaluated on access is reported."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations, method="fused", outputs=("sfbib",), precision="float32")
+    assert list(testbed.precision_error) == ["sfbib"]
+    assert testbed.avbib.dtype == np.float32
+    assert list(testbed.precision_error) == ["sfbib", "avbib"]
+
+    testbed.process(time, misalignments, rotations)
+    assert testbed.precision_error == dict.fromkeys(OUTPUTS, 0.0)
+
+
+@pytest.mark.parametrize(("method", "precision"), [("reference", "float32"), ("fused", "float16")])
+def test_process_precision_invalid(method, precision):
+    """Test unknown precision policies, and reduced precision with the reference method, are rejected."""
+    testbed, time, misalignments, rotations = scenario()
+    with pytest.raises(OptionError):
+        testbed.process(time, misalignments, rotations, method=method, precision=precision)
+
+
+@pytest.mark.parametrize("outputs", [OUTPUTS, ("sfbib",)])
+@pytest.mark.parametrize("omega", [72.921151467064e-6, 0.0])
+def test_earth_rotation(outputs, omega):
+    """Test the closed form earth rotation against the world coordinate frame."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.world = World("Terra", 6378137.0, 298.257223563, omega)
+    plan = testbed.compile()
+    expected = kernel.testbed_outputs(plan, testbed.world.frame_at(time), misalignments, rotations, outputs)
+    closed = kernel.testbed_outputs(plan, testbed.world.rotation_at(time), misalignments, rotations, outputs)
+
+    assert list(closed) == list(expected)
+    for name in outputs:
+        assert np.allclose(closed[name], expected[name], rtol=0.0, atol=1e-12)
+
+
+def count_axis_process(monkeypatch):
+    """Count the calls to Axis.process."""
+    calls = []
+    process = Axis.process
+
+    def counted(self, *args, **kwargs):
+        calls.append(self)
+        return process(self, *args, **kwargs)
+
+    monkeypatch.setattr(Axis, "process", counted)
+    return calls
+
+
+@pytest.mark.parametrize("axis", [0, 1, 2])
+def test_process_cache(monkeypatch, axis):
+    """Test replacing the rotation of one axis only evaluates that axis and the ones downstream of it."""
+    testbed, time, misalignments, rotations = scenario()
+    _, _, _, replaced = scenario(seed=1)
+    testbed.cache_size = 2**24
+    testbed.process(time, misalignments, rotations)
+
+    rotations[axis] = replaced[axis]
+    calls = count_axis_process(monkeypatch)
+    testbed.process(time, misalignments, rotations)
+    assert len(calls) == len(rotations) - axis
+
+    expected, _, _, _ = scenario()
+    expected.cache_size = 0
+    expected.process(time, misalignments, rotations)
+    for name in OUTPUTS:
+        assert np.array_equal(getattr(testbed, name), getattr(expected, name))
+
+
+def test_process_cache_invalidated(monkeypatch):
+    """Test replacing a component or the PVA of a frame invalidates the cached axes."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.cache_size = 2**24
+    testbed.process(time, misalignments, rotations)
+    calls = count_axis_process(monkeypatch)
+
+    testbed.process(time, misalignments, rotations)
+    assert len(calls) == 0
+
+    misalignments[1].linear = TimePVA(
+        p=-misalignments[1].linear.p, v=misalignments[1].linear.v, a=misalignments[1].linear.a
+    )
+    testbed.process(time, misalignments, rotations)
+    assert len(calls) == len(rotations) - 1
+
+    testbed.mount = Mount("Other", BODY.frame)
+    testbed.process(time, misalignments, rotations)
+    assert len(calls) == 2 * len(rotations) - 1
+
+
+def test_process_cache_size(monkeypatch):
+    """Test the cache is opt-in and keeps only the leading axes that fit in its memory cap."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.process(time, misalignments, rotations)
+    assert testbed.cache_size == 0
+    assert testbed._prefix.nbytes == 0
+
+    testbed.cache_size = 2**24
+    testbed.process(time, misalignments, rotations)
+    per_axis = testbed._prefix.nbytes // 3
+
+    testbed.cache_size = 2 * per_axis
+    assert testbed._prefix.nbytes == 2 * per_axis
+
+    calls = count_axis_process(monkeypatch)
+    testbed.process(time, misalignments, rotations)
+    assert len(calls) == 1
+
+    testbed.cache_size = 0
+    testbed.process(time, misalignments, rotations)
+    assert len(calls) == 1 + len(rotations)
+    assert testbed._prefix.nbytes == 0
+
+    with pytest.raises(MinValueError):
+        testbed.cache_size = -1
+
+
+def test_process_world_lookup():
+    """Test the reference method looks the world frame up once and evaluates against it."""
+    testbed, time, misalignments, rotations = scenario(steps=37)
+    testbed.world = World("Terra", 6378137.0, 298.257223563, 72.921151467064e-6)
+    testbed.world.cache_size = 2**24
+    testbed.process(time, misalignments, rotations, outputs=("sfiib",))
+    assert (testbed.world.cache.hits, testbed.world.cache.misses) == (0, 1)
+
+
+@pytest.mark.parametrize("method", ["fused", "quaternion"])
+def test_compile(method):
+    """Test a compiled plan against processing the testbed."""
+    testbed, time, misalignments, rotations = scenario()
+    plan = testbed.compile(method=method)
+    testbed.process(time, misalignments, rotations)
+
+    for _ in range(2):
+        outputs = plan.process(time, misalignments, rotations)
+        for name in OUTPUTS:
+            assert np.allclose(outputs[name], getattr(testbed, name), rtol=0.0, atol=1e-12)
+
+
+def copy_frame(frame):
+    """Copy a constant frame."""
+    return Frame(
+        *(ConstantPVA(p=pva.p.copy(), v=pva.v.copy(), a=pva.a.copy()) for pva in (frame.linear, frame.angular))
+    )
+
+
+def test_compile_frozen():
+    """Test a compiled plan is not affected by later changes to the testbed."""
+    testbed, time, misalignments, rotations = scenario()
+    testbed.world = World("Terra", 6378137.0, 298.257223563, 72.921151467064e-6)
+    testbed.axes = [Axis(axis.moniker, copy_frame(axis.zeta)) for axis in testbed.axes]
+    plan = testbed.compile()
+    testbed.process(time, misalignments, rotations, method="fused")
+    reference = {name: getattr(testbed, name) for name in OUTPUTS}
+
+    testbed.mount = Mount("Other", BODY.frame)
+    testbed.world.omega_ie = 1e-3
+    for axis in testbed.axes:
+        axis.zeta.linear.p[...] += 1.0
+        axis.zeta.angular.p[...] += 0.5
+    outputs = plan.process(time, misalignments, rotations)
+
+    for name in OUTPUTS:
+        assert np.array_equal(outputs[name], reference[name])
+    with pytest.raises(AttributeError):
+        plan.attitude = "quaternion"
+
+
+def test_compile_invalid():
+    """Test compiling with the reference method and evaluating with a missing axis."""
+    testbed, time, misalignments, rotations = scenario()
+    with pytest.raises(OptionError):
+        testbed.compile(method="reference")
+    with pytest.raises(AxisCountError):
+        testbed.compile().process(time, misalignments[:2], rotations)
+
+
+def realizations(count, steps=200, seed=1):
+    """Build misalignment sets for a batch of realizations."""
+    return [scenario(steps=steps, seed=seed + b)[2] for b in range(count)]
+
+
+@pytest.mark.parametrize("batch_size", [None, 2])
+def test_process_batch(batch_size):
+    """Test batch processing against processing each realization."""
+    testbed, time, _, rotations = scenario()
+    batch = realizations(5)
+
+    results = testbed.process_batch(time, batch, rotations, batch_size=batch_size)
+
+    for b, misalignments in enumerate(batch):
+        testbed.process(time, misalignments, rotations)
+        for name in OUTPUTS:
+            assert results[name].shape == (5, time.size, 3, 1)
+            assert np.allclose(results[name][b], getattr(testbed, name), rtol=0.0, atol=1e-12)
+
+
+def test_process_batch_sparse():
+    """Test batch processing of realizations without linear misalignments."""
+    testbed, time, _, rotations = scenario()
+    batch = realizations(2)
+    for misalignments in batch:
+        for field in ("p", "v", "a"):
+            sparsify(misalignments, "linear", field)
+
+    results = testbed.process_batch(time, batch, rotations)
+
+    for b, misalignments in enumerate(batch):
+        testbed.process(time, misalignments, rotations)
+        for name in OUTPUTS:
+            assert np.allclose(results[name][b], getattr(testbed, name), rtol=0.0, atol=1e-12)
+
+
+def test_process_batch_mounts():
+    """Test batch processing with a mount per realization."""
+    testbed, time, _, rotations = scenario()
+    batch = realizations(2)
+    mounts = [
+        MOUNT,
+        Mount(
+            "Tilted",
+            Frame(
+                linear=ConstantPVA(p=np.array([[0.1], [0.0], [0.0]]), v=np.zeros((3, 1)), a=np.zeros((3, 1))),
+                angular=ConstantPVA(p=np.array([[0.0], [0.1], [0.0]]), v=np.zeros((3, 1)), a=np.zeros((3, 1))),
+            ),
+        ),
+    ]
+
+    results = testbed.process_batch(time, batch, rotations, mounts=mounts)
+
+    for b, misalignments in enumerate(batch):
+        single = Testbed("SART", llhg=LLHG, components=(WORLD, testbed.axes, mounts[b], BODY))
+        single.process(time, misalignments, rotations)
+        for name in OUTPUTS:
+            assert np.allclose(results[name][b], getattr(single, name), rtol=0.0, atol=1e-12)
+
+
+def test_process_batch_axis_count():
+    """Test batch processing with a realization missing an axis."""
+    testbed, time, misalignments, rotations = scenario()
+    with pytest.raises(AxisCountError):
+        testbed.process_batch(time, [misalignments, misalignments[:2]], rotations)
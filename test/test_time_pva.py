@@ -2,7 +2,7 @@
 
 import numpy as np
 import pytest
-from rtsim import TimePVA
+from rtsim import BatchPVA, TimePVA
 from rtsim.exceptions import ColCountError, NumDimError, RowCountError
 
 GCI = np.zeros((3, 1))
@@ -111,3 +111,17 @@ def test_accl_to_many_columns():
     """Test the case where a user provides too few rows for the position."""
     with pytest.raises(ColCountError):
         TimePVA(p=GTI, v=GTI, a=np.zeros((5, 3, 2)))
+
+
+def test_batch_pva():
+    """Verify BatchPVA stacks time varying PVA along a batch axis."""
+    pva = BatchPVA.stack([TimePVA(p=GTI, v=GTI, a=GTI)] * 4)
+    assert isinstance(pva, TimePVA)
+    assert pva.p.shape == (4, 5, 3, 1)
+    assert pva.slice(slice(1, 3)).a.shape == (4, 2, 3, 1)
+
+
+def test_batch_pva_dims():
+    """Test the case where a user provides a time vector for a batch."""
+    with pytest.raises(NumDimError):
+        BatchPVA(p=GTI, v=GTI, a=GTI)
@@ -68,3 +68,65 @@ def test_processing():
     assert (world.frame.angular.p[-1] == [[0], [0], [omega_ie * 100]]).all()
     assert (world.frame.angular.v[-1] == [[0], [0], [omega_ie]]).all()
     assert (world.frame.angular.a[-1] == 0).all()
+
+
+def test_process_cache():
+    """Test the world frame is reused for the same time vector and rotation rate, once enabled."""
+    world = World("Terra", 6378137.0, 298.257223563, 72.921151467064e-6)
+    time = np.arange(100) * 1e-2
+    world.process(time)
+    assert world.cache_size == 0
+    assert world.frame.C.flags.writeable
+
+    world.cache_size = 2**20
+    world.process(time)
+    frame = world.frame
+    world.process(time)
+    assert world.frame is frame
+    assert (world.cache.hits, world.cache.misses) == (1, 1)
+    assert not world.frame.C.flags.writeable
+
+    world.process(time.copy())
+    assert world.frame is not frame
+    time += 1e-3
+    world.process(time)
+    assert world.frame is not frame
+    world.omega_ie = 0.0
+    world.process(time)
+    assert np.array_equal(world.frame.C, np.broadcast_to(np.eye(3), (100, 3, 3)))
+    assert (world.cache.hits, world.cache.misses) == (1, 4)
+
+
+def test_process_cache_size():
+    """Test the least recently used world frames are evicted to fit the memory cap."""
+    world = World("Terra", 6378137.0, 298.257223563, 72.921151467064e-6)
+    times = [np.arange(100) * step for step in (1e-2, 2e-2, 3e-2)]
+    world.cache_size = 2**20
+    world.process(times[0])
+    world.cache_size = 2 * world.cache.nbytes
+
+    for time in (times[1], times[0], times[2]):
+        world.process(time)
+    assert len(world.cache.frames) == len(times) - 1
+
+    world.process(times[0])
+    world.process(times[1])
+    assert (world.cache.hits, world.cache.misses) == (2, len(times) + 1)
+
+    world.cache_size = 0
+    assert world.cache.nbytes == 0
+    with pytest.raises(MinValueError):
+        world.cache_size = -1
+
+
+def test_rotation_at():
+    """Test the closed form rotation matches the world coordinate frame."""
+    world = World("Terra", 6378137.0, 298.257223563, 72.921151467064e-6)
+    time = np.arange(100) * 1e3
+    frame = world.frame_at(time)
+    rotation = world.rotation_at(time)
+
+    assert np.allclose(frame.C[:, 0, 0], rotation.cos, rtol=0.0, atol=1e-15)
+    assert np.allclose(frame.C[:, 0, 1], rotation.sin, rtol=0.0, atol=1e-15)
+    assert np.allclose(frame.C[:, 1, 0], -rotation.sin, rtol=0.0, atol=1e-15)
+    assert rotation.omega == frame.angular.v[0, 2, 0]